@@ -53,15 +53,19 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.metrics.MetricsMiddleware',
+    'core.middleware.slow_queries.SlowQueryMiddleware',
+    'core.middleware.compression.CompressionMiddleware',
+    'core.middleware.rate_limit.RateLimitHeadersMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    # CorsMiddleware va antes de CommonMiddleware para agregar los headers también a sus respuestas
+    'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'corsheaders.middleware.CorsMiddleware',
-    'django.middleware.common.CommonMiddleware',
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -116,6 +120,11 @@ else:
         }
     }
 
+# Caché compartida entre procesos en producción (p. ej. CACHE_URL=redis://redis:6379/1)
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -164,13 +173,23 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.views.pagination.StandardPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Token buckets en la caché compartida (core.views.throttling); '600/min' es un
+    # bucket de 600 solicitudes que se recarga a 600 por minuto
+    'DEFAULT_THROTTLE_CLASSES': (
+        'core.views.throttling.UserTokenBucketThrottle',
+        'core.views.throttling.EndpointTokenBucketThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'user': env('THROTTLE_USER_RATE', default='6000/min'),
+        'units.list': env('THROTTLE_UNITS_LIST_RATE', default='1200/min'),
+    },
 }
 
 SIMPLE_JWT = {
@@ -188,4 +207,67 @@ SPECTACULAR_SETTINGS = {
     ],
 }
 
-TEST_RUNNER = 'django.test.runner.DiscoverRunner'
\ No newline at end of file
+TEST_RUNNER = 'django.test.runner.DiscoverRunner'
+
+# Jobs en segundo plano (manage.py run_workers)
+JOBS_STALE_AFTER_SECONDS = env.int('JOBS_STALE_AFTER_SECONDS', default=300)
+JOBS_POLL_INTERVAL_SECONDS = env.float('JOBS_POLL_INTERVAL_SECONDS', default=1.0)
+# Filas por transacción en los jobs masivos; el avance se informa al terminar cada tramo
+JOBS_CHUNK_SIZE = env.int('JOBS_CHUNK_SIZE', default=1000)
+
+# Feed de cambios (/api/changes)
+CHANGES_DEFAULT_BATCH = env.int('CHANGES_DEFAULT_BATCH', default=500)
+CHANGES_MAX_BATCH = env.int('CHANGES_MAX_BATCH', default=5000)
+
+# Push de disponibilidad de unidades (SSE sobre ASGI). Con el stream en un proceso
+# aparte del que escribe, usar core.realtime.broadcaster.PostgresBroadcaster
+REALTIME_BROADCASTER = env('REALTIME_BROADCASTER', default='core.realtime.broadcaster.InProcessBroadcaster')
+REALTIME_KEEPALIVE_SECONDS = env.float('REALTIME_KEEPALIVE_SECONDS', default=15.0)
+
+# Matriz de disponibilidad por proyecto: se invalida al cambiar una unidad; el
+# timeout solo acota escrituras que no pasan por los servicios (admin, shell)
+AVAILABILITY_CACHE_SECONDS = env.int('AVAILABILITY_CACHE_SECONDS', default=300)
+
+# Máximo de RUT por solicitud en /api/customers/resolve_ruts/
+RUT_BATCH_MAX = env.int('RUT_BATCH_MAX', default=5000)
+# Máximo de IDs por solicitud en los endpoints batch_get
+BATCH_GET_MAX = env.int('BATCH_GET_MAX', default=1000)
+
+# Throttling: tokens que cada proceso reserva de una vez y cuánto dura la reserva
+THROTTLE_LEASE_SIZE = env.int('THROTTLE_LEASE_SIZE', default=20)
+THROTTLE_LEASE_SECONDS = env.float('THROTTLE_LEASE_SECONDS', default=1.0)
+
+# Compresión de respuestas (gzip, y Brotli si está instalado)
+COMPRESSION_MIN_SIZE = env.int('COMPRESSION_MIN_SIZE', default=1024)
+COMPRESSION_GZIP_LEVEL = env.int('COMPRESSION_GZIP_LEVEL', default=6)
+COMPRESSION_BROTLI_QUALITY = env.int('COMPRESSION_BROTLI_QUALITY', default=5)
+COMPRESSION_CACHE_SECONDS = env.int('COMPRESSION_CACHE_SECONDS', default=300)
+
+# Registro de consultas lentas (core.middleware.slow_queries)
+SLOW_QUERY_THRESHOLD_MS = env.float('SLOW_QUERY_THRESHOLD_MS', default=200)
+SLOW_QUERY_EXPLAIN_ANALYZE = env.bool('SLOW_QUERY_EXPLAIN_ANALYZE', default=False)
+SLOW_QUERY_DEDUP_SECONDS = env.int('SLOW_QUERY_DEDUP_SECONDS', default=300)
+SLOW_QUERY_LOG_PARAMS = env.bool('SLOW_QUERY_LOG_PARAMS', default=True)
+SLOW_QUERY_LOG_FILE = env('SLOW_QUERY_LOG_FILE', default=str(BASE_DIR / 'slow_queries.log'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+            'encoding': 'utf-8',
+        },
+    },
+    'loggers': {
+        'core.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,37 @@
+"""
+Perfil liviano para los workers de la API (gunicorn.conf.py lo usa por defecto).
+
+Parte de backendPlanOk.settings y quita lo que una API autenticada con JWT no usa:
+admin, sesiones, mensajes, archivos estáticos, templates y la API navegable de DRF.
+El admin y Swagger UI se sirven con backendPlanOk.settings.
+Para medir el arranque: python manage.py profile_startup --settings backendPlanOk.settings_api
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+UNUSED_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+)
+# AuthenticationMiddleware requiere sesiones; DRF autentica por su cuenta con JWT
+UNUSED_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in UNUSED_APPS]
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in UNUSED_MIDDLEWARE]
+TEMPLATES = []
+
+# Sin admin ni Swagger UI. drf_spectacular sigue instalado: los extend_schema de
+# core.views lo importan al cargar las URLs y /api/schema/ se sirve igual que en settings
+ROOT_URLCONF = 'backendPlanOk.urls_api'
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('rest_framework.renderers.JSONRenderer',),
+}
@@ -0,0 +1,19 @@
+"""
+URLs del perfil liviano (backendPlanOk.settings_api): las mismas rutas de la API sin
+el admin ni Swagger UI.
+"""
+from django.urls import include, path
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView,
+    TokenRefreshView,
+)
+from core.views.metrics import metrics_view
+from core.views.schema import CachedSpectacularAPIView
+
+urlpatterns = [
+    path('api/schema/', CachedSpectacularAPIView.as_view(), name='schema'),
+    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('metrics', metrics_view, name='metrics'),
+    path('', include('core.urls')),
+]
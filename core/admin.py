@@ -1,3 +1,222 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 
-# Register your models here.
+from .models.models import Customer, Project, Unit
+from .realtime.broadcaster import publish_unit_status
+from .services.archive_service import ArchiveService
+from .services.availability_service import AvailabilityService
+from .services.change_service import ChangeService
+from .services.customer_service import CustomerService
+from .services.project_service import ProjectService
+from .services.sales_rollup_service import SalesRollupService
+from .services.unit_history_service import UnitHistoryService
+from .services.unit_service import UnitService
+from .services.version_service import PreconditionFailed, VersionService
+from .utils.rut import normalize_rut
+
+
+class EstimatedCountPaginator(Paginator):
+    # COUNT(*) sobre millones de filas recorre la tabla completa. Sin filtros se usa
+    # la estimación del planner de Postgres (pg_class.reltuples), que basta para paginar.
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                        [queryset.model._meta.db_table]
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] >= self.estimate_threshold:
+                    return row[0]
+        return super().count
+
+
+class VersionedAdminForm(forms.ModelForm):
+    # La versión con la que se abrió el formulario viaja oculta; guardar sobre una
+    # versión distinta es un error del formulario, igual que el 412 de la API.
+    loaded_version = forms.IntegerField(widget=forms.HiddenInput, required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['loaded_version'].initial = self.instance.version
+
+    def clean(self):
+        cleaned_data = super().clean()
+        loaded = cleaned_data.get('loaded_version')
+        if self.instance.pk and loaded is not None:
+            # changeform_view corre en una transacción: el bloqueo dura hasta save_model
+            current = (
+                type(self.instance).objects.select_for_update()
+                .filter(pk=self.instance.pk).values_list('version', flat=True).first()
+            )
+            if current != loaded:
+                raise forms.ValidationError(PreconditionFailed.default_detail, code=PreconditionFailed.default_code)
+        return cleaned_data
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    # Changelists pensados para tablas grandes: conteo estimado, sin el segundo COUNT(*)
+    # del total y escrituras a través de los servicios, igual que la API.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    ordering = ('-created_at',)
+    form = VersionedAdminForm
+    change_entity = None
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            if change:
+                # UPDATE condicionado a la versión que vio el usuario, no a la recién leída
+                if form.cleaned_data.get('loaded_version') is not None:
+                    obj.version = form.cleaned_data['loaded_version']
+                VersionService.save(obj, self.get_update_fields(obj, form))
+            else:
+                super().save_model(request, obj, form, change)
+            ChangeService.record_upsert(self.change_entity, obj)
+            self.after_save(obj, form, change)
+
+    def get_update_fields(self, obj, form):
+        # VersionService.save escribe con UPDATE, sin pasar por Model.save()
+        return [field.name for field in obj._meta.concrete_fields if field.name in form.changed_data]
+
+    def after_save(self, obj, form, change):
+        pass
+
+    def get_related_delete_counts(self, objs):
+        return {}
+
+    def get_deleted_objects(self, objs, request):
+        # El Collector carga y lista cada objeto relacionado; se muestran solo conteos
+        count = objs.count() if isinstance(objs, QuerySet) else len(objs)
+        preview = objs
+        if isinstance(objs, QuerySet) and isinstance(self.list_select_related, (list, tuple)):
+            # Las mismas relaciones que usa __str__ en el listado (p. ej. el proyecto de la unidad)
+            preview = objs.select_related(*self.list_select_related)
+        shown = [str(obj) for obj in preview[:20]]
+        model_count = {self.model._meta.verbose_name_plural: count}
+        perms_needed = set()
+        for model, related in self.get_related_delete_counts(objs).items():
+            model_count[model._meta.verbose_name_plural] = related
+            if related and not request.user.has_perm(f'{model._meta.app_label}.delete_{model._meta.model_name}'):
+                perms_needed.add(model._meta.verbose_name)
+        return shown, model_count, perms_needed, []
+
+    def _report(self, request, count, label):
+        self.message_user(request, f'{count} {label}.', messages.SUCCESS)
+
+
+@admin.register(Project)
+class ProjectAdmin(ScalableModelAdmin):
+    change_entity = 'project'
+    list_display = ('name', 'status', 'started_at', 'finished_at', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('name',)
+    readonly_fields = ('version', 'created_at')
+    actions = ('mark_under_construction', 'mark_finished', 'mark_sold', 'archive')
+
+    def get_related_delete_counts(self, objs):
+        return {Unit: Unit.objects.filter(project__in=objs).count()}
+
+    def delete_model(self, request, obj):
+        ProjectService.delete_project(obj.pk)
+
+    def delete_queryset(self, request, queryset):
+        for project_id in queryset.values_list('id', flat=True):
+            ProjectService.delete_project(project_id)
+
+    @admin.action(description='Marcar como En construcción')
+    def mark_under_construction(self, request, queryset):
+        self._report(request, ProjectService.set_status(queryset, 'Under Construction'), 'proyectos actualizados')
+
+    @admin.action(description='Marcar como Terminados')
+    def mark_finished(self, request, queryset):
+        self._report(request, ProjectService.set_status(queryset, 'Finished'), 'proyectos actualizados')
+
+    @admin.action(description='Marcar como Vendidos')
+    def mark_sold(self, request, queryset):
+        self._report(request, ProjectService.set_status(queryset, 'Sold'), 'proyectos actualizados')
+
+    @admin.action(description='Archivar (solo Vendidos o Terminados)')
+    def archive(self, request, queryset):
+        projects, units = ArchiveService.archive_projects(list(queryset.values_list('id', flat=True)))
+        self._report(request, projects, f'proyectos archivados con {units} unidades')
+
+
+@admin.register(Unit)
+class UnitAdmin(ScalableModelAdmin):
+    change_entity = 'unit'
+    list_display = (
+        'unit_number', 'project', 'unit_type', 'unit_status', 'price', 'price_per_m2', 'customer', 'created_at'
+    )
+    # __str__ de Unit usa project.name; sin esto cada fila haría su propia consulta
+    list_select_related = ('project', 'customer')
+    list_filter = ('unit_status',)
+    autocomplete_fields = ('project', 'customer')
+    readonly_fields = ('price_per_m2', 'version', 'created_at')
+    actions = ('mark_available', 'mark_reserved', 'mark_sold')
+
+    def get_update_fields(self, obj, form):
+        return obj.sync_price_per_m2(super().get_update_fields(obj, form))
+
+    def after_save(self, obj, form, change):
+        if not change or {'project', 'unit_status', 'price', 'reservation_deposit', 'customer'} & set(form.changed_data):
+            UnitHistoryService.record([obj], 'changed' if change else 'created')
+        if not change or {'unit_status', 'unit_number', 'project'} & set(form.changed_data):
+            AvailabilityService.invalidate(obj.project_id, form.initial.get('project'))
+        if not change or 'unit_status' in form.changed_data:
+            SalesRollupService.record_unit(obj, form.initial.get('unit_status'))
+            publish_unit_status(obj)
+
+    def delete_model(self, request, obj):
+        UnitService.delete_unit(obj)
+
+    def delete_queryset(self, request, queryset):
+        UnitService.delete_units(queryset)
+
+    @admin.action(description='Marcar como Disponibles (libera el cliente)')
+    def mark_available(self, request, queryset):
+        self._report(request, UnitService.set_status(queryset, 'Available'), 'unidades actualizadas')
+
+    @admin.action(description='Marcar como Reservadas (solo con cliente)')
+    def mark_reserved(self, request, queryset):
+        self._report(request, UnitService.set_status(queryset, 'Reserved'), 'unidades actualizadas')
+
+    @admin.action(description='Marcar como Vendidas (solo con cliente)')
+    def mark_sold(self, request, queryset):
+        self._report(request, UnitService.set_status(queryset, 'Sold'), 'unidades actualizadas')
+
+
+@admin.register(Customer)
+class CustomerAdmin(ScalableModelAdmin):
+    change_entity = 'customer'
+    list_display = ('rut', 'name', 'lastname', 'email', 'phone', 'created_at')
+    # Solo búsquedas exactas sobre columnas únicas (con índice); también sirven al autocompletado
+    search_fields = ('=rut', '=email')
+    readonly_fields = ('version', 'created_at')
+
+    def get_search_results(self, request, queryset, search_term):
+        if search_term and '@' not in search_term:
+            search_term = normalize_rut(search_term)
+        return super().get_search_results(request, queryset, search_term)
+
+    def get_update_fields(self, obj, form):
+        obj.rut = normalize_rut(obj.rut)
+        return super().get_update_fields(obj, form)
+
+    def delete_model(self, request, obj):
+        CustomerService.delete_customer(obj)
+
+    def delete_queryset(self, request, queryset):
+        CustomerService.delete_customers(queryset)
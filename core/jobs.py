@@ -0,0 +1,21 @@
+# Handlers de los jobs en segundo plano. Se registran al cargar la app (CoreConfig.ready).
+from django.conf import settings
+
+from .services.job_service import JobService
+from .services.project_service import ProjectService
+from .services.unit_service import UnitService
+
+
+def _progress(job):
+    return lambda done, total: JobService.set_progress(job, 100 * done / total)
+
+
+@JobService.register('units.create_multiple')
+def create_multiple_units(job, payload):
+    units = UnitService.create_multiple_units(payload['units'], settings.JOBS_CHUNK_SIZE, _progress(job))
+    return {'created': len(units), 'ids': [str(unit.id) for unit in units]}
+
+
+@JobService.register('projects.delete')
+def delete_project(job, payload):
+    return {'deleted': ProjectService.delete_project(payload['project_id'], settings.JOBS_CHUNK_SIZE, _progress(job))}
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models.models import Unit
+from core.services.archive_service import ArchiveService
+
+
+class Command(BaseCommand):
+    help = 'Mueve proyectos Sold/Finished y sus unidades a las tablas de archivo en transacciones por lotes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--status', action='append', dest='statuses',
+            choices=ArchiveService.ARCHIVABLE_STATUSES,
+            help='Estado a archivar (repetible). Por defecto Sold y Finished.'
+        )
+        parser.add_argument(
+            '--finished-days-ago', type=int, default=None,
+            help='Solo proyectos con finished_at de hace al menos N días.'
+        )
+        parser.add_argument('--batch-size', type=int, default=50, help='Proyectos por transacción.')
+        parser.add_argument('--dry-run', action='store_true', help='Solo informa cuántos proyectos se archivarían.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size debe ser mayor a 0.')
+        statuses = options['statuses'] or ArchiveService.ARCHIVABLE_STATUSES
+        finished_before = None
+        if options['finished_days_ago'] is not None:
+            finished_before = timezone.localdate() - timedelta(days=options['finished_days_ago'])
+
+        project_ids = ArchiveService.get_archivable_project_ids(statuses, finished_before)
+        if options['dry_run']:
+            units = Unit.objects.filter(project_id__in=project_ids).count()
+            self.stdout.write(f'Se archivarían {len(project_ids)} proyectos y {units} unidades.')
+            return
+
+        total_projects = total_units = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(project_ids), batch_size):
+            projects, units = ArchiveService.archive_projects(project_ids[start:start + batch_size], statuses)
+            total_projects += projects
+            total_units += units
+            self.stdout.write(f'  {total_projects}/{len(project_ids)} proyectos, {total_units} unidades archivadas')
+        self.stdout.write(self.style.SUCCESS(
+            f'Archivados {total_projects} proyectos y {total_units} unidades.'
+        ))
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.sales_rollup_service import SalesRollupService
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstruye los totales diarios de ventas (core_salesrollup) desde la historia de las unidades. '
+        'Reemplaza los totales existentes del alcance indicado.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', action='append', dest='projects', help='ID de proyecto (repetible). Por defecto, todos.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Filas por bulk_create.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rows = SalesRollupService.rebuild(options['projects'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{rows} totales diarios escritos en {time.monotonic() - started:.1f}s.'))
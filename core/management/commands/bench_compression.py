@@ -0,0 +1,60 @@
+import gzip
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.middleware.compression import brotli
+from core.models.models import Project
+
+ENCODERS = [('gzip', 1), ('gzip', 6), ('gzip', 9)]
+if brotli is not None:
+    ENCODERS += [('br', 1), ('br', 5), ('br', 11)]
+
+
+def _encode(content, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(content, mode=brotli.MODE_TEXT, quality=level)
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+class Command(BaseCommand):
+    help = 'Mide el costo de CPU contra los bytes ahorrados al comprimir las respuestas de cada endpoint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=1000, help='Tamaño de página de los listados.')
+        parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por medición.')
+
+    def handle(self, *args, **options):
+        project = Project.objects.order_by('-created_at').first()
+        if project is None:
+            raise CommandError('No hay datos para medir; ejecuta primero seed_data.')
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(User(username='bench', is_staff=True))
+        page = {'page_size': options['page_size']}
+        endpoints = {
+            'units-list': (reverse('units-list'), page),
+            'units-list (columnar)': (reverse('units-list'), {**page, 'format': 'columnar'}),
+            'customers-list': (reverse('customers-list'), page),
+            'projects-availability': (reverse('projects-availability', args=[project.id]), {}),
+        }
+
+        self.stdout.write(f"{'endpoint':<24} {'codificación':<9} {'bytes':>10} {'comprimido':>11} {'ahorro':>7} {'CPU ms':>8}")
+        for label, (url, params) in endpoints.items():
+            response = client.get(url, params)
+            if response.status_code != 200:
+                raise CommandError(f'{label} respondió {response.status_code}.')
+            content = response.content
+            self.stdout.write(f'{label:<24} {"identity":<9} {len(content):>10}')
+            for encoding, level in ENCODERS:
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.thread_time()
+                    compressed = _encode(content, encoding, level)
+                    timings.append(time.thread_time() - started)
+                saved = 1 - len(compressed) / len(content)
+                self.stdout.write(
+                    f'{"":<24} {f"{encoding}-{level}":<9} {"":>10} {len(compressed):>11} {saved:>7.1%} {min(timings) * 1000:>8.2f}'
+                )
@@ -0,0 +1,84 @@
+import time
+import tracemalloc
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models.signals import pre_delete
+from django.test.utils import CaptureQueriesContext
+
+from core.models.models import Project, Unit
+from core.services.project_service import ProjectService
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compara el borrado de un proyecto con el Collector de Django contra el DELETE set-based.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--units', type=int, default=5000, help='Unidades del proyecto a borrar.')
+        parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por estrategia.')
+
+    def handle(self, *args, **options):
+        strategies = {
+            'collector (project.delete())': self._collector_delete,
+            'collector con señal en Unit': self._collector_delete_with_signal,
+            'set-based (ProjectService)': ProjectService.delete_project,
+        }
+        self.stdout.write(f"Borrando un proyecto con {options['units']} unidades, {options['repeat']} repeticiones\n")
+        for label, strategy in strategies.items():
+            timings, peaks, queries = [], [], 0
+            for _ in range(options['repeat']):
+                elapsed, peak, queries = self._run(strategy, options['units'])
+                timings.append(elapsed)
+                peaks.append(peak)
+            self.stdout.write(
+                f'{label:<32} mejor {min(timings) * 1000:8.1f} ms  '
+                f'memoria máx {max(peaks) / 1024:8.1f} KiB  consultas {queries}'
+            )
+
+    @staticmethod
+    def _collector_delete(project_id):
+        Project.objects.get(id=project_id).delete()
+
+    @classmethod
+    def _collector_delete_with_signal(cls, project_id):
+        # Con un receptor de señal el Collector ya no puede hacer fast delete y
+        # carga cada Unit en memoria, como ocurre al agregar auditoría o relaciones.
+        def receiver(**kwargs):
+            pass
+
+        pre_delete.connect(receiver, sender=Unit)
+        try:
+            cls._collector_delete(project_id)
+        finally:
+            pre_delete.disconnect(receiver, sender=Unit)
+
+    def _run(self, strategy, units):
+        # Todo ocurre dentro de una transacción que se revierte al final
+        result = None
+        try:
+            with transaction.atomic():
+                project = Project.objects.create(name='Benchmark', address='N/A', started_at=date.today())
+                Unit.objects.bulk_create(
+                    [
+                        Unit(project=project, unit_number=str(i), unit_type='Apartment', square_meters=50, price=100)
+                        for i in range(units)
+                    ],
+                    batch_size=1000,
+                )
+                tracemalloc.start()
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    strategy(project.id)
+                    elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                result = (elapsed, peak, len(captured))
+                raise Rollback
+        except Rollback:
+            pass
+        return result
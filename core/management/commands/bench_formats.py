@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core.models.models import Customer, Project, Unit
+from core.serializers.serializers import CustomerSerializer, ProjectSerializer, UnitSerializer
+
+MODELS = {
+    'units': (Unit, UnitSerializer),
+    'projects': (Project, ProjectSerializer),
+    'customers': (Customer, CustomerSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compara tamaño y tiempo de serialización del JSON por filas contra el formato columnar.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=MODELS, default='units', help='Listado a medir.')
+        parser.add_argument('--page-sizes', type=int, nargs='+', default=[10, 100, 1000, 5000], help='Tamaños de página.')
+        parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por medición.')
+
+    def handle(self, *args, **options):
+        model, serializer_class = MODELS[options['model']]
+        if not model.objects.exists():
+            raise CommandError('No hay datos para medir; ejecuta primero seed_data.')
+        columns = [field.name for field in model._meta.concrete_fields]
+        renderer = JSONRenderer()
+
+        def rows_format(queryset):
+            return renderer.render(serializer_class(queryset, many=True).data)
+
+        def columnar_format(queryset):
+            rows = list(queryset.values_list(*columns))
+            values = list(zip(*rows)) if rows else [()] * len(columns)
+            return renderer.render({'columns': columns, 'data': {c: list(v) for c, v in zip(columns, values)}})
+
+        self.stdout.write(f"{'filas':>6}  {'formato':<9} {'bytes':>10} {'mejor ms':>9}")
+        for page_size in options['page_sizes']:
+            queryset = model.objects.order_by('-created_at')[:page_size]
+            for label, render in (('filas', rows_format), ('columnar', columnar_format)):
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    body = render(queryset.all())
+                    timings.append(time.perf_counter() - started)
+                self.stdout.write(f'{page_size:>6}  {label:<9} {len(body):>10} {min(timings) * 1000:>9.1f}')
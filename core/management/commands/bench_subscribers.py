@@ -0,0 +1,54 @@
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.realtime.broadcaster import InProcessBroadcaster
+
+
+class Command(BaseCommand):
+    help = 'Mide la latencia de fan-out y la memoria por suscriptor del broadcaster en proceso.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=1000, help='Suscriptores conectados al mismo canal.')
+        parser.add_argument('--messages', type=int, default=50, help='Mensajes publicados.')
+
+    def handle(self, *args, **options):
+        if options['subscribers'] <= 0 or options['messages'] <= 0:
+            raise CommandError('--subscribers y --messages deben ser mayores a 0.')
+        asyncio.run(self._bench(options['subscribers'], options['messages']))
+
+    async def _bench(self, count, messages):
+        broadcaster = InProcessBroadcaster(queue_size=messages + 1)
+        channel = 'project:bench'
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        subscriptions = [broadcaster.subscribe(channel) for _ in range(count)]
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+
+        latencies = []
+        for index in range(messages):
+            # Latencia hasta que el último suscriptor tiene el mensaje en su cola
+            started = time.perf_counter()
+            broadcaster.publish(channel, {'event': 'unit.status', 'seq': index})
+            for subscription in subscriptions:
+                await subscription.get()
+            latencies.append(time.perf_counter() - started)
+
+        for subscription in subscriptions:
+            broadcaster.unsubscribe(subscription)
+
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(f'{count} suscriptores, {messages} mensajes')
+        self.stdout.write(
+            f'fan-out  mediana {statistics.median(latencies) * 1000:8.2f} ms  '
+            f'p95 {p95 * 1000:8.2f} ms  '
+            f'por suscriptor {statistics.median(latencies) / count * 1e6:6.2f} µs'
+        )
+        self.stdout.write(f'memoria  {allocated / count:8.0f} bytes por suscriptor')
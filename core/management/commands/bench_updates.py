@@ -0,0 +1,82 @@
+import statistics
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.models.models import Project
+from core.services.change_service import ChangeService
+from core.services.project_service import ProjectService
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compara la latencia y las consultas por PATCH de proyecto entre el flujo anterior y el actual.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500, help='PATCH por estrategia.')
+
+    def handle(self, *args, **options):
+        if options['iterations'] <= 0:
+            raise CommandError('--iterations debe ser mayor a 0.')
+        strategies = {
+            'full_clean + save() completo': self._legacy_update,
+            'serializer + update_fields': ProjectService.partial_update_project,
+        }
+        cases = {
+            'cambia un campo': lambda i: {'name': f'Benchmark {i}'},
+            'sin cambios': lambda i: {'name': 'Benchmark'},
+        }
+        self.stdout.write(f"{options['iterations']} PATCH por estrategia\n")
+        for case, payload in cases.items():
+            for label, strategy in strategies.items():
+                timings, queries = self._run(strategy, payload, options['iterations'])
+                self.stdout.write(
+                    f'{case:<16} {label:<30} p50 {statistics.median(timings) * 1000:7.3f} ms  '
+                    f'p99 {_percentile(timings, 0.99) * 1000:7.3f} ms  consultas/PATCH {queries / len(timings):4.1f}'
+                )
+
+    @staticmethod
+    def _legacy_update(project_id, data):
+        # Flujo anterior: full_clean() y save() de todas las columnas, haya o no cambios
+        project = Project.objects.get(id=project_id)
+        for field, value in data.items():
+            setattr(project, field, value)
+        project.full_clean()
+        with transaction.atomic():
+            project.save()
+            ChangeService.record_upsert('project', project)
+        return project
+
+    def _run(self, strategy, payload, iterations):
+        # Todo ocurre dentro de una transacción que se revierte al final
+        result = None
+        try:
+            with transaction.atomic():
+                project = Project.objects.create(name='Benchmark', address='N/A', started_at=date.today())
+                timings = []
+                queries = []
+
+                def count(execute, sql, params, many, context):
+                    queries.append(sql)
+                    return execute(sql, params, many, context)
+
+                with connection.execute_wrapper(count):
+                    for i in range(iterations):
+                        started = time.perf_counter()
+                        strategy(project.id, payload(i))
+                        timings.append(time.perf_counter() - started)
+                result = (timings, len(queries))
+                raise Rollback
+        except Rollback:
+            pass
+        return result
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
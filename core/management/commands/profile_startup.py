@@ -0,0 +1,90 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Se ejecuta en un proceso nuevo con -X importtime: en este proceso Django ya está cargado
+PROFILE_SCRIPT = '''
+import json, sys, time
+from core.startup import seconds_since_start
+phases = {'interpreter': seconds_since_start()}
+started = time.perf_counter()
+import django
+django.setup()
+phases['django.setup()'] = time.perf_counter() - started
+from django.apps import apps
+from django.urls import get_resolver
+started = time.perf_counter()
+get_resolver().url_patterns
+phases['urlconf'] = time.perf_counter() - started
+url = sys.argv[1]
+if url:
+    from django.test import Client
+    started = time.perf_counter()
+    status = Client(SERVER_NAME='localhost').get(url).status_code
+    phases[f'first request {url} ({status})'] = time.perf_counter() - started
+phases['process start -> ready'] = seconds_since_start()
+print(json.dumps({'phases': phases, 'apps': [app.name for app in apps.get_app_configs()]}))
+'''
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def parse_importtime(stderr):
+    # (módulo, self µs, acumulado µs, nivel) en el orden en que terminan de importarse
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el tiempo de import por módulo, paquete y app durante django.setup() en un proceso nuevo. '
+        'Usa el módulo de settings activo (p. ej. --settings backendPlanOk.settings_api).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='Módulos y paquetes más lentos a mostrar.')
+        parser.add_argument('--url', default='/metrics', help='Ruta del primer request a medir (vacío para omitirlo).')
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT, options['url']],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise CommandError(f'El proceso de perfilado falló:\n{result.stderr[-4000:]}')
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        modules = parse_importtime(result.stderr)
+
+        self.stdout.write(f'Settings: {settings.SETTINGS_MODULE}')
+        for phase, seconds in report['phases'].items():
+            self.stdout.write(f'  {phase:<40} {seconds * 1000:>9.1f} ms')
+
+        packages = defaultdict(int)
+        for name, self_us, _, _ in modules:
+            packages[name.partition('.')[0]] += self_us
+        app_totals = {}
+        for app in report['apps']:
+            app_totals[app] = sum(self_us for name, self_us, _, _ in modules if name == app or name.startswith(app + '.'))
+
+        self.stdout.write(
+            f'\nImports hasta el primer request: {len(modules)} módulos, {sum(packages.values()) / 1000:.1f} ms en total'
+        )
+        self._table('Por app (INSTALLED_APPS)', app_totals.items(), len(app_totals))
+        self._table('Por paquete', packages.items(), options['top'])
+        self._table('Por módulo (acumulado)', ((name, cumulative) for name, _, cumulative, _ in modules), options['top'])
+
+    def _table(self, title, rows, top):
+        self.stdout.write(f'\n{title}:')
+        for name, us in sorted(rows, key=lambda row: row[1], reverse=True)[:top]:
+            self.stdout.write(f'  {name:<60} {us / 1000:>9.1f} ms')
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.services.change_service import ChangeService
+
+
+class Command(BaseCommand):
+    help = 'Elimina del outbox los cambios más antiguos que la retención indicada.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Días de cambios a conservar.')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('--days debe ser mayor o igual a 0.')
+        deleted = ChangeService.prune(timezone.now() - timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f'Eliminados {deleted} cambios.'))
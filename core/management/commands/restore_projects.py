@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.archive_service import ArchiveService
+
+
+class Command(BaseCommand):
+    help = 'Restaura proyectos archivados y sus unidades a las tablas activas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_ids', nargs='*', help='IDs de los proyectos a restaurar.')
+        parser.add_argument('--all', action='store_true', help='Restaura todos los proyectos archivados.')
+        parser.add_argument('--batch-size', type=int, default=50, help='Proyectos por transacción.')
+
+    def handle(self, *args, **options):
+        if options['all'] == bool(options['project_ids']):
+            raise CommandError('Indica IDs de proyectos o --all (no ambos).')
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size debe ser mayor a 0.')
+        if options['all']:
+            project_ids = list(ArchiveService.get_archived_projects().values_list('id', flat=True))
+        else:
+            project_ids = options['project_ids']
+
+        total_projects = total_units = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(project_ids), batch_size):
+            projects, units = ArchiveService.restore_projects(project_ids[start:start + batch_size])
+            total_projects += projects
+            total_units += units
+        self.stdout.write(self.style.SUCCESS(
+            f'Restaurados {total_projects} proyectos y {total_units} unidades.'
+        ))
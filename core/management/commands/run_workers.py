@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.services.job_service import JobService
+
+
+class Command(BaseCommand):
+    help = 'Inicia un pool de procesos que ejecuta los jobs en segundo plano encolados en la base de datos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help='Cantidad de procesos worker. Con 1 se ejecuta en el proceso actual.'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=None,
+            help='Segundos de espera cuando no hay jobs (por defecto JOBS_POLL_INTERVAL_SECONDS).'
+        )
+        parser.add_argument('--burst', action='store_true', help='Termina cuando la cola queda vacía.')
+
+    def handle(self, *args, **options):
+        if options['processes'] <= 0:
+            raise CommandError('--processes debe ser mayor a 0.')
+        poll_interval = options['poll_interval'] or settings.JOBS_POLL_INTERVAL_SECONDS
+        if options['processes'] == 1:
+            processed = work(f'{socket.gethostname()}:{os.getpid()}', poll_interval, options['burst'])
+            self.stdout.write(f'Jobs procesados: {processed}')
+            return
+
+        # Las conexiones no se deben compartir entre procesos hijos
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=_worker_main, args=(poll_interval, options['burst']), daemon=False)
+            for _ in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Iniciados {len(workers)} workers (pids {', '.join(str(w.pid) for w in workers)})")
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                if worker.is_alive():
+                    os.kill(worker.pid, signal.SIGTERM)
+            for worker in workers:
+                worker.join()
+
+
+def _worker_main(poll_interval, burst):
+    connections.close_all()
+    work(f'{socket.gethostname()}:{os.getpid()}', poll_interval, burst)
+
+
+def work(worker_id, poll_interval, burst):
+    # SIGTERM termina el job en curso antes de salir
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    if multiprocessing.parent_process() is not None:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    processed = 0
+    while not stopping:
+        job = JobService.claim_next(worker_id)
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        JobService.run(job)
+        processed += 1
+    return processed
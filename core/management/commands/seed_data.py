@@ -0,0 +1,189 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models.models import Project, Unit, Customer
+from core.services.unit_history_service import UnitHistoryService
+from core.utils.rut import compute_check_digit
+
+FIRST_NAMES = [
+    'Juan', 'María', 'José', 'Francisca', 'Diego', 'Camila', 'Matías', 'Valentina',
+    'Benjamín', 'Javiera', 'Vicente', 'Constanza', 'Tomás', 'Catalina', 'Sebastián',
+    'Fernanda', 'Cristóbal', 'Antonia', 'Felipe', 'Isidora', 'Ignacio', 'Martina',
+]
+LAST_NAMES = [
+    'González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva',
+    'Martínez', 'Sepúlveda', 'Morales', 'Rodríguez', 'López', 'Fuentes', 'Hernández',
+    'Torres', 'Araya', 'Flores', 'Espinoza', 'Valenzuela', 'Castillo', 'Reyes',
+]
+PROJECT_PREFIXES = ['Edificio', 'Condominio', 'Torre', 'Parque', 'Mirador', 'Jardines de']
+PROJECT_NAMES = [
+    'Los Andes', 'Providencia', 'Ñuñoa', 'Las Condes', 'Vitacura', 'La Florida',
+    'Maipú', 'Viña del Mar', 'Concepción', 'La Serena', 'Temuco', 'Puerto Varas',
+]
+STREETS = [
+    'Av. Providencia', 'Av. Apoquindo', 'Av. Irarrázaval', 'Av. Vicuña Mackenna',
+    'Av. Libertador Bernardo O\'Higgins', 'Av. Grecia', 'Av. Matta', 'Los Leones',
+]
+
+PROJECT_STATUS_WEIGHTS = [
+    ('Off Plan', 30), ('Under Construction', 40), ('Finished', 20), ('Sold', 10),
+]
+# Proporción (Available, Reserved, Sold) según el estado del proyecto
+UNIT_STATUS_MIX = {
+    'Off Plan': (70, 20, 10),
+    'Under Construction': (45, 20, 35),
+    'Finished': (20, 10, 70),
+    'Sold': (0, 0, 100),
+}
+# Tipo: (peso, m² medio, desviación, mínimo, máximo, factor de precio por m²)
+UNIT_TYPES = {
+    'Apartment': (70, 65, 20, 25, 250, Decimal('1.00')),
+    'House': (12, 140, 40, 60, 400, Decimal('0.85')),
+    'Office': (12, 80, 40, 20, 600, Decimal('1.10')),
+    'Commercial': (6, 120, 60, 30, 900, Decimal('1.30')),
+}
+MAX_PRICE = 2_147_483_647
+
+
+class Command(BaseCommand):
+    help = 'Genera datos sintéticos realistas de proyectos, unidades y clientes para pruebas de rendimiento.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=10, help='Cantidad de proyectos a crear.')
+        parser.add_argument('--units-per-project', type=int, default=100, help='Unidades por proyecto.')
+        parser.add_argument('--customers', type=int, default=1000, help='Cantidad de clientes a crear.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Filas por bulk_create.')
+        parser.add_argument('--seed', type=int, default=None, help='Semilla para obtener datos reproducibles.')
+
+    def handle(self, *args, **options):
+        for name in ('projects', 'units_per_project', 'customers'):
+            if options[name] < 0:
+                raise CommandError(f'--{name.replace("_", "-")} debe ser mayor o igual a 0.')
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size debe ser mayor a 0.')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.monotonic()
+
+        customer_ids = self._insert(Customer, self._customers(options['customers']), options['customers'], 'clientes')
+        project_ids = self._insert(Project, self._projects(options['projects']), options['projects'], 'proyectos')
+        projects = dict(Project.objects.filter(id__in=project_ids).values_list('id', 'status'))
+        total_units = options['projects'] * options['units_per_project']
+        self._insert(
+            Unit,
+            self._units(project_ids, projects, options['units_per_project'], customer_ids),
+            total_units,
+            'unidades'
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Datos generados en {time.monotonic() - started:.1f}s: '
+            f'{len(project_ids)} proyectos, {total_units} unidades, {len(customer_ids)} clientes.'
+        ))
+
+    def _insert(self, model, rows, total, label):
+        ids = []
+        batch = []
+        done = 0
+        started = time.monotonic()
+        for obj in rows:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                done += self._flush(model, batch, ids)
+                self._progress(label, done, total, started)
+                batch = []
+        if batch:
+            done += self._flush(model, batch, ids)
+            self._progress(label, done, total, started)
+        return ids
+
+    def _flush(self, model, batch, ids):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            if model is Unit:
+                UnitHistoryService.record(batch, 'created', batch_size=self.batch_size)
+        if model is not Unit:
+            ids.extend(obj.id for obj in batch)
+        return len(batch)
+
+    def _progress(self, label, done, total, started):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(f'  {label}: {done}/{total} ({done / elapsed:,.0f} filas/s)')
+
+    def _customers(self, count):
+        # Cuerpos de RUT únicos entre 5 y 25 millones, como la población real
+        bodies = self.rng.sample(range(5_000_000, 25_000_000), count)
+        for index, body in enumerate(bodies):
+            name = self.rng.choice(FIRST_NAMES)
+            lastname = self.rng.choice(LAST_NAMES)
+            yield Customer(
+                rut=f'{body}{compute_check_digit(body)}',
+                name=name,
+                lastname=lastname,
+                email=f'{_ascii(name)}.{_ascii(lastname)}.{index}@example.cl',
+                phone=f'+569{self.rng.randint(10_000_000, 99_999_999)}',
+            )
+
+    def _projects(self, count):
+        statuses, weights = zip(*PROJECT_STATUS_WEIGHTS)
+        today = date.today()
+        for index in range(count):
+            status = self.rng.choices(statuses, weights)[0]
+            started_at = today - timedelta(days=self.rng.randint(30, 6 * 365))
+            finished_at = None
+            if status in ('Finished', 'Sold'):
+                finished_at = min(started_at + timedelta(days=self.rng.randint(365, 3 * 365)), today)
+            yield Project(
+                name=f'{self.rng.choice(PROJECT_PREFIXES)} {self.rng.choice(PROJECT_NAMES)} {index + 1}',
+                address=f'{self.rng.choice(STREETS)} {self.rng.randint(100, 9999)}',
+                description=None,
+                started_at=started_at,
+                finished_at=finished_at,
+                status=status,
+            )
+
+    def _units(self, project_ids, project_statuses, per_project, customer_ids):
+        types = list(UNIT_TYPES)
+        type_weights = [UNIT_TYPES[t][0] for t in types]
+        for project_id in project_ids:
+            # Precio base por m² del proyecto (CLP), con distribución log-normal
+            base_price_m2 = Decimal(int(self.rng.lognormvariate(14.6, 0.3)))
+            status_weights = UNIT_STATUS_MIX[project_statuses[project_id]]
+            units_per_floor = self.rng.randint(4, 12)
+            for index in range(per_project):
+                unit_type = self.rng.choices(types, type_weights)[0]
+                _, mean, deviation, minimum, maximum, factor = UNIT_TYPES[unit_type]
+                square_meters = Decimal(
+                    min(max(self.rng.gauss(mean, deviation), minimum), maximum)
+                ).quantize(Decimal('0.01'))
+                price_m2 = base_price_m2 * factor * Decimal(self.rng.uniform(0.9, 1.1))
+                price = min(int(square_meters * price_m2), MAX_PRICE)
+                unit_status = self.rng.choices(('Available', 'Reserved', 'Sold'), status_weights)[0]
+                customer_id = None
+                deposit = 0
+                if unit_status != 'Available' and customer_ids:
+                    customer_id = self.rng.choice(customer_ids)
+                    deposit = int(price * self.rng.choice((0.02, 0.05, 0.1)))
+                floor, position = divmod(index, units_per_floor)
+                yield Unit(
+                    project_id=project_id,
+                    customer_id=customer_id,
+                    unit_number=f'{floor + 1}{position + 1:02d}',
+                    unit_type=unit_type,
+                    square_meters=square_meters,
+                    price=price,
+                    reservation_deposit=deposit,
+                    unit_status=unit_status,
+                    price_per_m2=Unit.compute_price_per_m2(price, square_meters),
+                )
+
+
+def _ascii(value):
+    table = str.maketrans('áéíóúñÁÉÍÓÚÑ', 'aeiounAEIOUN')
+    return value.translate(table).lower()
@@ -0,0 +1,118 @@
+import threading
+import weakref
+from collections import Counter as Tally
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from prometheus_client import Counter, Gauge, Histogram
+
+# Con PROMETHEUS_MULTIPROC_DIR definido, prometheus_client guarda los valores en
+# archivos compartidos y /metrics agrega los de todos los workers.
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Latencia de las solicitudes HTTP.',
+    ['view', 'action', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes',
+    'Tamaño del cuerpo de las respuestas HTTP.',
+    ['view', 'action'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+REQUESTS = Counter(
+    'http_requests_total',
+    'Solicitudes HTTP por código de estado.',
+    ['view', 'action', 'method', 'status'],
+)
+EXCEPTIONS = Counter(
+    'http_exceptions_total',
+    'Excepciones no controladas por las vistas.',
+    ['view', 'action', 'exception'],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress',
+    'Solicitudes HTTP en curso.',
+    multiprocess_mode='livesum',
+)
+DB_QUERIES = Histogram(
+    'db_queries_per_request',
+    'Consultas SQL ejecutadas por solicitud.',
+    ['view', 'action'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds',
+    'Duración de las consultas SQL.',
+    ['view', 'action'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+DB_SLOW_QUERIES = Counter(
+    'db_slow_queries_total',
+    'Consultas SQL que superaron SLOW_QUERY_THRESHOLD_MS.',
+    ['view', 'action'],
+)
+DB_CONNECTIONS_OPEN = Gauge(
+    'db_connections_open',
+    'Conexiones abiertas a la base de datos por alias, de todos los hilos, incluidas las que CONN_MAX_AGE mantiene ociosas.',
+    ['alias'],
+    multiprocess_mode='livesum',
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    'db_connections_in_use',
+    'Conexiones a la base de datos usadas por solicitudes en curso, por alias.',
+    ['alias'],
+    multiprocess_mode='livesum',
+)
+REALTIME_SUBSCRIBERS = Gauge(
+    'realtime_subscribers',
+    'Suscriptores conectados al stream de disponibilidad de unidades.',
+    multiprocess_mode='livesum',
+)
+FIRST_REQUEST_SECONDS = Gauge(
+    'process_first_request_seconds',
+    'Segundos desde el inicio del proceso hasta servir la primera respuesta.',
+    multiprocess_mode='liveall',
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total',
+    'Lecturas de caché por resultado (hit o miss).',
+    ['cache', 'result'],
+)
+COMPRESSION_CPU_SECONDS = Counter(
+    'http_compression_cpu_seconds_total',
+    'Tiempo de CPU usado en comprimir respuestas.',
+    ['view', 'action', 'encoding'],
+)
+COMPRESSION_BYTES_SAVED = Counter(
+    'http_compression_bytes_saved_total',
+    'Bytes ahorrados por la compresión de respuestas.',
+    ['view', 'action', 'encoding'],
+)
+
+
+def record_cache_lookup(cache_name, hit):
+    CACHE_REQUESTS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+# Las conexiones de Django son por hilo: se guardan todas las que se abren en el
+# proceso para contar las que siguen abiertas, no solo la del hilo que responde
+_connections = weakref.WeakSet()
+_connections_lock = threading.Lock()
+
+
+def _track_connection(sender, connection, **kwargs):
+    with _connections_lock:
+        _connections.add(connection)
+
+
+connection_created.connect(_track_connection, dispatch_uid='core.metrics.track_connection')
+
+
+def observe_db_connections():
+    with _connections_lock:
+        tracked = list(_connections)
+    open_by_alias = Tally(wrapper.alias for wrapper in tracked if wrapper.connection is not None)
+    for alias in connections:
+        DB_CONNECTIONS_OPEN.labels(alias).set(open_by_alias[alias])
@@ -0,0 +1,114 @@
+import gzip
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from core import metrics
+from .metrics import resolve_view_labels
+
+try:
+    import brotli
+except ImportError:  # Sin Brotli instalado solo se ofrece gzip
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/vnd.oai.openapi',
+)
+
+
+def parse_accept_encoding(header):
+    accepted = {}
+    for part in header.split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def choose_encoding(header):
+    # Se prefiere Brotli cuando el cliente lo acepta con la misma calidad que gzip
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in (('br', 'gzip') if brotli else ('gzip',)):
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, mode=brotli.MODE_TEXT, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    # Las vistas cuyo cuerpo depende solo de una llave versionada pueden asignar
+    # `response.compression_cache_key`: los bytes comprimidos se guardan en caché
+    # y las siguientes respuestas iguales no se vuelven a comprimir.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        # Los streams (SSE) no se comprimen para no retener eventos en el buffer
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        view, action = resolve_view_labels(request)
+        compressed = self._compress(response, encoding, view, action)
+        if len(compressed) >= len(response.content):
+            return response
+        metrics.COMPRESSION_BYTES_SAVED.labels(view, action, encoding).inc(len(response.content) - len(compressed))
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+    def _compress(self, response, encoding, view, action):
+        cache_key = None
+        if getattr(response, 'compression_cache_key', None):
+            # El Content-Type trae espacios y ';', que memcached no acepta en las llaves
+            variant = f"{response.compression_cache_key}:{response['Content-Type']}:{encoding}"
+            cache_key = f"compressed:{hashlib.sha256(variant.encode()).hexdigest()}"
+            compressed = cache.get(cache_key)
+            metrics.record_cache_lookup('compression', compressed is not None)
+            if compressed is not None:
+                return compressed
+
+        started = time.thread_time()
+        compressed = compress(response.content, encoding)
+        metrics.COMPRESSION_CPU_SECONDS.labels(view, action, encoding).inc(time.thread_time() - started)
+        if cache_key:
+            cache.set(cache_key, compressed, settings.COMPRESSION_CACHE_SECONDS)
+        return compressed
@@ -0,0 +1,73 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from core import metrics
+from core.startup import seconds_since_start
+
+
+def resolve_view_labels(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched', 'none'
+    func = match.func
+    view_class = getattr(func, 'cls', None) or getattr(func, 'view_class', None)
+    view = view_class.__name__ if view_class else getattr(func, '__name__', 'unknown')
+    # Los ViewSet de DRF exponen el mapeo método HTTP -> acción en `actions`
+    actions = getattr(func, 'actions', None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return view, action
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Con preload_app cada worker hereda este valor y registra su propio primer request
+        self.awaiting_first_request = True
+
+    def __call__(self, request):
+        query_durations = []
+        aliases_in_use = set()
+
+        def count_queries(execute, sql, params, many, context):
+            alias = context['connection'].alias
+            if alias not in aliases_in_use:
+                aliases_in_use.add(alias)
+                metrics.DB_CONNECTIONS_IN_USE.labels(alias).inc()
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                query_durations.append(time.perf_counter() - started)
+
+        metrics.REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(count_queries))
+                response = self.get_response(request)
+        finally:
+            metrics.REQUESTS_IN_PROGRESS.dec()
+            for alias in aliases_in_use:
+                metrics.DB_CONNECTIONS_IN_USE.labels(alias).dec()
+
+        view, action = resolve_view_labels(request)
+        metrics.REQUEST_LATENCY.labels(view, action, request.method).observe(time.perf_counter() - started)
+        metrics.REQUESTS.labels(view, action, request.method, str(response.status_code)).inc()
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.labels(view, action).observe(len(response.content))
+        metrics.DB_QUERIES.labels(view, action).observe(len(query_durations))
+        query_histogram = metrics.DB_QUERY_DURATION.labels(view, action)
+        for duration in query_durations:
+            query_histogram.observe(duration)
+        if self.awaiting_first_request:
+            self.awaiting_first_request = False
+            metrics.FIRST_REQUEST_SECONDS.set(seconds_since_start())
+        metrics.observe_db_connections()
+        return response
+
+    def process_exception(self, request, exception):
+        view, action = resolve_view_labels(request)
+        metrics.EXCEPTIONS.labels(view, action, type(exception).__name__).inc()
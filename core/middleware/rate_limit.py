@@ -0,0 +1,20 @@
+import math
+
+
+class RateLimitHeadersMiddleware:
+    # Agrega RateLimit-Limit/Remaining/Reset (borrador IETF de headers de rate limit)
+    # con el límite más cercano a agotarse entre los throttles que evaluaron el request
+    # (ver core.views.throttling). Retry-After en los 429 lo agrega DRF.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        limits = getattr(request, 'rate_limits', None)
+        if limits:
+            limit, remaining, reset = min(limits, key=lambda item: (item[1], -item[2]))
+            response.headers['RateLimit-Limit'] = str(limit)
+            response.headers['RateLimit-Remaining'] = str(remaining)
+            response.headers['RateLimit-Reset'] = str(math.ceil(reset))
+        return response
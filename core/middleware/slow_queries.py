@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from core import metrics
+from core.middleware.metrics import resolve_view_labels
+
+logger = logging.getLogger('core.slow_queries')
+
+CORE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIDDLEWARE_DIR = os.path.join(CORE_DIR, 'middleware')
+SERVICES_DIR = os.path.join(CORE_DIR, 'services')
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    # Normaliza literales y listas IN para que la misma forma de consulta
+    # produzca siempre la misma huella, sin importar los valores.
+    normalized = _STRING_LITERAL.sub('?', sql)
+    normalized = normalized.replace('%s', '?')
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _PLACEHOLDER_LIST.sub('(?+)', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip().lower()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16], normalized
+
+
+def find_caller():
+    # Prioriza el frame de un servicio; si la consulta se evaluó de forma
+    # perezosa fuera del servicio, se usa el frame más interno de `core`.
+    core_frame = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(SERVICES_DIR):
+            return _describe(frame)
+        if core_frame is None and filename.startswith(CORE_DIR) and not filename.startswith(MIDDLEWARE_DIR):
+            core_frame = frame
+        frame = frame.f_back
+    return _describe(core_frame) if core_frame is not None else None
+
+
+def _describe(frame):
+    owner = frame.f_locals.get('self') or frame.f_locals.get('cls')
+    name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+    if owner is not None and '.' not in name:
+        owner_name = owner.__name__ if isinstance(owner, type) else type(owner).__name__
+        name = f'{owner_name}.{name}'
+    module = os.path.relpath(frame.f_code.co_filename, os.path.dirname(CORE_DIR))
+    return f'{module}:{frame.f_lineno} {name}'
+
+
+class SlowQueryLog:
+    max_fingerprints = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = OrderedDict()
+
+    def reset(self):
+        with self._lock:
+            self._seen.clear()
+
+    def should_log(self, key, window):
+        # Devuelve cuántas ocurrencias se omitieron desde el último registro,
+        # o None si la huella ya se registró dentro de la ventana.
+        now = time.monotonic()
+        with self._lock:
+            last_logged, suppressed = self._seen.get(key, (None, 0))
+            if last_logged is not None and now - last_logged < window:
+                self._seen[key] = (last_logged, suppressed + 1)
+                self._seen.move_to_end(key)
+                return None
+            self._seen[key] = (now, 0)
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.max_fingerprints:
+                self._seen.popitem(last=False)
+            return suppressed
+
+
+slow_query_log = SlowQueryLog()
+
+
+class SlowQueryMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self._wrapper(request, connection)))
+            return self.get_response(request)
+
+    def _wrapper(self, request, connection):
+        explaining = []
+
+        def capture(execute, sql, params, many, context):
+            started = time.perf_counter()
+            result = execute(sql, params, many, context)
+            duration_ms = (time.perf_counter() - started) * 1000
+            if not explaining and duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+                explaining.append(True)
+                try:
+                    self._record(request, connection, sql, params, many, duration_ms)
+                finally:
+                    explaining.clear()
+            return result
+
+        return capture
+
+    def _record(self, request, connection, sql, params, many, duration_ms):
+        key, normalized = fingerprint(sql)
+        view, action = resolve_view_labels(request)
+        metrics.DB_SLOW_QUERIES.labels(view, action).inc()
+        suppressed = slow_query_log.should_log(key, settings.SLOW_QUERY_DEDUP_SECONDS)
+        if suppressed is None:
+            return
+        entry = {
+            'fingerprint': key,
+            'duration_ms': round(duration_ms, 2),
+            'sql': sql,
+            'normalized_sql': normalized,
+            'params': repr(params)[:500] if settings.SLOW_QUERY_LOG_PARAMS else None,
+            'view': view,
+            'action': action,
+            'path': request.path,
+            'filters': sorted(request.GET.keys()),
+            'caller': find_caller(),
+            'suppressed_since_last': suppressed,
+            'explain': None if many else self._explain(connection, sql, params),
+        }
+        logger.warning(json.dumps(entry, default=str, ensure_ascii=False))
+
+    def _explain(self, connection, sql, params):
+        if not sql.lstrip().upper().startswith('SELECT'):
+            return None
+        options = {}
+        if settings.SLOW_QUERY_EXPLAIN_ANALYZE and connection.vendor == 'postgresql':
+            options['analyze'] = True
+        try:
+            prefix = connection.ops.explain_query_prefix(**options)
+            # El savepoint evita que un EXPLAIN fallido aborte la transacción en curso
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(f'{prefix} {sql}', params)
+                return [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+        except Exception as exc:
+            return [f'EXPLAIN falló: {exc}']
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_alter_customer_phone_alter_customer_rut_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProject',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('address', models.CharField(max_length=255)),
+                ('started_at', models.DateField()),
+                ('finished_at', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('Off Plan', 'Off Plan'), ('Under Construction', 'Under Construction'), ('Finished', 'Finished'), ('Sold', 'Sold')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedUnit',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('project', models.UUIDField(db_column='project_id', db_index=True)),
+                ('customer', models.UUIDField(blank=True, db_column='customer_id', null=True)),
+                ('unit_number', models.CharField(max_length=10)),
+                ('unit_type', models.CharField(choices=[('Apartment', 'Apartment'), ('House', 'House'), ('Office', 'Office'), ('Commercial', 'Commercial')], max_length=20)),
+                ('square_meters', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('price', models.IntegerField(default=0)),
+                ('reservation_deposit', models.IntegerField(default=0)),
+                ('unit_status', models.CharField(choices=[('Available', 'Available'), ('Sold', 'Sold'), ('Reserved', 'Reserved')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+            ],
+        ),
+    ]
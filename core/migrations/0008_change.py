@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:20
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity', models.CharField(choices=[('project', 'project'), ('unit', 'unit'), ('customer', 'customer')], max_length=20)),
+                ('entity_id', models.UUIDField()),
+                ('operation', models.CharField(choices=[('upsert', 'upsert'), ('delete', 'delete')], max_length=10)),
+                ('payload', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:28
+
+import django.core.serializers.json
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_change'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Repricing',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('rule', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('filters', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('units_affected', models.PositiveIntegerField()),
+                ('total_before', models.BigIntegerField()),
+                ('total_after', models.BigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='repricings', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
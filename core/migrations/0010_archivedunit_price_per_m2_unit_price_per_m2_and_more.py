@@ -0,0 +1,42 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:42
+
+from django.db import migrations, models
+from django.db.models import DecimalField, ExpressionWrapper, F
+from django.db.models.functions import Round
+
+
+def backfill_price_per_m2(apps, schema_editor):
+    # Un solo UPDATE por tabla, antes de crear el índice
+    for model_name in ('Unit', 'ArchivedUnit'):
+        model = apps.get_model('core', model_name)
+        model.objects.filter(square_meters__gt=0).update(
+            price_per_m2=Round(
+                ExpressionWrapper(F('price') * 1.0 / F('square_meters'), output_field=DecimalField()),
+                2
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_repricing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedunit',
+            name='price_per_m2',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='unit',
+            name='price_per_m2',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.RunPython(backfill_price_per_m2, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['project', 'unit_status', 'price_per_m2'], name='core_unit_project_b66cf3_idx'),
+        ),
+    ]
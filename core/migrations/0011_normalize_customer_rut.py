@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:46
+
+from django.db import migrations
+
+from core.utils.rut import normalize_rut
+
+
+def normalize_customer_ruts(apps, schema_editor):
+    # Los RUT que chocarían con otro ya canónico se dejan como están para revisarlos a mano
+    Customer = apps.get_model('core', 'Customer')
+    existing = set(Customer.objects.values_list('rut', flat=True))
+    pending = []
+    for customer in Customer.objects.only('id', 'rut').iterator(chunk_size=2000):
+        rut = normalize_rut(customer.rut)
+        if rut == customer.rut or rut in existing:
+            continue
+        existing.add(rut)
+        customer.rut = rut
+        pending.append(customer)
+    Customer.objects.bulk_update(pending, ['rut'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_archivedunit_price_per_m2_unit_price_per_m2_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_customer_ruts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_normalize_customer_rut'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedproject',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='archivedunit',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='unit',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.5 on 2026-10-19 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_versions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['created_at'], name='core_custom_created_629a7b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status'], name='core_projec_status_2020cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['created_at'], name='core_unit_created_4cdacb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['unit_status', 'created_at'], name='core_unit_unit_st_319da3_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.5 on 2026-10-19 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_admin_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project', models.UUIDField(db_column='project_id')),
+                ('day', models.DateField()),
+                ('reservations', models.PositiveIntegerField(default=0)),
+                ('sales', models.PositiveIntegerField(default=0)),
+                ('releases', models.PositiveIntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('deposits', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='core_salesr_day_6139ec_idx')],
+                'constraints': [models.UniqueConstraint(fields=('project', 'day'), name='unique_sales_rollup_project_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.5 on 2026-10-19 05:11
+
+from django.db import migrations, models
+
+
+def seed_initial_snapshots(apps, schema_editor):
+    # Sin historia previa, cada unidad (activa o archivada) parte con su estado
+    # actual registrado en su fecha de creación.
+    qn = schema_editor.connection.ops.quote_name
+    history = apps.get_model('core', 'UnitHistory')._meta.db_table
+    for model_name in ('Unit', 'ArchivedUnit'):
+        source = apps.get_model('core', model_name)._meta.db_table
+        schema_editor.execute(
+            'INSERT INTO {history} (unit_id, project_id, unit_number, event, unit_status, price, reservation_deposit, customer_id, changed_at) '
+            'SELECT id, project_id, unit_number, %s, unit_status, price, reservation_deposit, customer_id, created_at FROM {source}'.format(
+                history=qn(history), source=qn(source)
+            ),
+            ['created']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_sales_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnitHistory',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('unit', models.UUIDField(db_column='unit_id')),
+                ('project', models.UUIDField(db_column='project_id')),
+                ('unit_number', models.CharField(max_length=10)),
+                ('event', models.CharField(choices=[('created', 'created'), ('changed', 'changed'), ('deleted', 'deleted')], max_length=10)),
+                ('unit_status', models.CharField(choices=[('Available', 'Available'), ('Sold', 'Sold'), ('Reserved', 'Reserved')], max_length=20)),
+                ('price', models.IntegerField()),
+                ('reservation_deposit', models.IntegerField()),
+                ('customer', models.UUIDField(blank=True, db_column='customer_id', null=True)),
+                ('changed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['unit', 'changed_at'], name='core_unithi_unit_id_3f4a80_idx'), models.Index(fields=['project', 'changed_at'], name='core_unithi_project_b471a3_idx')],
+            },
+        ),
+        migrations.RunPython(seed_initial_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-19 05:37
+
+import core.models.models
+from django.db import migrations, models
+from django.db.models import F
+
+
+def publish_existing_changes(apps, schema_editor):
+    # Los cambios existentes ya están confirmados: su posición es su seq, así los
+    # cursores que tienen los clientes siguen siendo válidos.
+    Change = apps.get_model('core', 'Change')
+    Change.objects.using(schema_editor.connection.alias).update(position=F('seq'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_unit_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='position',
+            field=models.BigIntegerField(editable=False, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='change',
+            name='txid',
+            field=models.BigIntegerField(db_default=core.models.models.CurrentTransactionId(), editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(condition=models.Q(('position__isnull', True)), fields=['txid', 'seq'], name='change_unpublished_idx'),
+        ),
+        migrations.RunPython(publish_existing_changes, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,11 @@
 import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator
+from ..utils.rut import normalize_rut
 
 class Project(models.Model):
     PROJECT_STATUS = (
@@ -22,8 +26,15 @@ class Project(models.Model):
     started_at = models.DateField()
     finished_at = models.DateField(blank=True, null=True)
     status = models.CharField(max_length=20, choices=PROJECT_STATUS, default="Off Plan")
+    # Concurrencia optimista: cada UPDATE exige la versión leída y la incrementa (ver VersionService)
+    version = models.PositiveIntegerField(default=1, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -48,11 +59,22 @@ class Customer(models.Model):
         blank=True,
         null=True
     )
+    version = models.PositiveIntegerField(default=1, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
     def __str__(self):
         return f"{self.name} {self.lastname}"
 
+    def save(self, *args, **kwargs):
+        # El RUT se guarda siempre en forma canónica para que el índice único y las búsquedas por IN funcionen
+        self.rut = normalize_rut(self.rut)
+        super().save(*args, **kwargs)
+
 
 class Unit(models.Model):
     UNIT_STATUS = (
@@ -90,7 +112,242 @@ class Unit(models.Model):
     price = models.IntegerField(default=0)
     reservation_deposit = models.IntegerField(default=0)
     unit_status = models.CharField(max_length=20, choices=UNIT_STATUS, default='Available')
+    # Derivado de price / square_meters; se recalcula en save() y en los UPDATE masivos
+    price_per_m2 = models.DecimalField(max_digits=14, decimal_places=2, blank=True, null=True, editable=False)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'unit_status', 'price_per_m2']),
+            # Listados globales (API y admin) ordenados por fecha, con o sin filtro de estado
+            models.Index(fields=['created_at']),
+            models.Index(fields=['unit_status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Unit {self.unit_number} - {self.project.name}"
+
+    @staticmethod
+    def compute_price_per_m2(price, square_meters):
+        square_meters = Decimal(str(square_meters or 0))
+        if not square_meters:
+            return None
+        return (Decimal(price or 0) / square_meters).quantize(Decimal('0.01'))
+
+    def sync_price_per_m2(self, update_fields=None):
+        # Retorna update_fields con price_per_m2 cuando cambia alguna de sus fuentes
+        self.price_per_m2 = self.compute_price_per_m2(self.price, self.square_meters)
+        if update_fields is not None and {'price', 'square_meters'} & set(update_fields):
+            return {*update_fields, 'price_per_m2'}
+        return update_fields
+
+    def save(self, *args, **kwargs):
+        update_fields = self.sync_price_per_m2(kwargs.get('update_fields'))
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+class ArchivedProject(models.Model):
+    # Copia en frío de proyectos Sold/Finished (ver ArchiveService). Las columnas
+    # deben coincidir con las de Project para poder copiar filas con INSERT ... SELECT.
+    id = models.UUIDField(primary_key=True, editable=False)
+    name = models.CharField(max_length=200)
+    description = models.TextField(blank=True, null=True)
+    address = models.CharField(max_length=255)
+    started_at = models.DateField()
+    finished_at = models.DateField(blank=True, null=True)
+    status = models.CharField(max_length=20, choices=Project.PROJECT_STATUS)
+    version = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.name
+
+
+class ArchivedUnit(models.Model):
+    # Sin llaves foráneas: el proyecto vive en ArchivedProject y el cliente puede
+    # haberse eliminado mientras la unidad estaba archivada.
+    id = models.UUIDField(primary_key=True, editable=False)
+    project = models.UUIDField(db_column='project_id', db_index=True)
+    customer = models.UUIDField(db_column='customer_id', blank=True, null=True)
+    unit_number = models.CharField(max_length=10)
+    unit_type = models.CharField(max_length=20, choices=Unit.UNIT_TYPE)
+    square_meters = models.DecimalField(max_digits=5, decimal_places=2)
+    price = models.IntegerField(default=0)
+    reservation_deposit = models.IntegerField(default=0)
+    unit_status = models.CharField(max_length=20, choices=Unit.UNIT_STATUS)
+    price_per_m2 = models.DecimalField(max_digits=14, decimal_places=2, blank=True, null=True)
+    version = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Unit {self.unit_number} (archivada)"
+
+
+class Job(models.Model):
+    JOB_STATUS = (
+        ('Queued', 'Queued'),
+        ('Running', 'Running'),
+        ('Succeeded', 'Succeeded'),
+        ('Failed', 'Failed'),
+    )
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=JOB_STATUS, default='Queued')
+    progress = models.PositiveSmallIntegerField(default=0)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    worker = models.CharField(max_length=100, blank=True, null=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='jobs',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} ({self.status})"
+
+
+class CurrentTransactionId(models.Func):
+    # Id de la transacción actual (Postgres 13+). SQLite serializa las escrituras:
+    # el orden de seq ya es el orden de commit y no hace falta.
+    template = 'pg_current_xact_id()::text::bigint'
+    output_field = models.BigIntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return 'NULL', []
+
+
+class Change(models.Model):
+    ENTITIES = (
+        ('project', 'project'),
+        ('unit', 'unit'),
+        ('customer', 'customer'),
+    )
+    OPERATIONS = (
+        ('upsert', 'upsert'),
+        ('delete', 'delete'),
+    )
+
+    # Orden de inserción. Una transacción larga puede confirmar un seq menor después
+    # que otra uno mayor, por eso los clientes usan `position` como cursor (?since=).
+    seq = models.BigAutoField(primary_key=True)
+    entity = models.CharField(max_length=20, choices=ENTITIES)
+    entity_id = models.UUIDField()
+    operation = models.CharField(max_length=10, choices=OPERATIONS)
+    payload = models.JSONField(encoder=DjangoJSONEncoder, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Transacción que insertó la fila; la asigna la base de datos (ver ChangeService.publish)
+    txid = models.BigIntegerField(null=True, editable=False, db_default=CurrentTransactionId())
+    # Posición en orden de commit, asignada al publicar; nula mientras no es visible
+    position = models.BigIntegerField(null=True, unique=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['txid', 'seq'], name='change_unpublished_idx', condition=models.Q(position__isnull=True)
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.seq} {self.operation} {self.entity} {self.entity_id}"
+
+
+class Repricing(models.Model):
+    # Registro de auditoría de cada repricing aplicado (ver RepricingService)
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    rule = models.JSONField(encoder=DjangoJSONEncoder)
+    filters = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    units_affected = models.PositiveIntegerField()
+    total_before = models.BigIntegerField()
+    total_after = models.BigIntegerField()
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='repricings',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Repricing {self.rule.get('mode')} ({self.units_affected} unidades)"
+
+
+class SalesRollup(models.Model):
+    # Totales diarios por proyecto que UnitService actualiza en la misma transacción
+    # que el cambio de estado (ver SalesRollupService). Sin llave foránea, como las
+    # tablas de archivo, para que la serie sobreviva al archivado del proyecto.
+    project = models.UUIDField(db_column='project_id')
+    day = models.DateField()
+    reservations = models.PositiveIntegerField(default=0)
+    sales = models.PositiveIntegerField(default=0)
+    releases = models.PositiveIntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+    deposits = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'day'], name='unique_sales_rollup_project_day'),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"{self.project} {self.day}"
+
+
+class UnitHistory(models.Model):
+    # Registro append-only del estado, precio y cliente de cada unidad (ver
+    # UnitHistoryService). Cada fila es la foto completa después del cambio. Sin
+    # llaves foráneas para que la historia sobreviva al borrado y al archivado.
+    EVENTS = (
+        ('created', 'created'),
+        ('changed', 'changed'),
+        ('deleted', 'deleted'),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    unit = models.UUIDField(db_column='unit_id')
+    project = models.UUIDField(db_column='project_id')
+    unit_number = models.CharField(max_length=10)
+    event = models.CharField(max_length=10, choices=EVENTS)
+    unit_status = models.CharField(max_length=20, choices=Unit.UNIT_STATUS)
+    price = models.IntegerField()
+    reservation_deposit = models.IntegerField()
+    customer = models.UUIDField(db_column='customer_id', blank=True, null=True)
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['unit', 'changed_at']),
+            models.Index(fields=['project', 'changed_at']),
+        ]
 
     def __str__(self):
-        return f"Unit {self.unit_number} - {self.project.name}"
\ No newline at end of file
+        return f"{self.unit} {self.event} {self.unit_status} ({self.changed_at})"
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils.module_loading import import_string
+
+from core import metrics
+
+CLOSED = object()
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    def __init__(self, channel, maxsize):
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def deliver(self, message):
+        # Se ejecuta en el loop del suscriptor. Un cliente que no alcanza a leer
+        # se desconecta en vez de acumular memoria; al reconectar pide el estado completo.
+        if self.closed:
+            return
+        if self.queue.full():
+            self.closed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(CLOSED)
+            return
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class InProcessBroadcaster:
+    # Fan-out en memoria: solo llega a los suscriptores del mismo proceso. Otros
+    # backends (Redis, LISTEN/NOTIFY) deben exponer subscribe/unsubscribe/publish.
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, channel):
+        subscription = Subscription(channel, self.queue_size)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        metrics.REALTIME_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.channel)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[subscription.channel]
+        metrics.REALTIME_SUBSCRIBERS.dec()
+
+    def publish(self, channel, message):
+        # Seguro desde cualquier hilo: la entrega se agenda en el loop de cada suscriptor
+        with self._lock:
+            subscribers = list(self._subscriptions.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # El loop del suscriptor ya terminó
+                self.unsubscribe(subscription)
+        return len(subscribers)
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscriptions.get(channel, ()))
+            return sum(len(subscribers) for subscribers in self._subscriptions.values())
+
+
+class PostgresBroadcaster(InProcessBroadcaster):
+    # Para procesos separados: gunicorn publica con pg_notify y el proceso ASGI escucha
+    # con una conexión propia en un hilo, que reparte en memoria a sus suscriptores.
+    notify_channel = 'core_realtime'
+
+    def __init__(self, queue_size=100):
+        super().__init__(queue_size)
+        self._listener = None
+
+    def subscribe(self, channel):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='realtime-listener', daemon=True)
+                self._listener.start()
+        return super().subscribe(channel)
+
+    def publish(self, channel, message):
+        # NOTIFY llega a todos los procesos que escuchan, incluido este
+        payload = json.dumps({'channel': channel, 'message': message})
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.notify_channel, payload])
+        return self.subscriber_count(channel)
+
+    def dispatch(self, payload):
+        data = json.loads(payload)
+        return super().publish(data['channel'], data['message'])
+
+    def _listen(self):
+        wrapper = connections['default']
+        while True:
+            listener = None
+            try:
+                listener = wrapper.get_new_connection(wrapper.get_connection_params())
+                listener.autocommit = True
+                with listener.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.notify_channel}')
+                while True:
+                    if select.select([listener], [], [], 5) == ([], [], []):
+                        continue
+                    listener.poll()
+                    while listener.notifies:
+                        self.dispatch(listener.notifies.pop(0).payload)
+            except Exception:
+                # Los mensajes perdidos mientras no hay conexión se recuperan con /api/changes
+                logger.exception('Se perdió la conexión LISTEN del broadcaster; reintentando')
+                if listener is not None:
+                    listener.close()
+                time.sleep(1)
+
+
+@lru_cache(maxsize=None)
+def get_broadcaster():
+    return import_string(settings.REALTIME_BROADCASTER)()
+
+
+def project_channel(project_id):
+    return f'project:{project_id}'
+
+
+def publish_unit_status(unit, deleted=False):
+    # Se publica solo cuando la transacción se confirma
+    message = {
+        'unit': str(unit.id),
+        'unit_number': unit.unit_number,
+        'status': None if deleted else unit.unit_status,
+        'event': 'unit.deleted' if deleted else 'unit.status',
+    }
+    channel = project_channel(unit.project_id)
+    transaction.on_commit(lambda: get_broadcaster().publish(channel, message))
@@ -1,5 +1,11 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework import serializers
-from ..models.models import Project, Unit, Customer
+from ..models.models import Project, Unit, Customer, ArchivedProject, ArchivedUnit, Job, UnitHistory, Change
+from ..utils.rut import is_valid_rut, normalize_rut
 
 class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
@@ -7,7 +13,9 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def validate(self, attrs):
-        if attrs.get("status") == "Finished" and not attrs.get("finished_at"):
+        # En un PATCH se considera la fecha de término que el proyecto ya tiene
+        finished_at = attrs.get("finished_at", getattr(self.instance, "finished_at", None))
+        if attrs.get("status") == "Finished" and not finished_at:
             raise serializers.ValidationError("No puedes marcar un proyecto con status Finished sin asignar valor a finished_at.")
 
         if attrs.get("finished_at") and attrs.get("status") != "Finished":
@@ -42,6 +50,165 @@ class UnitSerializer(serializers.ModelSerializer):
     #     return data
 
 class CustomerSerializer(serializers.ModelSerializer):
+    # Acepta RUT con o sin formato ("12.345.678-5", "12345678-5") y lo guarda canónico
+    rut = serializers.CharField(max_length=20)
+
     class Meta:
         model = Customer
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+    def validate_rut(self, value):
+        rut = normalize_rut(value)
+        if not is_valid_rut(rut):
+            raise serializers.ValidationError("RUT inválido: el dígito verificador no corresponde.")
+        duplicates = Customer.objects.filter(rut=rut)
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError("Ya existe un cliente con este RUT.")
+        return rut
+
+class UnitWithCustomerSerializer(UnitSerializer):
+    customer = CustomerSerializer(read_only=True)
+
+class PortfolioUnitSerializer(UnitSerializer):
+    project = ProjectSerializer(read_only=True)
+
+class CustomerPortfolioSerializer(CustomerSerializer):
+    reserved_units = serializers.IntegerField(read_only=True)
+    sold_units = serializers.IntegerField(read_only=True)
+    committed_price = serializers.IntegerField(read_only=True)
+    total_deposits = serializers.IntegerField(read_only=True)
+    units = PortfolioUnitSerializer(source='portfolio_units', many=True, read_only=True)
+
+class ArchivedProjectSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedProject
+        fields = '__all__'
+
+class ArchivedUnitSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedUnit
+        fields = '__all__'
+
+class UnitHistorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UnitHistory
+        exclude = ['id']
+
+class InventoryQuerySerializer(serializers.Serializer):
+    as_of = serializers.CharField(required=False)
+
+    def validate_as_of(self, value):
+        # Una fecha sola ("2025-01-31") se toma como el final de ese día
+        try:
+            day = parse_date(value)
+            moment = None if day else parse_datetime(value)
+        except ValueError:
+            day = moment = None
+        if day:
+            moment = datetime.combine(day, time.max)
+        if moment is None:
+            raise serializers.ValidationError("Usa una fecha (AAAA-MM-DD) o fecha y hora ISO 8601.")
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'status', 'progress', 'result', 'error', 'created_at', 'started_at', 'finished_at']
+
+class ChangeSerializer(serializers.Serializer):
+    # Forma de cada cambio en /api/changes; `data` solo viene en los upsert
+    seq = serializers.IntegerField()
+    entity = serializers.ChoiceField(choices=Change.ENTITIES)
+    id = serializers.UUIDField()
+    op = serializers.ChoiceField(choices=Change.OPERATIONS)
+    data = serializers.JSONField(required=False)
+
+class ChangePageSerializer(serializers.Serializer):
+    changes = ChangeSerializer(many=True)
+    next_since = serializers.IntegerField()
+    has_more = serializers.BooleanField()
+    full_resync_required = serializers.BooleanField()
+
+class RepricingSerializer(serializers.Serializer):
+    MODES = (
+        ('percent', 'percent'),
+        ('per_m2', 'per_m2'),
+    )
+
+    project = serializers.UUIDField(required=False)
+    status = serializers.ChoiceField(choices=Unit.UNIT_STATUS, required=False)
+    type = serializers.ChoiceField(choices=Unit.UNIT_TYPE, required=False)
+    mode = serializers.ChoiceField(choices=MODES)
+    percent = serializers.DecimalField(max_digits=7, decimal_places=3, min_value=Decimal(-99), required=False)
+    rates = serializers.DictField(child=serializers.IntegerField(min_value=1), required=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if attrs['mode'] == 'percent' and attrs.get('percent') is None:
+            raise serializers.ValidationError({'percent': 'El modo percent requiere percent.'})
+        if attrs['mode'] == 'per_m2':
+            rates = attrs.get('rates')
+            if not rates:
+                raise serializers.ValidationError({'rates': 'El modo per_m2 requiere una tarifa por tipo de unidad.'})
+            invalid = set(rates) - {unit_type for unit_type, _ in Unit.UNIT_TYPE}
+            if invalid:
+                raise serializers.ValidationError({'rates': f"Tipos de unidad inválidos: {', '.join(sorted(invalid))}."})
+        return attrs
+
+    def get_filters(self):
+        return {name: self.validated_data[name] for name in ('project', 'status', 'type') if name in self.validated_data}
+
+    def get_rule(self):
+        if self.validated_data['mode'] == 'percent':
+            return {'mode': 'percent', 'percent': str(self.validated_data['percent'])}
+        return {'mode': 'per_m2', 'rates': self.validated_data['rates']}
+
+class RutBatchSerializer(serializers.Serializer):
+    ruts = serializers.ListField(child=serializers.CharField(max_length=20), allow_empty=False)
+
+    def validate_ruts(self, value):
+        if len(value) > settings.RUT_BATCH_MAX:
+            raise serializers.ValidationError(f"Se pueden resolver hasta {settings.RUT_BATCH_MAX} RUT por solicitud.")
+        return value
+
+class SalesQuerySerializer(serializers.Serializer):
+    GRANULARITIES = (
+        ('day', 'day'),
+        ('week', 'week'),
+        ('month', 'month'),
+    )
+
+    project = serializers.UUIDField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    granularity = serializers.ChoiceField(choices=GRANULARITIES, default='day')
+
+    def validate(self, attrs):
+        # Por defecto, los últimos 30 días
+        attrs.setdefault('date_to', timezone.localdate())
+        attrs.setdefault('date_from', attrs['date_to'] - timedelta(days=29))
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({'from': 'from debe ser anterior o igual a to.'})
+        return attrs
+
+class SalesPeriodSerializer(serializers.Serializer):
+    # Una fila de SalesRollupService.get_sales
+    period = serializers.DateField()
+    reservations = serializers.IntegerField()
+    sales = serializers.IntegerField()
+    releases = serializers.IntegerField()
+    revenue = serializers.IntegerField()
+    deposits = serializers.IntegerField()
+
+class IdBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+    def validate_ids(self, value):
+        if len(value) > settings.BATCH_GET_MAX:
+            raise serializers.ValidationError(f"Se pueden pedir hasta {settings.BATCH_GET_MAX} IDs por solicitud.")
+        # Sin repetidos, conservando el orden de la solicitud
+        return list(dict.fromkeys(value))
@@ -0,0 +1,123 @@
+from django.db import connection, transaction
+from django.db.models import BooleanField, F, Value
+from django.utils import timezone
+
+from ..models.models import ArchivedProject, ArchivedUnit, Customer, Project, Unit
+from ..utils.sql import delete_rows
+from .availability_service import AvailabilityService
+from .change_service import ChangeService
+from .unit_history_service import UnitHistoryService
+
+
+def _copy_rows(source, target, field_name, values, extra=None):
+    # INSERT ... SELECT entre tablas con las mismas columnas: las filas no pasan por Python
+    extra = extra or {}
+    qn = connection.ops.quote_name
+    target_columns = {field.column for field in target._meta.concrete_fields}
+    columns = [field.column for field in source._meta.concrete_fields if field.column in target_columns]
+    field = source._meta.get_field(field_name)
+    params = [
+        target._meta.get_field(name).get_db_prep_value(value, connection)
+        for name, value in extra.items()
+    ]
+    params += [field.target_field.get_db_prep_value(value, connection) if field.is_relation
+               else field.get_db_prep_value(value, connection) for value in values]
+    sql = 'INSERT INTO {target} ({target_columns}) SELECT {source_columns} FROM {source} WHERE {column} IN ({placeholders})'.format(
+        target=qn(target._meta.db_table),
+        target_columns=', '.join(qn(c) for c in columns + [target._meta.get_field(name).column for name in extra]),
+        source_columns=', '.join([qn(c) for c in columns] + ['%s'] * len(extra)),
+        source=qn(source._meta.db_table),
+        column=qn(field.column),
+        placeholders=', '.join(['%s'] * len(values)),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+class ArchiveService:
+    ARCHIVABLE_STATUSES = ('Sold', 'Finished')
+
+    @staticmethod
+    def get_archivable_project_ids(statuses=ARCHIVABLE_STATUSES, finished_before=None):
+        queryset = Project.objects.filter(status__in=statuses)
+        if finished_before is not None:
+            queryset = queryset.filter(finished_at__lte=finished_before)
+        return list(queryset.order_by('created_at').values_list('id', flat=True))
+
+    @staticmethod
+    def archive_projects(project_ids, statuses=ARCHIVABLE_STATUSES):
+        with transaction.atomic():
+            # Se bloquean y revalidan los proyectos por si cambiaron de estado
+            project_ids = list(
+                Project.objects.select_for_update()
+                .filter(id__in=project_ids, status__in=statuses)
+                .values_list('id', flat=True)
+            )
+            if not project_ids:
+                return 0, 0
+            extra = {'archived_at': timezone.now()}
+            projects = _copy_rows(Project, ArchivedProject, 'id', project_ids, extra)
+            units = _copy_rows(Unit, ArchivedUnit, 'project', project_ids, extra)
+            # Para los clientes sincronizados un proyecto archivado deja de existir
+            ChangeService.record_deletes_for('unit', Unit.objects.filter(project_id__in=project_ids))
+            ChangeService.record_deletes_for('project', Project.objects.filter(id__in=project_ids))
+            delete_rows(Unit.objects.filter(project_id__in=project_ids))
+            delete_rows(Project.objects.filter(id__in=project_ids))
+            AvailabilityService.invalidate(*project_ids)
+        return projects, units
+
+    @staticmethod
+    def restore_projects(project_ids):
+        with transaction.atomic():
+            project_ids = list(
+                ArchivedProject.objects.select_for_update()
+                .filter(id__in=project_ids)
+                .values_list('id', flat=True)
+            )
+            if not project_ids:
+                return 0, 0
+            projects = _copy_rows(ArchivedProject, Project, 'id', project_ids)
+            units = _copy_rows(ArchivedUnit, Unit, 'project', project_ids)
+            # Clientes eliminados mientras la unidad estaba archivada
+            orphaned = Unit.objects.filter(project_id__in=project_ids, customer__isnull=False).exclude(
+                customer_id__in=Customer.objects.values('id')
+            )
+            UnitHistoryService.record_for(orphaned, 'changed', customer=None)
+            orphaned.update(customer=None, version=F('version') + 1)
+            ChangeService.record_upserts('project', Project.objects.filter(id__in=project_ids))
+            ChangeService.record_upserts('unit', Unit.objects.filter(project_id__in=project_ids).iterator(chunk_size=2000))
+            delete_rows(ArchivedUnit.objects.filter(project__in=project_ids))
+            delete_rows(ArchivedProject.objects.filter(id__in=project_ids))
+        return projects, units
+
+    @staticmethod
+    def get_archived_projects():
+        return ArchivedProject.objects.all().order_by('-created_at')
+
+    @staticmethod
+    def get_archived_units():
+        return ArchivedUnit.objects.all().order_by('-created_at')
+
+    @staticmethod
+    def get_archived_project_by_id(project_id):
+        return ArchivedProject.objects.filter(id=project_id).first()
+
+    @staticmethod
+    def get_archived_unit_by_id(unit_id):
+        return ArchivedUnit.objects.filter(id=unit_id).first()
+
+    @staticmethod
+    def union_with_archive(queryset, archived_queryset, fields):
+        # Solo se combinan las columnas de orden; las filas completas se cargan
+        # después para la página solicitada (ver load_page).
+        hot = queryset.order_by().values(*fields).annotate(archived=Value(False, output_field=BooleanField()))
+        cold = archived_queryset.order_by().values(*fields).annotate(archived=Value(True, output_field=BooleanField()))
+        return hot.union(cold, all=True)
+
+    @staticmethod
+    def load_page(rows, model, archived_model):
+        hot = model.objects.in_bulk([row['id'] for row in rows if not row['archived']])
+        cold = archived_model.objects.in_bulk([row['id'] for row in rows if row['archived']])
+        objects = [(cold if row['archived'] else hot).get(row['id']) for row in rows]
+        return [obj for obj in objects if obj is not None]
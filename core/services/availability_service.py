@@ -0,0 +1,75 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.functions import Length
+
+from core import metrics
+from ..models.models import Project, Unit
+
+# Un carácter por unidad, en el mismo orden que unit_numbers
+STATUS_CODES = {'Available': 'A', 'Reserved': 'R', 'Sold': 'S'}
+
+
+class AvailabilityService:
+
+    @staticmethod
+    def _version_key(project_id):
+        return f'availability:{project_id}:version'
+
+    @staticmethod
+    def _get_version(project_id):
+        key = AvailabilityService._version_key(project_id)
+        version = cache.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        return version
+
+    @staticmethod
+    def invalidate(*project_ids):
+        # Se cambia la versión en vez de borrar la entrada: una lectura que empezó antes
+        # del commit guarda su resultado bajo la versión anterior y nadie la vuelve a leer.
+        keys = [AvailabilityService._version_key(project_id) for project_id in project_ids if project_id]
+        transaction.on_commit(lambda: cache.set_many({key: uuid.uuid4().hex for key in keys}, None))
+
+    @staticmethod
+    def get_availability(project_id):
+        try:
+            project_id = uuid.UUID(str(project_id))
+        except ValueError:
+            return None
+        version = AvailabilityService._get_version(project_id)
+        key = f'availability:{project_id}:{version}'
+        availability = cache.get(key)
+        metrics.record_cache_lookup('availability', availability is not None)
+        if availability is not None:
+            return availability
+
+        if not Project.objects.filter(id=project_id).exists():
+            return None
+        rows = (
+            Unit.objects.filter(project_id=project_id)
+            .order_by(Length('unit_number'), 'unit_number')
+            .values_list('unit_number', 'unit_status')
+        )
+        unit_numbers = []
+        statuses = []
+        counts = dict.fromkeys(STATUS_CODES, 0)
+        for unit_number, unit_status in rows:
+            unit_numbers.append(unit_number)
+            statuses.append(STATUS_CODES[unit_status])
+            counts[unit_status] += 1
+        availability = {
+            'project': str(project_id),
+            'version': version,
+            'units': len(unit_numbers),
+            'counts': counts,
+            'legend': {code: name for name, code in STATUS_CODES.items()},
+            'unit_numbers': unit_numbers,
+            'statuses': ''.join(statuses),
+        }
+        cache.set(key, availability, settings.AVAILABILITY_CACHE_SECONDS)
+        return availability
@@ -0,0 +1,176 @@
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from ..models.models import Change
+from ..serializers.serializers import CustomerSerializer, ProjectSerializer, UnitSerializer
+from ..utils.sql import delete_rows
+
+# pg_advisory_xact_lock de ChangeService.publish
+PUBLISH_LOCK_ID = 4_181_032
+
+SERIALIZERS = {
+    'project': ProjectSerializer,
+    'unit': UnitSerializer,
+    'customer': CustomerSerializer,
+}
+
+
+class ChangeService:
+    # Las escrituras de los servicios registran aquí sus cambios dentro de la misma
+    # transacción, para que /api/changes entregue solo lo modificado desde un cursor.
+
+    @staticmethod
+    def record_upserts(entity, instances, batch_size=1000):
+        serializer_class = SERIALIZERS[entity]
+        Change.objects.bulk_create(
+            [
+                Change(entity=entity, entity_id=instance.pk, operation='upsert', payload=serializer_class(instance).data)
+                for instance in instances
+            ],
+            batch_size=batch_size
+        )
+
+    @staticmethod
+    def record_upsert(entity, instance, payload=None):
+        if payload is None:
+            ChangeService.record_upserts(entity, [instance])
+        else:
+            # El llamador ya serializó la instancia (p. ej. el serializer que la validó)
+            Change.objects.create(entity=entity, entity_id=instance.pk, operation='upsert', payload=payload)
+
+    @staticmethod
+    def record_deletes(entity, ids, batch_size=1000):
+        Change.objects.bulk_create(
+            (Change(entity=entity, entity_id=entity_id, operation='delete') for entity_id in ids),
+            batch_size=batch_size
+        )
+
+    @staticmethod
+    def record_upserts_for(entity, queryset):
+        # Para cambios masivos: se registran sin payload y se serializan al leerlos
+        return ChangeService._record_for(entity, queryset, 'upsert')
+
+    @staticmethod
+    def record_deletes_for(entity, queryset):
+        return ChangeService._record_for(entity, queryset, 'delete')
+
+    @staticmethod
+    def _record_for(entity, queryset, operation):
+        # INSERT ... SELECT: los cambios se escriben sin cargar las filas en Python
+        qn = connection.ops.quote_name
+        select_sql, select_params = queryset.order_by().values_list('pk').query.sql_with_params()
+        meta = Change._meta
+        sql = 'INSERT INTO {table} ({entity}, {entity_id}, {operation}, {created_at}) SELECT %s, sub.{pk}, %s, %s FROM ({select}) sub'.format(
+            table=qn(meta.db_table),
+            entity=qn(meta.get_field('entity').column),
+            entity_id=qn(meta.get_field('entity_id').column),
+            operation=qn(meta.get_field('operation').column),
+            created_at=qn(meta.get_field('created_at').column),
+            pk=qn(queryset.model._meta.pk.column),
+            select=select_sql,
+        )
+        created_at = meta.get_field('created_at').get_db_prep_value(timezone.now(), connection)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (entity, operation, created_at, *select_params))
+            return cursor.rowcount
+
+    @staticmethod
+    def record_delete(entity, entity_id):
+        ChangeService.record_deletes(entity, [entity_id])
+
+    @staticmethod
+    def get_latest_position():
+        ChangeService.publish()
+        return Change.objects.aggregate(latest=Max('position'))['latest'] or 0
+
+    @staticmethod
+    def publish():
+        # Numera en orden de commit los cambios cuyas transacciones ya terminaron. En
+        # Postgres, toda transacción con id menor a xmin del snapshot actual terminó y
+        # ninguna nueva puede tener un id menor, así que ese conjunto ya no cambia y se
+        # numera por (txid, seq). Un cursor nunca salta un cambio confirmado tarde.
+        qn = connection.ops.quote_name
+        meta = Change._meta
+        table = qn(meta.db_table)
+        seq, txid, position = (qn(meta.get_field(name).column) for name in ('seq', 'txid', 'position'))
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not ChangeService._acquire_publish_lock(cursor):
+                return 0
+            horizon = ChangeService._visible_horizon(cursor)
+            visible, params = ('', []) if horizon is None else (f'AND {txid} < %s', [horizon])
+            cursor.execute(
+                f'UPDATE {table} SET {position} = ranked.{position} FROM ('
+                f'SELECT {seq}, (SELECT COALESCE(MAX({position}), 0) FROM {table}) '
+                f'+ ROW_NUMBER() OVER (ORDER BY {txid}, {seq}) AS {position} '
+                f'FROM {table} WHERE {position} IS NULL {visible}'
+                f') ranked WHERE {table}.{seq} = ranked.{seq}',
+                params
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def _acquire_publish_lock(cursor):
+        # Un solo publicador a la vez; los demás leen lo ya publicado
+        if connection.vendor != 'postgresql':
+            return True
+        cursor.execute('SELECT pg_try_advisory_xact_lock(%s)', [PUBLISH_LOCK_ID])
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def _visible_horizon(cursor):
+        # Transacciones con id menor a este ya terminaron. SQLite serializa las
+        # escrituras, así que todo lo que se puede leer ya está confirmado.
+        if connection.vendor != 'postgresql':
+            return None
+        cursor.execute('SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint')
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def get_changes(since, limit):
+        ChangeService.publish()
+        changes = list(Change.objects.filter(position__gt=since).order_by('position')[:limit + 1])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        next_since = changes[-1].position if changes else since
+
+        # Compactación: dentro del lote solo importa el último cambio de cada entidad
+        latest = {}
+        for change in changes:
+            latest.pop((change.entity, change.entity_id), None)
+            latest[(change.entity, change.entity_id)] = change
+        changes = list(latest.values())
+        ChangeService._fill_payloads(changes)
+        return changes, next_since, has_more
+
+    @staticmethod
+    def _fill_payloads(changes):
+        # Los upserts registrados sin payload se serializan con el estado actual de la fila
+        pending = defaultdict(list)
+        for change in changes:
+            if change.operation == 'upsert' and change.payload is None:
+                pending[change.entity].append(change)
+        for entity, entity_changes in pending.items():
+            serializer_class = SERIALIZERS[entity]
+            instances = serializer_class.Meta.model.objects.in_bulk([change.entity_id for change in entity_changes])
+            for change in entity_changes:
+                instance = instances.get(change.entity_id)
+                if instance is None:
+                    # La fila se borró después; su lápida puede haber quedado en un lote posterior
+                    change.operation = 'delete'
+                else:
+                    change.payload = serializer_class(instance).data
+
+    @staticmethod
+    def requires_full_resync(since):
+        # Hay cambios posteriores al cursor que ya fueron purgados (ver prune_changes)
+        oldest = Change.objects.aggregate(oldest=Min('position'))['oldest']
+        return oldest is not None and since < oldest - 1
+
+    @staticmethod
+    def prune(older_than):
+        # Se conserva siempre el último cambio para poder detectar cursores purgados
+        latest = ChangeService.get_latest_position()
+        return delete_rows(Change.objects.filter(created_at__lt=older_than, position__lt=latest))
@@ -1,27 +1,106 @@
-from core.models.models import Customer
+from django.db import transaction
+from django.db.models import Count, F, Prefetch, Q, Sum
+from django.db.models.functions import Coalesce
+from django.core.exceptions import ValidationError
+from core.models.models import Customer, Unit
 from core.serializers.serializers import CustomerSerializer
+from core.utils.rut import is_valid_rut, normalize_rut
+from core.utils.sql import delete_rows
+from .change_service import ChangeService
+from .unit_history_service import UnitHistoryService
+from .version_service import VersionService
 
 class CustomerService:
+    COMMITTED_STATUSES = ('Reserved', 'Sold')
+
     @staticmethod
     def get_all_customers():
         return Customer.objects.all().order_by('-created_at')
 
+    @staticmethod
+    def get_portfolios():
+        # Totales anotados en el mismo SELECT de clientes y unidades comprometidas
+        # con su proyecto en una sola consulta adicional, sin importar el tamaño de página.
+        committed = Q(units__unit_status__in=CustomerService.COMMITTED_STATUSES)
+        units = (
+            Unit.objects.filter(unit_status__in=CustomerService.COMMITTED_STATUSES)
+            .select_related('project')
+            .order_by('-created_at')
+        )
+        return (
+            Customer.objects.annotate(
+                reserved_units=Count('units', filter=Q(units__unit_status='Reserved')),
+                sold_units=Count('units', filter=Q(units__unit_status='Sold')),
+                committed_price=Coalesce(Sum('units__price', filter=committed), 0),
+                total_deposits=Coalesce(Sum('units__reservation_deposit', filter=committed), 0),
+            )
+            .prefetch_related(Prefetch('units', queryset=units, to_attr='portfolio_units'))
+            .order_by('-created_at')
+        )
+
+    @staticmethod
+    def get_portfolio(customer_id):
+        try:
+            return CustomerService.get_portfolios().filter(id=customer_id).first()
+        except ValidationError:
+            return None
+
     @staticmethod
     def get_customer_by_id(customer_id):
         return Customer.objects.get(id=customer_id)
 
+    @staticmethod
+    def resolve_ruts(ruts):
+        # Un solo SELECT ... WHERE rut IN (...) sobre el índice único. Retorna, en el
+        # orden recibido, (rut recibido, rut canónico o None si es inválido, cliente o None).
+        canonical = {rut: normalize_rut(rut) for rut in ruts}
+        valid = {value for value in canonical.values() if is_valid_rut(value)}
+        customers = {customer.rut: customer for customer in Customer.objects.filter(rut__in=valid)}
+        return [
+            (rut, canonical[rut], customers.get(canonical[rut])) if canonical[rut] in valid else (rut, None, None)
+            for rut in ruts
+        ]
+
     @staticmethod
     def create_customer(data):
         serializer = CustomerSerializer(data=data)
         serializer.is_valid(raise_exception=True)
-        return serializer.save()
+        with transaction.atomic():
+            customer = serializer.save()
+            ChangeService.record_upsert('customer', customer)
+        return customer
 
     @staticmethod
-    def update_customer(customer, data, partial=False):
+    def update_customer(customer, data, partial=False, if_match=None):
+        VersionService.check(customer, if_match)
         serializer = CustomerSerializer(customer, data=data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        return serializer.save()
+        for field, value in serializer.validated_data.items():
+            setattr(customer, field, value)
+        with transaction.atomic():
+            VersionService.save(customer, serializer.validated_data.keys())
+            ChangeService.record_upsert('customer', customer, serializer.data)
+        return customer
 
     @staticmethod
     def delete_customer(customer):
-        customer.delete()
+        with transaction.atomic():
+            # El borrado deja customer en NULL en sus unidades, que también cambian
+            unit_ids = list(customer.units.values_list('id', flat=True))
+            Unit.objects.filter(id__in=unit_ids).update(customer=None, version=F('version') + 1)
+            UnitHistoryService.record_for(Unit.objects.filter(id__in=unit_ids), 'changed')
+            ChangeService.record_delete('customer', customer.id)
+            customer.delete()
+            ChangeService.record_upserts('unit', Unit.objects.filter(id__in=unit_ids))
+
+    @staticmethod
+    def delete_customers(queryset):
+        # Borrado masivo set-based: las unidades se registran con customer en NULL antes
+        # del UPDATE, que de lo contrario dejaría de calzar con el filtro
+        with transaction.atomic():
+            units = Unit.objects.filter(customer__in=queryset.values('id'))
+            UnitHistoryService.record_for(units, 'changed', customer=None)
+            ChangeService.record_upserts_for('unit', units)
+            units.update(customer=None, version=F('version') + 1)
+            ChangeService.record_deletes_for('customer', queryset)
+            return delete_rows(queryset)
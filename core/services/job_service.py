@@ -0,0 +1,111 @@
+import logging
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection, connections, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from ..models.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class _Heartbeat(threading.Thread):
+    # Mantiene vivo heartbeat_at mientras el handler corre, para que otro worker
+    # no reclame el job como abandonado.
+    def __init__(self, job_id, interval):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                Job.objects.filter(id=self.job_id, status='Running').update(heartbeat_at=timezone.now())
+        finally:
+            connections.close_all()
+
+
+class JobService:
+    handlers = {}
+
+    @classmethod
+    def register(cls, kind):
+        def decorator(handler):
+            cls.handlers[kind] = handler
+            return handler
+        return decorator
+
+    @classmethod
+    def submit(cls, kind, payload, user=None):
+        if kind not in cls.handlers:
+            raise ValueError(f"No hay un handler registrado para '{kind}'.")
+        created_by = user if user is not None and user.is_authenticated else None
+        return Job.objects.create(kind=kind, payload=payload, created_by=created_by)
+
+    @staticmethod
+    def get_job_by_id(job_id, user=None):
+        queryset = Job.objects.all()
+        if user is not None and not user.is_staff:
+            queryset = queryset.filter(created_by=user)
+        try:
+            return queryset.filter(id=job_id).first()
+        except DjangoValidationError:
+            return None
+
+    @staticmethod
+    def claim_next(worker):
+        now = timezone.now()
+        stale_before = now - timedelta(seconds=settings.JOBS_STALE_AFTER_SECONDS)
+        claimable = (
+            Job.objects.filter(status='Queued')
+            | Job.objects.filter(status='Running', heartbeat_at__lt=stale_before)
+        ).order_by('created_at')
+        claim = {'status': 'Running', 'worker': worker, 'started_at': now, 'heartbeat_at': now}
+
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                job = claimable.select_for_update(skip_locked=True).first()
+                if job is None:
+                    return None
+                Job.objects.filter(id=job.id).update(**claim)
+            job.__dict__.update(claim)
+            return job
+
+        # SQLite no tiene bloqueos por fila: se reclama con un UPDATE condicional
+        # y solo gana el worker que logra cambiar la fila.
+        for job in claimable[:10]:
+            if Job.objects.filter(id=job.id, status=job.status, heartbeat_at=job.heartbeat_at).update(**claim):
+                job.__dict__.update(claim)
+                return job
+        return None
+
+    @staticmethod
+    def set_progress(job, progress):
+        job.progress = max(0, min(int(progress), 100))
+        Job.objects.filter(id=job.id).update(progress=job.progress, heartbeat_at=timezone.now())
+
+    @classmethod
+    def run(cls, job):
+        heartbeat = _Heartbeat(job.id, settings.JOBS_STALE_AFTER_SECONDS / 3)
+        heartbeat.start()
+        try:
+            result = cls.handlers[job.kind](job, job.payload)
+            changes = {'status': 'Succeeded', 'progress': 100, 'result': result, 'error': None}
+        except ValidationError as exc:
+            changes = {'status': 'Failed', 'result': {'errors': exc.detail}, 'error': 'Error de validación.'}
+        except Exception as exc:
+            logger.exception('Falló el job %s (%s)', job.id, job.kind)
+            changes = {'status': 'Failed', 'result': None, 'error': ''.join(traceback.format_exception_only(exc)).strip()}
+        finally:
+            heartbeat.stopped.set()
+            heartbeat.join()
+        changes['finished_at'] = timezone.now()
+        Job.objects.filter(id=job.id).update(**changes)
+        job.__dict__.update(changes)
+        return job
@@ -1,6 +1,16 @@
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from ..models.models import Project
+from django.db import transaction
+from django.db.models import Avg, Count, F, Prefetch, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from ..models.models import Project, Unit
 from ..serializers.serializers import ProjectSerializer
+from ..utils.sql import delete_rows
+from .availability_service import AvailabilityService
+from .change_service import ChangeService
+from .job_service import JobService
+from .unit_history_service import UnitHistoryService
+from .version_service import VersionService
 
 class ProjectService:
     @staticmethod
@@ -14,46 +24,129 @@ class ProjectService:
         except ObjectDoesNotExist:
             return None
 
+    @staticmethod
+    def get_dashboard(project_id, page_size):
+        # Tres consultas fijas: proyecto, primera página de unidades con su cliente
+        # (Prefetch con slice) y todos los agregados del inventario en un solo SELECT.
+        units = Unit.objects.select_related('customer').order_by('-created_at')
+        try:
+            project = (
+                Project.objects.filter(id=project_id)
+                .prefetch_related(Prefetch('units', queryset=units[:page_size], to_attr='first_units'))
+                .first()
+            )
+        except ValidationError:
+            return None
+        if project is None:
+            return None
+
+        aggregates = {
+            'units': Count('id'),
+            'total_price': Coalesce(Sum('price'), 0),
+            'total_deposits': Coalesce(Sum('reservation_deposit'), 0),
+            'avg_price_per_m2': Avg('price_per_m2'),
+        }
+        for unit_status, _ in Unit.UNIT_STATUS:
+            aggregates[f'{unit_status}_count'] = Count('id', filter=Q(unit_status=unit_status))
+            aggregates[f'{unit_status}_price'] = Coalesce(Sum('price', filter=Q(unit_status=unit_status)), 0)
+        totals = Unit.objects.filter(project_id=project.id).aggregate(**aggregates)
+
+        inventory = {
+            'units': totals['units'],
+            'total_price': totals['total_price'],
+            'total_deposits': totals['total_deposits'],
+            'avg_price_per_m2': totals['avg_price_per_m2'],
+            'by_status': {
+                unit_status: {'units': totals[f'{unit_status}_count'], 'total_price': totals[f'{unit_status}_price']}
+                for unit_status, _ in Unit.UNIT_STATUS
+            },
+        }
+        return project, inventory, project.first_units
+
     @staticmethod
     def create_project(data):
         serializer = ProjectSerializer(data=data)
         serializer.is_valid(raise_exception=True)
-        project = serializer.save()
+        with transaction.atomic():
+            project = serializer.save()
+            ChangeService.record_upsert('project', project)
         return project
 
     @staticmethod
-    def update_project(project_id, data):
+    def update_project(project_id, data, partial=False, if_match=None):
         try:
-            project = Project.objects.get(id=project_id)
-            for field, value in data.items():
-                setattr(project, field, value)
-            project.full_clean()
-            project.save()
-            return project
-        except ObjectDoesNotExist:
+            project = Project.objects.filter(id=project_id).first()
+        except ValidationError:
+            return None
+        if project is None:
             return None
-        except ValidationError as e:
-            raise ValidationError(f"Error de validación: {e}")
+        VersionService.check(project, if_match)
+        # El serializer es la única validación; solo se escriben las columnas que cambiaron
+        serializer = ProjectSerializer(project, data=data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        changed = [
+            field for field, value in serializer.validated_data.items()
+            if getattr(project, field) != value
+        ]
+        if not changed:
+            return project
+        for field in changed:
+            setattr(project, field, serializer.validated_data[field])
+        with transaction.atomic():
+            VersionService.save(project, changed)
+            ChangeService.record_upsert('project', project, serializer.data)
+        return project
 
     @staticmethod
-    def partial_update_project(project_id, data):
-        try:
-            project = Project.objects.get(id=project_id)
-            for field, value in data.items():
-                setattr(project, field, value)
-            project.full_clean()
-            project.save()
-            return project
-        except ObjectDoesNotExist:
-            return None
-        except ValidationError as e:
-            raise ValidationError(f"Error de validación: {e}")
+    def partial_update_project(project_id, data, if_match=None):
+        return ProjectService.update_project(project_id, data, partial=True, if_match=if_match)
 
     @staticmethod
-    def delete_project(project_id):
-        try:
-            project = Project.objects.get(id=project_id)
-            project.delete()
-            return True
-        except ObjectDoesNotExist:
-            return False
+    def set_status(queryset, project_status):
+        # Cambio de estado masivo (acciones del admin). Finished exige finished_at:
+        # se completa con la fecha de hoy donde falte, igual que en la API.
+        queryset = queryset.exclude(status=project_status)
+        changes = {'status': project_status, 'version': F('version') + 1}
+        if project_status == 'Finished':
+            changes['finished_at'] = Coalesce('finished_at', Value(timezone.localdate()))
+        with transaction.atomic():
+            ChangeService.record_upserts_for('project', queryset)
+            return queryset.update(**changes)
+
+    @staticmethod
+    def delete_project(project_id, chunk_size=None, on_progress=None):
+        # DELETE set-based: no se cargan las unidades en memoria como hace el Collector
+        # de Django. Cualquier relación nueva hacia Project o Unit debe limpiarse aquí.
+        # Con chunk_size (jobs) las unidades se borran por tramos, cada uno en su propia
+        # transacción, y on_progress(borradas, total) informa el avance.
+        if chunk_size:
+            total = Unit.objects.filter(project_id=project_id).count()
+            done = 0
+            while True:
+                with transaction.atomic():
+                    ids = list(Unit.objects.filter(project_id=project_id).values_list('id', flat=True)[:chunk_size])
+                    if not ids:
+                        break
+                    done += ProjectService._delete_units(Unit.objects.filter(id__in=ids))
+                    AvailabilityService.invalidate(project_id)
+                if on_progress:
+                    on_progress(done, total)
+        with transaction.atomic():
+            ProjectService._delete_units(Unit.objects.filter(project_id=project_id))
+            deleted = delete_rows(Project.objects.filter(id=project_id))
+            if deleted:
+                ChangeService.record_delete('project', project_id)
+                AvailabilityService.invalidate(project_id)
+        return deleted > 0
+
+    @staticmethod
+    def _delete_units(units):
+        ChangeService.record_deletes_for('unit', units)
+        UnitHistoryService.record_for(units, 'deleted')
+        return delete_rows(units)
+
+    @staticmethod
+    def submit_delete_project(project_id, user=None):
+        if not Project.objects.filter(id=project_id).exists():
+            return None
+        return JobService.submit('projects.delete', {'project_id': str(project_id)}, user)
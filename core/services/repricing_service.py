@@ -0,0 +1,101 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, ExpressionWrapper, F, IntegerField, Max, Min, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Round
+from rest_framework.exceptions import ValidationError
+
+from ..models.models import Repricing, Unit
+from .change_service import ChangeService
+from .unit_history_service import UnitHistoryService
+
+MAX_PRICE = 2_147_483_647
+
+
+def _rounded(expression):
+    return Cast(Round(expression), IntegerField())
+
+
+class RepricingService:
+    # Aplica una regla de precios a un conjunto filtrado de unidades con un único
+    # UPDATE; los totales antes/después se calculan con agregados en la base de datos.
+
+    FILTERS = {'project': 'project_id', 'status': 'unit_status', 'type': 'unit_type'}
+
+    @staticmethod
+    def get_queryset(filters, rule):
+        queryset = Unit.objects.filter(**{
+            RepricingService.FILTERS[name]: value for name, value in filters.items()
+        })
+        if rule['mode'] == 'per_m2':
+            queryset = queryset.filter(unit_type__in=list(rule['rates']))
+        return queryset
+
+    @staticmethod
+    def price_expression(rule):
+        if rule['mode'] == 'percent':
+            factor = Decimal(1) + Decimal(rule['percent']) / 100
+            return _rounded(F('price') * Value(factor, output_field=DecimalField()))
+        # Precio = m² × tarifa según el tipo de unidad
+        return Case(
+            *[
+                When(unit_type=unit_type, then=_rounded(F('square_meters') * Value(Decimal(rate), output_field=DecimalField())))
+                for unit_type, rate in rule['rates'].items()
+            ],
+            default=F('price'),
+            output_field=IntegerField()
+        )
+
+    @staticmethod
+    def price_per_m2_expression(expression):
+        # En un UPDATE las columnas del lado derecho tienen el valor anterior: el
+        # precio por m² se calcula con la expresión del precio nuevo, no con F('price').
+        return Case(
+            When(square_meters=0, then=None),
+            default=Round(ExpressionWrapper(expression * 1.0 / F('square_meters'), output_field=DecimalField()), 2),
+            output_field=DecimalField()
+        )
+
+    @staticmethod
+    def preview(queryset, expression):
+        totals = queryset.aggregate(
+            units=Count('id'),
+            total_before=Coalesce(Sum('price'), 0),
+            total_after=Coalesce(Sum(expression), 0),
+            min_after=Min(expression),
+            max_after=Max(expression),
+        )
+        if totals['units'] and (totals['min_after'] < 0 or totals['max_after'] > MAX_PRICE):
+            raise ValidationError({'detail': 'La regla deja precios fuera del rango permitido.'})
+        return {
+            'units': totals['units'],
+            'total_before': totals['total_before'],
+            'total_after': totals['total_after'],
+            'difference': totals['total_after'] - totals['total_before'],
+        }
+
+    @staticmethod
+    def reprice(filters, rule, dry_run=False, user=None):
+        queryset = RepricingService.get_queryset(filters, rule)
+        expression = RepricingService.price_expression(rule)
+        if dry_run:
+            return {**RepricingService.preview(queryset, expression), 'dry_run': True, 'repricing': None}
+
+        with transaction.atomic():
+            result = RepricingService.preview(queryset, expression)
+            queryset.update(
+                price=expression,
+                price_per_m2=RepricingService.price_per_m2_expression(expression),
+                version=F('version') + 1,
+            )
+            ChangeService.record_upserts_for('unit', queryset)
+            UnitHistoryService.record_for(queryset, 'changed')
+            repricing = Repricing.objects.create(
+                rule=rule,
+                filters=filters,
+                units_affected=result['units'],
+                total_before=result['total_before'],
+                total_after=result['total_after'],
+                created_by=user if user is not None and user.is_authenticated else None,
+            )
+        return {**result, 'dry_run': False, 'repricing': repricing.id}
@@ -0,0 +1,151 @@
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from ..models.models import SalesRollup
+from ..utils.sql import delete_rows
+from .unit_history_service import UnitHistoryService
+
+COUNTERS = ('reservations', 'sales', 'releases', 'revenue', 'deposits')
+GRANULARITIES = {'day': None, 'week': TruncWeek, 'month': TruncMonth}
+COMMITTED_STATUSES = ('Reserved', 'Sold')
+
+
+def _transition(previous, current, units, price, deposits):
+    # Reservar suma el pie, vender suma el precio y volver a Available desde
+    # Reserved/Sold es una liberación. Los montos ya vienen sumados para `units` unidades.
+    if previous == current:
+        return None
+    if current == 'Reserved':
+        return {'reservations': units, 'deposits': deposits}
+    if current == 'Sold':
+        return {'sales': units, 'revenue': price}
+    if previous in COMMITTED_STATUSES:
+        return {'releases': units}
+    return None
+
+
+class SalesRollupService:
+    # Las escrituras de UnitService llaman aquí dentro de su transacción; el endpoint
+    # de analítica solo lee core_salesrollup.
+
+    @staticmethod
+    def record_unit(unit, previous_status=None):
+        SalesRollupService.record_units([unit], previous_status)
+
+    @staticmethod
+    def record_units(units, previous_status=None):
+        SalesRollupService.record([
+            (unit.project_id, previous_status, unit.unit_status, 1, unit.price, unit.reservation_deposit)
+            for unit in units
+        ])
+
+    @staticmethod
+    def record_status_change(queryset, unit_status):
+        # Para UPDATE masivos: se agrupa por proyecto y estado anterior antes de escribir
+        rows = (
+            queryset.order_by()
+            .values_list('project_id', 'unit_status')
+            .annotate(units=Count('id'), price=Coalesce(Sum('price'), 0), deposits=Coalesce(Sum('reservation_deposit'), 0))
+        )
+        SalesRollupService.record([
+            (project_id, previous, unit_status, units, price, deposits)
+            for project_id, previous, units, price, deposits in rows
+        ])
+
+    @staticmethod
+    def record(transitions, day=None):
+        # transitions: (project_id, estado anterior, estado nuevo, unidades, suma de precios, suma de pies)
+        day = day or timezone.localdate()
+        deltas = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        for project_id, previous, current, units, price, deposits in transitions:
+            delta = _transition(previous, current, units, price, deposits)
+            if delta:
+                for counter, value in delta.items():
+                    deltas[project_id][counter] += value
+        if deltas:
+            SalesRollupService._increment({(project_id, day): delta for project_id, delta in deltas.items()})
+
+    @staticmethod
+    def _increment(rows):
+        # INSERT ... ON CONFLICT DO UPDATE suma sobre la fila existente sin leerla
+        # antes; dos transacciones que tocan el mismo día no se pisan.
+        qn = connection.ops.quote_name
+        meta = SalesRollup._meta
+        table = qn(meta.db_table)
+        columns = [meta.get_field(name).column for name in ('project', 'day', *COUNTERS)]
+        params = []
+        for (project_id, day), delta in rows.items():
+            params += [
+                meta.get_field('project').get_db_prep_value(project_id, connection),
+                meta.get_field('day').get_db_prep_value(day, connection),
+                *(delta[counter] for counter in COUNTERS),
+            ]
+        sql = 'INSERT INTO {table} ({columns}) VALUES {values} ON CONFLICT ({project}, {day}) DO UPDATE SET {updates}'.format(
+            table=table,
+            columns=', '.join(qn(column) for column in columns),
+            values=', '.join(['({})'.format(', '.join(['%s'] * len(columns)))] * len(rows)),
+            project=qn(columns[0]),
+            day=qn(columns[1]),
+            updates=', '.join(
+                f'{qn(column)} = {table}.{qn(column)} + excluded.{qn(column)}' for column in columns[2:]
+            ),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    @staticmethod
+    def rebuild(project_ids=None, batch_size=1000):
+        # Reconstruye los totales recorriendo la historia de las unidades (ver
+        # UnitHistoryService): cada transición cuenta el día en que ocurrió. La tabla se
+        # bloquea antes de leer la historia: un cambio que llegue durante la reconstrucción
+        # espera en su INSERT ... ON CONFLICT, también si crea una fila (proyecto, día)
+        # nueva, y se suma sobre los totales nuevos al confirmar.
+        with transaction.atomic():
+            SalesRollupService._lock_rollups()
+            existing = SalesRollup.objects.all()
+            if project_ids is not None:
+                existing = existing.filter(project__in=project_ids)
+
+            totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+            for project_id, changed_at, previous, current, price, deposit in UnitHistoryService.iter_transitions(project_ids):
+                delta = _transition(previous, current, 1, price, deposit)
+                if delta:
+                    total = totals[(project_id, timezone.localdate(changed_at))]
+                    for counter, value in delta.items():
+                        total[counter] += value
+
+            delete_rows(existing)
+            SalesRollup.objects.bulk_create(
+                (SalesRollup(project=project_id, day=day, **total) for (project_id, day), total in totals.items()),
+                batch_size=batch_size
+            )
+        return len(totals)
+
+    @staticmethod
+    def _lock_rollups():
+        # SHARE ROW EXCLUSIVE deja leer pero bloquea INSERT/UPDATE hasta el fin de la
+        # transacción. SQLite (solo desarrollo) no tiene bloqueos de tabla.
+        if connection.vendor != 'postgresql':
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'LOCK TABLE {} IN SHARE ROW EXCLUSIVE MODE'.format(connection.ops.quote_name(SalesRollup._meta.db_table))
+            )
+
+    @staticmethod
+    def get_sales(date_from, date_to, granularity='day', project_id=None):
+        queryset = SalesRollup.objects.filter(day__range=(date_from, date_to))
+        if project_id is not None:
+            queryset = queryset.filter(project=project_id)
+        trunc = GRANULARITIES[granularity]
+        period = trunc('day') if trunc else F('day')
+        return list(
+            queryset.annotate(period=period)
+            .values('period')
+            .annotate(**{counter: Sum(counter) for counter in COUNTERS})
+            .order_by('period')
+        )
@@ -0,0 +1,123 @@
+import uuid
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import F, Value, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from ..models.models import UnitHistory
+
+# Columnas de la foto: campo de UnitHistory -> campo de Unit
+SNAPSHOT_FIELDS = {
+    'unit': 'id',
+    'project': 'project_id',
+    'unit_number': 'unit_number',
+    'unit_status': 'unit_status',
+    'price': 'price',
+    'reservation_deposit': 'reservation_deposit',
+    'customer': 'customer_id',
+}
+TRACKED_FIELDS = ('project_id', 'unit_status', 'price', 'reservation_deposit', 'customer_id')
+
+
+class UnitHistoryService:
+    # Los servicios que escriben unidades agregan aquí la foto posterior al cambio,
+    # dentro de su misma transacción y en un solo INSERT por operación.
+
+    @staticmethod
+    def snapshot(unit):
+        return tuple(getattr(unit, field) for field in TRACKED_FIELDS)
+
+    @staticmethod
+    def record(units, event, changed_at=None, batch_size=1000):
+        changed_at = changed_at or timezone.now()
+        UnitHistory.objects.bulk_create(
+            [
+                UnitHistory(
+                    event=event,
+                    changed_at=changed_at,
+                    **{field: getattr(unit, source) for field, source in SNAPSHOT_FIELDS.items()}
+                )
+                for unit in units
+            ],
+            batch_size=batch_size
+        )
+
+    @staticmethod
+    def record_for(queryset, event, **values):
+        # INSERT ... SELECT para cambios masivos. `values` son los valores nuevos de
+        # campos de Unit (constantes o expresiones, p. ej. el precio de un repricing),
+        # para poder registrar antes de que el UPDATE cambie qué filas calzan con el filtro.
+        qn = connection.ops.quote_name
+        meta = UnitHistory._meta
+        # Todas las columnas van como anotaciones: values_list pone los campos antes que
+        # las anotaciones en el SQL y el orden debe calzar con el del INSERT.
+        annotations = {}
+        for field, source in SNAPSHOT_FIELDS.items():
+            name = source.removesuffix('_id') if source != 'id' else source
+            value = values.get(name, F(source))
+            if not hasattr(value, 'resolve_expression'):
+                value = Value(value, output_field=meta.get_field(field))
+            annotations[f'history_{field}'] = value
+        rows = queryset.order_by().annotate(**annotations).values_list(*annotations)
+        try:
+            select_sql, select_params = rows.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        columns = [meta.get_field(field).column for field in (*SNAPSHOT_FIELDS, 'event', 'changed_at')]
+        sql = 'INSERT INTO {table} ({columns}) SELECT sub.*, %s, %s FROM ({select}) sub'.format(
+            table=qn(meta.db_table),
+            columns=', '.join(qn(column) for column in columns),
+            select=select_sql,
+        )
+        changed_at = meta.get_field('changed_at').get_db_prep_value(timezone.now(), connection)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (event, changed_at, *select_params))
+            return cursor.rowcount
+
+    @staticmethod
+    def get_unit_history(unit_id):
+        # Usa el índice (unit, changed_at)
+        try:
+            unit_id = uuid.UUID(str(unit_id))
+        except ValueError:
+            return UnitHistory.objects.none()
+        return UnitHistory.objects.filter(unit=unit_id).order_by('changed_at', 'id')
+
+    @staticmethod
+    def get_inventory_as_of(project_id, moment):
+        # Última foto de cada unidad hasta `moment`. Con el índice (project, changed_at)
+        # se buscan las unidades que alguna vez estuvieron en el proyecto, y con el índice
+        # (unit, changed_at) se rankea toda su historia: una unidad que se cambió de
+        # proyecto debe quedar solo en el nuevo.
+        try:
+            project_id = uuid.UUID(str(project_id))
+        except ValueError:
+            return None
+        units = UnitHistory.objects.filter(project=project_id, changed_at__lte=moment).values('unit')
+        latest = (
+            UnitHistory.objects.filter(unit__in=units, changed_at__lte=moment)
+            .annotate(rank=Window(RowNumber(), partition_by=F('unit'), order_by=[F('changed_at').desc(), F('id').desc()]))
+            .filter(rank=1)
+        )
+        # El proyecto y los borrados se descartan después del ranking para no revivir una
+        # foto anterior
+        return [
+            row for row in latest.order_by('unit_number')
+            if row.project == project_id and row.event != 'deleted'
+        ]
+
+    @staticmethod
+    def iter_transitions(project_ids=None, chunk_size=5000):
+        # (project, changed_at, estado anterior, estado, precio, pie) en orden por unidad
+        queryset = UnitHistory.objects.order_by('unit', 'changed_at', 'id')
+        if project_ids is not None:
+            queryset = queryset.filter(project__in=project_ids)
+        rows = queryset.values_list('unit', 'project', 'changed_at', 'unit_status', 'price', 'reservation_deposit')
+        current_unit = previous = None
+        for unit, project, changed_at, unit_status, price, deposit in rows.iterator(chunk_size=chunk_size):
+            if unit != current_unit:
+                current_unit, previous = unit, None
+            yield project, changed_at, previous, unit_status, price, deposit
+            previous = unit_status
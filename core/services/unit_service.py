@@ -1,6 +1,16 @@
+from django.db import transaction
+from django.db.models import F
 from core.models.models import Unit, Project
 from rest_framework.exceptions import ValidationError
 from ..serializers.serializers import UnitSerializer
+from ..utils.sql import delete_rows
+from ..realtime.broadcaster import publish_unit_status
+from .availability_service import AvailabilityService
+from .change_service import ChangeService
+from .job_service import JobService
+from .sales_rollup_service import SalesRollupService
+from .unit_history_service import UnitHistoryService
+from .version_service import VersionService
 
 class UnitService:
     @staticmethod
@@ -15,22 +25,107 @@ class UnitService:
     def create_unit(data):
         serializer = UnitSerializer(data=data)
         serializer.is_valid(raise_exception=True)
-        return serializer.save()
+        with transaction.atomic():
+            unit = serializer.save()
+            ChangeService.record_upsert('unit', unit)
+            UnitHistoryService.record([unit], 'created')
+            SalesRollupService.record_unit(unit)
+            AvailabilityService.invalidate(unit.project_id)
+            publish_unit_status(unit)
+        return unit
 
     @staticmethod
-    def create_multiple_units(data_list):
+    def create_multiple_units(data_list, chunk_size=None, on_progress=None):
+        # Todo se valida antes de escribir. Con chunk_size (jobs) cada tramo se confirma
+        # por separado y on_progress(creadas, total) informa el avance.
         serializer = UnitSerializer(data=data_list, many=True)
         if not serializer.is_valid():
             raise ValidationError(serializer.errors)
-        return serializer.save()
+        validated = serializer.validated_data
+        chunk_size = chunk_size or max(len(validated), 1)
+        units = []
+        for start in range(0, len(validated), chunk_size):
+            with transaction.atomic():
+                chunk = serializer.create(validated[start:start + chunk_size])
+                ChangeService.record_upserts('unit', chunk)
+                UnitHistoryService.record(chunk, 'created')
+                SalesRollupService.record_units(chunk)
+                AvailabilityService.invalidate(*{unit.project_id for unit in chunk})
+                for unit in chunk:
+                    publish_unit_status(unit)
+            units += chunk
+            if on_progress:
+                on_progress(len(units), len(validated))
+        return units
+
+    @staticmethod
+    def submit_create_multiple_units(data_list, user=None):
+        return JobService.submit('units.create_multiple', {'units': data_list}, user)
 
     @staticmethod
-    def update_unit(unit, data):
+    def update_unit(unit, data, if_match=None):
+        VersionService.check(unit, if_match)
+        previous = (unit.unit_status, unit.unit_number, unit.project_id)
+        snapshot = UnitHistoryService.snapshot(unit)
         for key, value in data.items():
             setattr(unit, key, value)
-        unit.save()
+        with transaction.atomic():
+            VersionService.save(unit, unit.sync_price_per_m2(data.keys()))
+            ChangeService.record_upsert('unit', unit)
+            if UnitHistoryService.snapshot(unit) != snapshot:
+                UnitHistoryService.record([unit], 'changed')
+            if (unit.unit_status, unit.unit_number, unit.project_id) != previous:
+                AvailabilityService.invalidate(previous[2], unit.project_id)
+            if unit.unit_status != previous[0]:
+                SalesRollupService.record_unit(unit, previous[0])
+                publish_unit_status(unit)
         return unit
 
+    @staticmethod
+    def set_status(queryset, unit_status):
+        # Cambio de estado masivo (acciones del admin) con un solo UPDATE. Al liberar
+        # una unidad se quita el cliente; para Reserved/Sold solo cuentan las que tienen cliente.
+        queryset = queryset.exclude(unit_status=unit_status)
+        changes = {'unit_status': unit_status, 'version': F('version') + 1}
+        if unit_status == 'Available':
+            changes['customer'] = None
+        else:
+            queryset = queryset.filter(customer__isnull=False)
+        with transaction.atomic():
+            # Solo se leen las columnas que necesitan los eventos en tiempo real
+            units = [
+                Unit(id=unit_id, project_id=project_id, unit_number=unit_number, unit_status=unit_status)
+                for unit_id, project_id, unit_number in queryset.values_list('id', 'project_id', 'unit_number')
+            ]
+            ChangeService.record_upserts_for('unit', queryset)
+            UnitHistoryService.record_for(queryset, 'changed', **{k: v for k, v in changes.items() if k != 'version'})
+            SalesRollupService.record_status_change(queryset, unit_status)
+            updated = queryset.update(**changes)
+            AvailabilityService.invalidate(*{unit.project_id for unit in units})
+            for unit in units:
+                publish_unit_status(unit)
+        return updated
+
+    @staticmethod
+    def delete_units(queryset):
+        with transaction.atomic():
+            units = [
+                Unit(id=unit_id, project_id=project_id, unit_number=unit_number)
+                for unit_id, project_id, unit_number in queryset.values_list('id', 'project_id', 'unit_number')
+            ]
+            ChangeService.record_deletes_for('unit', queryset)
+            UnitHistoryService.record_for(queryset, 'deleted')
+            deleted = delete_rows(Unit.objects.filter(id__in=queryset.values('id')))
+            AvailabilityService.invalidate(*{unit.project_id for unit in units})
+            for unit in units:
+                publish_unit_status(unit, deleted=True)
+        return deleted
+
     @staticmethod
     def delete_unit(unit):
-        unit.delete()
+        with transaction.atomic():
+            ChangeService.record_delete('unit', unit.id)
+            UnitHistoryService.record([unit], 'deleted')
+            AvailabilityService.invalidate(unit.project_id)
+            publish_unit_status(unit, deleted=True)
+            unit.delete()
@@ -0,0 +1,32 @@
+from django.db.models import F
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'El recurso fue modificado por otro usuario. Vuelve a consultarlo e intenta nuevamente.'
+    default_code = 'precondition_failed'
+
+
+class VersionService:
+    # Concurrencia optimista: no se bloquean filas durante la solicitud. La
+    # escritura es un UPDATE ... WHERE version = <versión leída> y, si no afecta
+    # filas, otro usuario escribió antes y se responde 412.
+
+    @staticmethod
+    def check(instance, if_match):
+        # if_match: versiones aceptadas según el header If-Match (None si no viene o es *)
+        if if_match is not None and instance.version not in if_match:
+            raise PreconditionFailed()
+
+    @staticmethod
+    def save(instance, fields):
+        values = {field: getattr(instance, field) for field in fields}
+        updated = type(instance).objects.filter(pk=instance.pk, version=instance.version).update(
+            version=F('version') + 1, **values
+        )
+        if not updated:
+            raise PreconditionFailed()
+        instance.version += 1
+        return instance
@@ -0,0 +1,24 @@
+import os
+import time
+
+
+def _process_start_time():
+    # /proc/self/stat da el inicio real del proceso, antes de cargar el intérprete.
+    # Fuera de Linux se usa el momento en que se importa este módulo.
+    try:
+        with open('/proc/self/stat') as stat:
+            start_ticks = int(stat.read().rpartition(')')[2].split()[19])
+        with open('/proc/stat') as stat:
+            boot_time = next(int(line.split()[1]) for line in stat if line.startswith('btime'))
+        return boot_time + start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, StopIteration):
+        return time.time()
+
+
+# Con gunicorn y preload_app el maestro importa este módulo antes de crear los
+# workers, que heredan la hora de inicio del contenedor y no la del fork.
+PROCESS_STARTED_AT = _process_start_time()
+
+
+def seconds_since_start():
+    return time.time() - PROCESS_STARTED_AT
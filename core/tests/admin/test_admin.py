@@ -0,0 +1,142 @@
+from django.contrib.admin import site
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from core.models.models import Change, Customer, Project, Unit
+from core.services.version_service import PreconditionFailed
+
+
+class AdminTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='adminpassword', email='admin@example.com')
+        self.client.force_login(self.user)
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.customer = Customer.objects.create(
+            rut="123456785",
+            name="Juan",
+            lastname="Pérez",
+            email="juan.perez@example.com"
+        )
+
+    def _units(self, count, **kwargs):
+        start = Unit.objects.count()
+        Unit.objects.bulk_create([
+            Unit(project=self.project, unit_number=str(start + i), unit_type="Apartment", square_meters=50, price=100, **kwargs)
+            for i in range(count)
+        ])
+
+    def _changelist_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('admin:core_unit_changelist'))
+        self.assertEqual(response.status_code, 200)
+        return len(captured)
+
+    def test_unit_changelist_queries_do_not_grow_with_rows(self):
+        """Prueba que el listado de unidades del admin no haga una consulta por fila"""
+        self._units(2)
+        few = self._changelist_queries()
+        self._units(40)
+        self.assertEqual(self._changelist_queries(), few)
+
+    def test_mark_available_action_is_set_based(self):
+        """Prueba que la acción masiva libere las unidades, renueve su versión y quede en el feed de cambios"""
+        self._units(30, unit_status="Reserved", customer=self.customer)
+        selected = [str(pk) for pk in Unit.objects.values_list('id', flat=True)]
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(
+                reverse('admin:core_unit_changelist'),
+                {'action': 'mark_available', '_selected_action': selected}
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertLess(len([q for q in captured if q['sql'].startswith('UPDATE')]), 2)
+        self.assertFalse(Unit.objects.exclude(unit_status="Available").exists())
+        self.assertFalse(Unit.objects.filter(customer__isnull=False).exists())
+        self.assertFalse(Unit.objects.exclude(version=2).exists())
+        self.assertEqual(Change.objects.filter(entity='unit', operation='upsert').count(), 30)
+
+    def test_project_delete_confirmation_does_not_load_units(self):
+        """Prueba que confirmar el borrado de un proyecto muestre el conteo sin cargar sus unidades"""
+        self._units(5)
+        url = reverse('admin:core_project_delete', args=[self.project.id])
+        self._units(40)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertContains(response, '45')
+        self.assertFalse([q for q in captured if 'FROM "core_unit"' in q['sql'] and 'COUNT' not in q['sql']])
+
+        response = self.client.post(url, {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Unit.objects.exists())
+        self.assertTrue(Change.objects.filter(entity='project', operation='delete').exists())
+
+    def test_unit_delete_preview_loads_projects_with_units(self):
+        """Prueba que la vista previa del borrado de unidades no consulte el proyecto de cada una"""
+        self._units(20)
+        request = RequestFactory().post(reverse('admin:core_unit_changelist'))
+        request.user = self.user
+        # COUNT(*) y el SELECT de las 20 unidades con su proyecto
+        with self.assertNumQueries(2):
+            shown, _, _, _ = site._registry[Unit].get_deleted_objects(Unit.objects.all(), request)
+        self.assertEqual(len(shown), 20)
+        self.assertIn('Proyecto Prueba', shown[0])
+
+    def test_customer_bulk_delete_is_set_based(self):
+        """Prueba que el borrado masivo de clientes libere sus unidades sin una consulta por cliente"""
+        customers = [self.customer] + [
+            Customer.objects.create(rut=rut, name="Cliente", lastname=str(rut), email=f"{rut}@example.com")
+            for rut in ("111111111", "222222222")
+        ]
+        for customer in customers:
+            self._units(2, unit_status="Reserved", customer=customer)
+        selected = [str(customer.id) for customer in customers]
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(
+                reverse('admin:core_customer_changelist'),
+                {'action': 'delete_selected', '_selected_action': selected, 'post': 'yes'}
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len([q for q in captured if q['sql'].startswith('DELETE')]), 1)
+        self.assertFalse(Customer.objects.exists())
+        self.assertFalse(Unit.objects.filter(customer__isnull=False).exists())
+        self.assertFalse(Unit.objects.exclude(version=2).exists())
+        self.assertEqual(Change.objects.filter(entity='customer', operation='delete').count(), 3)
+        self.assertEqual(Change.objects.filter(entity='unit', operation='upsert').count(), 6)
+
+    def test_customer_search_normalizes_rut(self):
+        """Prueba que el buscador de clientes encuentre el RUT escrito con formato"""
+        response = self.client.get(reverse('admin:core_customer_changelist'), {'q': '12.345.678-5'})
+        self.assertContains(response, 'juan.perez@example.com')
+
+    def _customer_form(self, **data):
+        return {
+            'rut': self.customer.rut, 'name': self.customer.name, 'lastname': self.customer.lastname,
+            'email': self.customer.email, 'phone': '', **data
+        }
+
+    def test_customer_change_saves_with_loaded_version(self):
+        """Prueba que editar un cliente en el admin renueve su versión y quede en el feed de cambios"""
+        url = reverse('admin:core_customer_change', args=[self.customer.id])
+        response = self.client.post(url, self._customer_form(name="Juana", loaded_version=1))
+        self.assertEqual(response.status_code, 302)
+        self.customer.refresh_from_db()
+        self.assertEqual((self.customer.name, self.customer.version), ("Juana", 2))
+        self.assertTrue(Change.objects.filter(entity='customer', operation='upsert').exists())
+
+    def test_stale_customer_change_is_a_form_error(self):
+        """Prueba que guardar sobre una versión que otro usuario ya cambió muestre un error y no pise sus datos"""
+        url = reverse('admin:core_customer_change', args=[self.customer.id])
+        self.assertContains(self.client.get(url), 'name="loaded_version" value="1"')
+        Customer.objects.filter(id=self.customer.id).update(name="Pedro", version=2)
+
+        response = self.client.post(url, self._customer_form(lastname="Soto", loaded_version=1))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(PreconditionFailed.default_detail, response.context['adminform'].form.non_field_errors())
+        self.customer.refresh_from_db()
+        self.assertEqual((self.customer.name, self.customer.lastname, self.customer.version), ("Pedro", "Pérez", 2))
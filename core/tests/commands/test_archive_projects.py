@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models.models import ArchivedProject, ArchivedUnit, Customer, Project, Unit
+
+
+class ArchiveProjectsCommandTest(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(
+            rut="123456785",
+            name="Juan",
+            lastname="Pérez",
+            email="juan.perez@example.com",
+            phone="+56912345678"
+        )
+        self.sold = Project.objects.create(
+            name="Proyecto Vendido",
+            address="Av. Ejemplo 123",
+            started_at="2020-01-01",
+            finished_at="2022-01-01",
+            status="Sold"
+        )
+        self.active = Project.objects.create(
+            name="Proyecto Activo",
+            address="Av. Ejemplo 456",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.sold_unit = Unit.objects.create(
+            unit_number="1", unit_type="Apartment", square_meters=50.5, price=150000000,
+            unit_status="Sold", project=self.sold, customer=self.customer
+        )
+        Unit.objects.create(
+            unit_number="1", unit_type="Apartment", square_meters=50.5, price=150000000,
+            unit_status="Available", project=self.active
+        )
+
+    def test_archive_moves_sold_projects_and_units(self):
+        """Prueba que el archivado mueva proyectos vendidos y sus unidades a las tablas de archivo"""
+        call_command('archive_projects', stdout=StringIO())
+        self.assertFalse(Project.objects.filter(id=self.sold.id).exists())
+        self.assertFalse(Unit.objects.filter(project=self.sold.id).exists())
+        self.assertTrue(Project.objects.filter(id=self.active.id).exists())
+        archived_unit = ArchivedUnit.objects.get(id=self.sold_unit.id)
+        self.assertEqual(archived_unit.project, self.sold.id)
+        self.assertEqual(archived_unit.customer, self.customer.id)
+        self.assertEqual(ArchivedProject.objects.get(id=self.sold.id).name, "Proyecto Vendido")
+
+    def test_dry_run_does_not_move_rows(self):
+        """Prueba que --dry-run solo informe sin mover filas"""
+        out = StringIO()
+        call_command('archive_projects', dry_run=True, stdout=out)
+        self.assertIn('1 proyectos y 1 unidades', out.getvalue())
+        self.assertTrue(Project.objects.filter(id=self.sold.id).exists())
+
+    def test_restore_returns_rows_and_clears_deleted_customers(self):
+        """Prueba que la restauración devuelva las filas y limpie clientes eliminados"""
+        call_command('archive_projects', stdout=StringIO())
+        Customer.objects.filter(id=self.customer.id).delete()
+        call_command('restore_projects', str(self.sold.id), stdout=StringIO())
+        self.assertEqual(Project.objects.get(id=self.sold.id).status, "Sold")
+        unit = Unit.objects.get(id=self.sold_unit.id)
+        self.assertIsNone(unit.customer)
+        self.assertEqual(unit.price, 150000000)
+        self.assertFalse(ArchivedProject.objects.exists())
+        self.assertFalse(ArchivedUnit.objects.exists())
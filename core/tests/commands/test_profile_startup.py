@@ -0,0 +1,28 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from core.management.commands.profile_startup import parse_importtime
+
+
+class ProfileStartupCommandTest(SimpleTestCase):
+    def test_parse_importtime(self):
+        """Prueba que se lean el tiempo propio, el acumulado y el nivel de cada módulo"""
+        stderr = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   core.startup\n'
+            'import time:       300 |        420 | core\n'
+            'otra línea\n'
+        )
+        self.assertEqual(parse_importtime(stderr), [('core.startup', 120, 120, 1), ('core', 300, 420, 0)])
+
+    def test_reports_phases_and_apps(self):
+        """Prueba que el comando mida django.setup(), el primer request y el tiempo por app"""
+        out = StringIO()
+        call_command('profile_startup', '--top', '3', stdout=out)
+        report = out.getvalue()
+        self.assertIn('django.setup()', report)
+        self.assertIn('first request /metrics (200)', report)
+        self.assertIn('Por app (INSTALLED_APPS)', report)
+        self.assertIn('rest_framework', report)
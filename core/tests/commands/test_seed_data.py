@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models.models import Project, Unit, Customer
+from core.utils.rut import compute_check_digit
+
+
+class SeedDataCommandTest(TestCase):
+    def test_seed_data_creates_requested_rows(self):
+        """Prueba que el comando genere la cantidad de filas solicitada"""
+        out = StringIO()
+        call_command('seed_data', projects=3, units_per_project=20, customers=15, batch_size=7, seed=1, stdout=out)
+        self.assertEqual(Project.objects.count(), 3)
+        self.assertEqual(Unit.objects.count(), 60)
+        self.assertEqual(Customer.objects.count(), 15)
+        self.assertIn('unidades: 60/60', out.getvalue())
+
+    def test_seed_data_generates_valid_customers(self):
+        """Prueba que los clientes tengan RUT con dígito verificador válido, email único y teléfono +569"""
+        call_command('seed_data', projects=0, units_per_project=0, customers=50, seed=2, stdout=StringIO())
+        customers = list(Customer.objects.all())
+        self.assertEqual(len({c.email for c in customers}), 50)
+        for customer in customers:
+            self.assertIn(len(customer.rut), (8, 9))
+            self.assertEqual(customer.rut[-1], compute_check_digit(customer.rut[:-1]))
+            self.assertTrue(customer.phone.startswith('+569'))
+            self.assertEqual(len(customer.phone), 12)
+
+    def test_seed_data_assigns_customers_to_sold_units(self):
+        """Prueba que las unidades vendidas o reservadas tengan cliente asociado"""
+        call_command('seed_data', projects=2, units_per_project=50, customers=10, seed=3, stdout=StringIO())
+        self.assertFalse(Unit.objects.exclude(unit_status='Available').filter(customer__isnull=True).exists())
+        self.assertFalse(Unit.objects.filter(unit_status='Available', customer__isnull=False).exists())
+
+
+class ComputeCheckDigitTest(TestCase):
+    def test_known_ruts(self):
+        """Prueba el dígito verificador con RUTs conocidos"""
+        self.assertEqual(compute_check_digit(11111111), '1')
+        self.assertEqual(compute_check_digit(12345678), '5')
+        self.assertEqual(compute_check_digit(10000013), 'K')
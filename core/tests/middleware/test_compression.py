@@ -0,0 +1,89 @@
+import gzip
+import json
+from unittest import mock
+
+import brotli
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from core.middleware import compression
+from core.middleware.compression import choose_encoding, parse_accept_encoding
+from core.models.models import Project, Unit
+
+
+class CompressionMiddlewareTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        Unit.objects.bulk_create([
+            Unit(
+                project=self.project,
+                unit_number=str(100 + index),
+                unit_type="Apartment",
+                square_meters=50.5,
+                price=100000000,
+                unit_status="Available"
+            )
+            for index in range(50)
+        ])
+        self.list_url = reverse('units-list')
+
+    def test_gzip_large_response(self):
+        """Prueba que una respuesta grande se comprima con gzip si el cliente lo acepta"""
+        response = self.client.get(self.list_url, {'page_size': 50}, HTTP_ACCEPT_ENCODING='gzip, deflate', **self.auth_headers)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), 50)
+
+    def test_prefers_brotli(self):
+        """Prueba que se prefiera Brotli cuando el cliente acepta ambos"""
+        response = self.client.get(self.list_url, {'page_size': 50}, HTTP_ACCEPT_ENCODING='gzip, br', **self.auth_headers)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(brotli.decompress(response.content))['count'], 50)
+
+    def test_small_or_not_accepted_responses_are_not_compressed(self):
+        """Prueba que no se compriman respuestas bajo el umbral ni sin Accept-Encoding"""
+        small = self.client.get(self.list_url, {'page_size': 1}, HTTP_ACCEPT_ENCODING='gzip', **self.auth_headers)
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', small['Vary'])
+        identity = self.client.get(self.list_url, {'page_size': 50}, **self.auth_headers)
+        self.assertFalse(identity.has_header('Content-Encoding'))
+        refused = self.client.get(self.list_url, {'page_size': 50}, HTTP_ACCEPT_ENCODING='gzip;q=0', **self.auth_headers)
+        self.assertFalse(refused.has_header('Content-Encoding'))
+
+    @override_settings(COMPRESSION_MIN_SIZE=100)
+    def test_availability_is_compressed_once_per_version(self):
+        """Prueba que la disponibilidad se comprima una sola vez mientras no cambie su versión"""
+        url = reverse('projects-availability', args=[self.project.id])
+        with mock.patch.object(compression, 'compress', wraps=compression.compress) as compress:
+            first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', **self.auth_headers)
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', **self.auth_headers)
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(second['Content-Encoding'], 'gzip')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(json.loads(gzip.decompress(second.content))['units'], 50)
+
+
+class AcceptEncodingTest(SimpleTestCase):
+    def test_parse_accept_encoding(self):
+        """Prueba que se interpreten las calidades del header Accept-Encoding"""
+        self.assertEqual(parse_accept_encoding('gzip;q=0.5, br , identity;q=0'), {'gzip': 0.5, 'br': 1.0, 'identity': 0.0})
+
+    def test_choose_encoding(self):
+        """Prueba que se elija la codificación con mayor calidad aceptada"""
+        self.assertEqual(choose_encoding('gzip, br'), 'br')
+        self.assertEqual(choose_encoding('gzip, br;q=0.1'), 'gzip')
+        self.assertEqual(choose_encoding('*'), 'br')
+        self.assertIsNone(choose_encoding('identity'))
+        self.assertIsNone(choose_encoding(''))
@@ -0,0 +1,68 @@
+import json
+import logging
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from core.middleware.slow_queries import fingerprint, logger, slow_query_log
+from core.models.models import Project
+
+
+class SlowQueryMiddlewareTest(APITestCase):
+    def setUp(self):
+        # Nada se escribe en el slow_queries.log real; assertLogs captura lo que se prueba
+        handlers = mock.patch.object(logger, 'handlers', [logging.NullHandler()])
+        handlers.start()
+        self.addCleanup(handlers.stop)
+        slow_query_log.reset()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        slow_query_log.reset()
+
+    def _unit_entries(self, logs):
+        entries = [json.loads(record.getMessage()) for record in logs.records]
+        return [e for e in entries if e['view'] == 'UnitViewSet' and 'core_unit' in e['sql']]
+
+    def test_logs_slow_query_with_view_filters_and_explain(self):
+        """Prueba que una consulta lenta se registre con vista, acción, filtros y EXPLAIN"""
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0), self.assertLogs('core.slow_queries', level='WARNING') as logs:
+            self.client.get(reverse('units-list'), {'project': str(self.project.id), 'status': 'Available'}, **self.auth_headers)
+        entries = self._unit_entries(logs)
+        self.assertTrue(entries)
+        entry = entries[0]
+        self.assertEqual(entry['action'], 'list')
+        self.assertEqual(entry['filters'], ['project', 'status'])
+        self.assertTrue(entry['explain'])
+        self.assertIn('views.py', entry['caller'])
+
+    def test_deduplicates_by_fingerprint(self):
+        """Prueba que la misma consulta no se registre dos veces dentro de la ventana de deduplicación"""
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0), self.assertLogs('core.slow_queries', level='WARNING') as first:
+            self.client.get(reverse('units-list'), {'project': str(self.project.id)}, **self.auth_headers)
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0), self.assertLogs('core.slow_queries', level='WARNING') as second:
+            self.client.get(reverse('units-list'), {'project': str(self.project.id)}, **self.auth_headers)
+            # Otra combinación de filtros genera una huella distinta
+            self.client.get(reverse('units-list'), {'status': 'Sold'}, **self.auth_headers)
+        first_keys = {e['fingerprint'] for e in self._unit_entries(first)}
+        second_keys = {e['fingerprint'] for e in self._unit_entries(second)}
+        self.assertTrue(second_keys)
+        self.assertFalse(first_keys & second_keys)
+
+
+class FingerprintTest(SimpleTestCase):
+    def test_ignores_literals_and_in_list_length(self):
+        """Prueba que la huella ignore valores literales y el largo de las listas IN"""
+        a, _ = fingerprint('SELECT * FROM core_unit WHERE id IN (%s, %s) LIMIT 10')
+        b, _ = fingerprint('SELECT * FROM core_unit WHERE id IN (%s, %s, %s)  LIMIT 20')
+        c, _ = fingerprint("SELECT * FROM core_unit WHERE unit_status = 'Sold'")
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from core.models.models import Project, Unit, Customer
 from datetime import date
+from decimal import Decimal
 
 class UnitModelTest(TestCase):
     def setUp(self):
@@ -42,3 +43,19 @@ class UnitModelTest(TestCase):
             customer=customer
         )
         self.assertEqual(unit.customer.name, "Juan")
+
+    def test_unit_keeps_price_per_m2_in_sync(self):
+        """Prueba que el precio por m² se recalcule al guardar la unidad"""
+        unit = Unit.objects.create(
+            unit_number="1A",
+            unit_type="Apartment",
+            square_meters=50,
+            price=150000000,
+            unit_status="Available",
+            project=self.project
+        )
+        self.assertEqual(unit.price_per_m2, Decimal('3000000.00'))
+        unit.price = 100000000
+        unit.save(update_fields=['price'])
+        unit.refresh_from_db()
+        self.assertEqual(unit.price_per_m2, Decimal('2000000.00'))
@@ -0,0 +1,85 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+from core.models.models import Change, Project, Unit
+from core.services.project_service import ProjectService
+
+
+class ProjectServiceDeleteTest(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.other = Project.objects.create(
+            name="Otro Proyecto",
+            address="Av. Ejemplo 456",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        Unit.objects.bulk_create([
+            Unit(project=project, unit_number=str(i), unit_type="Apartment", square_meters=50, price=100)
+            for project in (self.project, self.other)
+            for i in range(50)
+        ])
+
+    def test_delete_project_removes_only_its_units(self):
+        """Prueba que borrar un proyecto elimine solo sus unidades"""
+        self.assertTrue(ProjectService.delete_project(self.project.id))
+        self.assertFalse(Project.objects.filter(id=self.project.id).exists())
+        self.assertEqual(Unit.objects.filter(project=self.project).count(), 0)
+        self.assertEqual(Unit.objects.filter(project=self.other).count(), 50)
+
+    def test_delete_project_does_not_depend_on_unit_count(self):
+        """Prueba que el borrado use un número fijo de consultas sin cargar las unidades"""
+        # SAVEPOINT, lápidas e historia de unidades (INSERT ... SELECT), DELETE de
+        # unidades, DELETE del proyecto, lápida del proyecto y RELEASE SAVEPOINT
+        with self.assertNumQueries(7):
+            ProjectService.delete_project(self.project.id)
+
+    def test_delete_missing_project_returns_false(self):
+        """Prueba que borrar un proyecto inexistente retorne False"""
+        self.assertFalse(ProjectService.delete_project('00000000-0000-0000-0000-000000000000'))
+
+
+class ProjectServiceUpdateTest(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+
+    def test_partial_update_writes_only_changed_columns(self):
+        """Prueba que un PATCH escriba solo las columnas modificadas"""
+        with CaptureQueriesContext(connection) as captured:
+            project = ProjectService.partial_update_project(self.project.id, {"name": "Nuevo nombre"})
+        updates = [query['sql'] for query in captured if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"name"', updates[0])
+        self.assertNotIn('"address"', updates[0])
+        self.assertEqual(project.name, "Nuevo nombre")
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.name, "Nuevo nombre")
+
+    def test_partial_update_without_changes_skips_write(self):
+        """Prueba que un PATCH sin cambios solo lea el proyecto y no registre cambios"""
+        with self.assertNumQueries(1):
+            ProjectService.partial_update_project(self.project.id, {"name": "Proyecto Prueba"})
+        self.assertFalse(Change.objects.filter(entity='project').exists())
+
+    def test_partial_update_validates_with_serializer(self):
+        """Prueba que la validación del serializer se aplique en las actualizaciones parciales"""
+        with self.assertRaises(ValidationError):
+            ProjectService.partial_update_project(self.project.id, {"status": "Finished"})
+        project = ProjectService.partial_update_project(self.project.id, {"finished_at": "2025-12-31"})
+        self.assertEqual(project.status, "Finished")
+
+    def test_update_missing_project_returns_none(self):
+        """Prueba que actualizar un proyecto inexistente o con ID inválido retorne None"""
+        self.assertIsNone(ProjectService.update_project('00000000-0000-0000-0000-000000000000', {}))
+        self.assertIsNone(ProjectService.partial_update_project('no-es-un-uuid', {}))
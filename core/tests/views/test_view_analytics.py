@@ -0,0 +1,111 @@
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.models.models import Customer, Project, SalesRollup, Unit
+from core.services.sales_rollup_service import COUNTERS, SalesRollupService
+from core.services.unit_service import UnitService
+
+
+class SalesAnalyticsTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.customer = Customer.objects.create(
+            rut="123456785",
+            name="Juan",
+            lastname="Pérez",
+            email="juan.perez@example.com"
+        )
+        self.units = [
+            Unit.objects.create(
+                project=self.project,
+                unit_number=str(100 + index),
+                unit_type="Apartment",
+                square_meters=50,
+                price=100000000,
+                reservation_deposit=5000000
+            )
+            for index in range(3)
+        ]
+        self.url = reverse('analytics-sales')
+
+    def _patch(self, unit, data):
+        return self.client.patch(
+            reverse('units-detail', args=[unit.id]), data=json.dumps(data),
+            content_type='application/json', **self.auth_headers
+        )
+
+    def test_status_changes_update_rollups(self):
+        """Prueba que reservar, vender y liberar unidades actualice los totales del día"""
+        customer = str(self.customer.id)
+        self._patch(self.units[0], {"unit_status": "Reserved", "customer": customer})
+        self._patch(self.units[1], {"unit_status": "Reserved", "customer": customer})
+        self._patch(self.units[1], {"unit_status": "Sold"})
+        self._patch(self.units[0], {"unit_status": "Available", "customer": None})
+
+        rollup = SalesRollup.objects.get(project=self.project.id, day=timezone.localdate())
+        self.assertEqual((rollup.reservations, rollup.sales, rollup.releases), (2, 1, 1))
+        self.assertEqual(rollup.revenue, 100000000)
+        self.assertEqual(rollup.deposits, 10000000)
+
+    def test_bulk_status_change_updates_rollups(self):
+        """Prueba que un cambio de estado masivo sume todas las unidades en una sola escritura"""
+        Unit.objects.update(customer=self.customer)
+        UnitService.set_status(Unit.objects.all(), 'Sold')
+        rollup = SalesRollup.objects.get(project=self.project.id)
+        self.assertEqual((rollup.sales, rollup.revenue), (3, 300000000))
+
+    def test_sales_endpoint_groups_by_granularity(self):
+        """Prueba que el endpoint agrupe los totales por mes y filtre por rango"""
+        SalesRollup.objects.bulk_create([
+            SalesRollup(project=self.project.id, day=date(2025, 1, 5), reservations=2, deposits=10),
+            SalesRollup(project=self.project.id, day=date(2025, 1, 20), sales=1, revenue=100),
+            SalesRollup(project=self.project.id, day=date(2025, 2, 3), sales=2, revenue=200),
+            SalesRollup(project=self.project.id, day=date(2025, 4, 1), sales=9, revenue=900),
+        ])
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {
+                'project': str(self.project.id), 'from': '2025-01-01', 'to': '2025-03-31', 'granularity': 'month'
+            }, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([row['period'] for row in results], [date(2025, 1, 1), date(2025, 2, 1)])
+        self.assertEqual((results[0]['reservations'], results[0]['sales'], results[0]['revenue']), (2, 1, 100))
+        self.assertEqual(results[1]['sales'], 2)
+
+    def test_invalid_range(self):
+        """Prueba que un rango invertido o una granularidad desconocida retornen 400"""
+        response = self.client.get(self.url, {'from': '2025-02-01', 'to': '2025-01-01'}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'granularity': 'year'}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_from_history_matches_incremental_rollups(self):
+        """Prueba que la reconstrucción desde la historia reproduzca los totales incrementales"""
+        UnitService.create_unit({
+            "project": str(self.project.id), "customer": str(self.customer.id), "unit_number": "201",
+            "unit_type": "Apartment", "square_meters": "50.00", "price": 80000000,
+            "reservation_deposit": 4000000, "unit_status": "Reserved"
+        })
+        customer = str(self.customer.id)
+        self._patch(self.units[0], {"unit_status": "Reserved", "customer": customer})
+        self._patch(self.units[0], {"unit_status": "Sold"})
+        self._patch(self.units[1], {"unit_status": "Reserved", "customer": customer})
+        self._patch(self.units[1], {"unit_status": "Available", "customer": None})
+        expected = list(SalesRollup.objects.values('project', 'day', *COUNTERS))
+
+        SalesRollup.objects.create(project=self.project.id, day=date(2020, 1, 1), sales=50)
+        self.assertEqual(SalesRollupService.rebuild(), 1)
+        self.assertEqual(list(SalesRollup.objects.values('project', 'day', *COUNTERS)), expected)
@@ -0,0 +1,81 @@
+from io import StringIO
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from core.models.models import Project, Unit
+
+
+class ArchivedReadTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+
+        self.sold = Project.objects.create(
+            name="Proyecto Vendido",
+            address="Av. Ejemplo 123",
+            started_at="2020-01-01",
+            finished_at="2022-01-01",
+            status="Sold"
+        )
+        self.active = Project.objects.create(
+            name="Proyecto Activo",
+            address="Av. Ejemplo 456",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.sold_unit = Unit.objects.create(
+            unit_number="1", unit_type="Apartment", square_meters=50.5, price=300000000,
+            unit_status="Sold", project=self.sold
+        )
+        Unit.objects.create(
+            unit_number="2", unit_type="House", square_meters=80, price=100000000,
+            unit_status="Available", project=self.active
+        )
+        call_command('archive_projects', stdout=StringIO())
+
+    def test_list_projects_excludes_archived_by_default(self):
+        """Prueba que los proyectos archivados no aparezcan sin include_archived"""
+        response = self.client.get(reverse('projects-list'), **self.auth_headers)
+        self.assertEqual([p['name'] for p in response.data['results']], ["Proyecto Activo"])
+
+    def test_list_projects_with_archived(self):
+        """Prueba que include_archived combine proyectos activos y archivados respetando el orden"""
+        response = self.client.get(
+            reverse('projects-list'), {'include_archived': 'true', 'ordering': 'started_at'}, **self.auth_headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        results = response.data['results']
+        self.assertEqual([p['name'] for p in results], ["Proyecto Vendido", "Proyecto Activo"])
+        self.assertEqual([p['archived'] for p in results], [True, False])
+
+    def test_list_units_with_archived_applies_filters(self):
+        """Prueba que los filtros de UnitFilter se apliquen también a las unidades archivadas"""
+        response = self.client.get(
+            reverse('units-list'),
+            {'include_archived': 'true', 'project': str(self.sold.id), 'ordering': '-price'},
+            **self.auth_headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['id'], str(self.sold_unit.id))
+        self.assertEqual(response.data['results'][0]['project'], str(self.sold.id))
+
+    def test_retrieve_archived_project(self):
+        """Prueba que un proyecto archivado solo se obtenga con include_archived"""
+        url = reverse('projects-detail', args=[self.sold.id])
+        self.assertEqual(self.client.get(url, **self.auth_headers).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(url, {'include_archived': 'true'}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['archived'])
+
+    def test_retrieve_archived_unit(self):
+        """Prueba que una unidad archivada se obtenga con include_archived"""
+        url = reverse('units-detail', args=[self.sold_unit.id])
+        response = self.client.get(url, {'include_archived': 'true'}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['unit_status'], "Sold")
@@ -0,0 +1,68 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from core.models.models import Project, Unit
+from core.services.availability_service import AvailabilityService
+
+
+class ProjectAvailabilityTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.units = {
+            number: Unit.objects.create(
+                project=self.project,
+                unit_number=number,
+                unit_type="Apartment",
+                square_meters=50,
+                price=100000000,
+                unit_status=unit_status
+            )
+            for number, unit_status in (("1001", "Sold"), ("102", "Reserved"), ("101", "Available"))
+        }
+        self.url = reverse('projects-availability', args=[self.project.id])
+
+    def test_availability_matrix(self):
+        """Prueba que la disponibilidad retorne números y estados paralelos en orden natural"""
+        response = self.client.get(self.url, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['units'], 3)
+        self.assertEqual(response.data['unit_numbers'], ["101", "102", "1001"])
+        self.assertEqual(response.data['statuses'], "ARS")
+        self.assertEqual(response.data['counts'], {"Available": 1, "Reserved": 1, "Sold": 1})
+
+    def test_availability_is_cached(self):
+        """Prueba que la segunda lectura de la disponibilidad no consulte la base de datos"""
+        AvailabilityService.get_availability(self.project.id)
+        with self.assertNumQueries(0):
+            availability = AvailabilityService.get_availability(str(self.project.id))
+        self.assertEqual(availability['statuses'], "ARS")
+
+    def test_availability_invalidated_when_unit_changes(self):
+        """Prueba que la caché se invalide al cambiar el estado de una unidad del proyecto"""
+        self.client.get(self.url, **self.auth_headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse('units-detail', args=[self.units["101"].id]),
+                {"unit_status": "Sold"},
+                format='json',
+                **self.auth_headers
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(self.url, **self.auth_headers)
+        self.assertEqual(response.data['statuses'], "SRS")
+
+    def test_availability_not_found(self):
+        """Prueba que la disponibilidad de un proyecto inexistente retorne 404"""
+        response = self.client.get(reverse('projects-availability', args=['00000000-0000-0000-0000-000000000000']), **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,59 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from core.models.models import Project, Unit, Customer
+import uuid
+
+
+class BatchGetTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.units = [
+            Unit.objects.create(
+                project=self.project,
+                unit_number=str(100 + index),
+                unit_type="Apartment",
+                square_meters=50,
+                price=100000000,
+                unit_status="Available"
+            )
+            for index in range(3)
+        ]
+
+    def test_units_batch_get_preserves_order_and_reports_missing(self):
+        """Prueba que batch_get retorne las unidades en el orden pedido, sin repetidos y con los IDs faltantes"""
+        missing = str(uuid.uuid4())
+        ids = [str(self.units[2].id), missing, str(self.units[0].id), str(self.units[2].id)]
+        # Una consulta para autenticar al usuario y otra para las unidades
+        with self.assertNumQueries(2):
+            response = self.client.post(reverse('units-batch-get'), {"ids": ids}, format='json', **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([unit['unit_number'] for unit in response.data['results']], ["102", "100"])
+        self.assertEqual([str(pk) for pk in response.data['missing']], [missing])
+
+    def test_projects_and_customers_batch_get(self):
+        """Prueba que batch_get funcione también para proyectos y clientes"""
+        customer = Customer.objects.create(rut="123456785", name="Juan", lastname="Pérez", email="juan@example.com")
+        response = self.client.post(reverse('projects-batch-get'), {"ids": [str(self.project.id)]}, format='json', **self.auth_headers)
+        self.assertEqual(response.data['results'][0]['name'], "Proyecto Prueba")
+        response = self.client.post(reverse('customers-batch-get'), {"ids": [str(customer.id)]}, format='json', **self.auth_headers)
+        self.assertEqual(response.data['results'][0]['rut'], "123456785")
+        self.assertEqual(response.data['missing'], [])
+
+    @override_settings(BATCH_GET_MAX=2)
+    def test_batch_get_validates_ids(self):
+        """Prueba que batch_get rechace IDs inválidos, listas vacías o sobre el máximo"""
+        url = reverse('units-batch-get')
+        for ids in (["no-es-un-uuid"], [], [str(unit.id) for unit in self.units]):
+            response = self.client.post(url, {"ids": ids}, format='json', **self.auth_headers)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, ids)
@@ -0,0 +1,129 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from unittest import mock
+from django.urls import reverse
+from core.models.models import Change, Unit, Customer
+from core.services.change_service import ChangeService
+from core.services.project_service import ProjectService
+from io import StringIO
+import json
+
+
+class ChangeViewSetTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = ProjectService.create_project({
+            "name": "Proyecto Prueba",
+            "address": "Av. Ejemplo 123",
+            "started_at": "2025-01-01",
+            "status": "Off Plan"
+        })
+        self.url = reverse('changes-list')
+
+    def _changes(self, since):
+        response = self.client.get(self.url, {'since': since}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_without_since_returns_current_cursor(self):
+        """Prueba que sin since se retorne solo el cursor actual"""
+        response = self.client.get(self.url, **self.auth_headers)
+        self.assertEqual(response.data['changes'], [])
+        self.assertEqual(response.data['next_since'], Change.objects.latest('position').position)
+
+    def test_returns_only_changes_after_cursor_compacted(self):
+        """Prueba que se retornen solo los cambios posteriores al cursor, uno por entidad"""
+        cursor = self._changes(0)['next_since']
+        unit_data = {"unit_number": "1", "unit_type": "Apartment", "square_meters": 50, "price": 1000, "project": str(self.project.id)}
+        response = self.client.post(reverse('units-list'), data=json.dumps(unit_data), content_type='application/json', **self.auth_headers)
+        unit_id = response.data['id']
+        self.client.patch(
+            reverse('units-detail', args=[unit_id]),
+            data=json.dumps({"unit_status": "Reserved"}),
+            content_type='application/json',
+            **self.auth_headers
+        )
+        data = self._changes(cursor)
+        self.assertEqual(len(data['changes']), 1)
+        change = data['changes'][0]
+        self.assertEqual(change['entity'], 'unit')
+        self.assertEqual(change['op'], 'upsert')
+        self.assertEqual(change['data']['unit_status'], 'Reserved')
+        self.assertEqual(self._changes(data['next_since'])['changes'], [])
+
+    def test_delete_project_writes_tombstones_for_units(self):
+        """Prueba que borrar un proyecto deje lápidas del proyecto y de sus unidades"""
+        unit = Unit.objects.create(
+            unit_number="1", unit_type="Apartment", square_meters=50, price=1000, project=self.project
+        )
+        cursor = self._changes(0)['next_since']
+        self.client.delete(reverse('projects-detail', args=[self.project.id]), **self.auth_headers)
+        changes = self._changes(cursor)['changes']
+        self.assertEqual(
+            {(c['entity'], str(c['id']), c['op']) for c in changes},
+            {('unit', str(unit.id), 'delete'), ('project', str(self.project.id), 'delete')}
+        )
+        self.assertTrue(all('data' not in c for c in changes))
+
+    def test_delete_customer_updates_its_units(self):
+        """Prueba que borrar un cliente registre el cambio en sus unidades"""
+        customer = Customer.objects.create(rut="123456785", name="Juan", lastname="Pérez", email="juan@example.com")
+        unit = Unit.objects.create(
+            unit_number="1", unit_type="Apartment", square_meters=50, price=1000,
+            unit_status="Sold", project=self.project, customer=customer
+        )
+        cursor = self._changes(0)['next_since']
+        self.client.delete(reverse('customers-detail', args=[customer.id]), **self.auth_headers)
+        changes = {c['entity']: c for c in self._changes(cursor)['changes']}
+        self.assertEqual(changes['customer']['op'], 'delete')
+        self.assertEqual(str(changes['unit']['id']), str(unit.id))
+        self.assertIsNone(changes['unit']['data']['customer'])
+
+    def test_limit_paginates_with_has_more(self):
+        """Prueba que limit divida los cambios en lotes con has_more"""
+        for i in range(3):
+            ProjectService.create_project({"name": f"P{i}", "address": "X", "started_at": "2025-01-01"})
+        first = self.client.get(self.url, {'since': 0, 'limit': 2}, **self.auth_headers).data
+        self.assertTrue(first['has_more'])
+        self.assertEqual(len(first['changes']), 2)
+        second = self.client.get(self.url, {'since': first['next_since'], 'limit': 2}, **self.auth_headers).data
+        self.assertFalse(second['has_more'])
+
+    def test_pruned_cursor_requires_full_resync(self):
+        """Prueba que un cursor anterior a los cambios purgados pida resincronizar todo"""
+        for i in range(2):
+            ProjectService.create_project({"name": f"P{i}", "address": "X", "started_at": "2025-01-01"})
+        call_command('prune_changes', days=0, stdout=StringIO())
+        self.assertEqual(Change.objects.count(), 1)
+        self.assertTrue(self._changes(0)['full_resync_required'])
+        latest = Change.objects.get().position
+        self.assertFalse(self._changes(latest)['full_resync_required'])
+
+    def test_change_committed_late_is_not_skipped(self):
+        """Prueba que un cambio de una transacción larga, con seq menor y confirmado después, no se salte"""
+        cursor = self._changes(0)['next_since']
+        # La transacción larga (txid 105) insertó primero; la corta (txid 100) confirmó antes
+        late = Change.objects.create(entity='project', entity_id=self.project.id, operation='delete')
+        early = Change.objects.create(entity='unit', entity_id=self.project.id, operation='delete')
+        Change.objects.filter(seq=late.seq).update(txid=105)
+        Change.objects.filter(seq=early.seq).update(txid=100)
+        self.assertLess(late.seq, early.seq)
+
+        # Se simula el snapshot de Postgres: xmin 105 mientras la transacción larga sigue abierta
+        with mock.patch.object(ChangeService, '_visible_horizon', return_value=105):
+            first = self._changes(cursor)
+        self.assertEqual([change['entity'] for change in first['changes']], ['unit'])
+
+        with mock.patch.object(ChangeService, '_visible_horizon', return_value=200):
+            second = self._changes(first['next_since'])
+        self.assertEqual([change['entity'] for change in second['changes']], ['project'])
+        self.assertGreater(second['next_since'], first['next_since'])
+
+    def test_invalid_since_returns_400(self):
+        """Prueba que un since no numérico retorne 400"""
+        response = self.client.get(self.url, {'since': 'abc'}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
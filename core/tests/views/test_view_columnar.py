@@ -0,0 +1,72 @@
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.urls import reverse
+from core.models.models import Project, Unit
+from core.views.pagination import StandardPagination
+
+
+class ColumnarFormatTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        for index in range(15):
+            Unit.objects.create(
+                project=self.project,
+                unit_number=str(100 + index),
+                unit_type="Apartment",
+                square_meters=50.5,
+                price=100000000 + index,
+                unit_status="Available" if index % 2 else "Sold"
+            )
+
+    def test_units_columnar_matches_default_format(self):
+        """Prueba que el formato columnar entregue las mismas filas y valores que el formato por defecto"""
+        url = reverse('units-list')
+        rows = self.client.get(url, {'ordering': 'price'}, **self.auth_headers).data
+        response = self.client.get(url, {'ordering': 'price', 'format': 'columnar'}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['count'], 15)
+        self.assertIsNotNone(data['next'])
+        self.assertIn('price', data['columns'])
+        self.assertEqual(data['data']['id'], [str(unit['id']) for unit in rows['results']])
+        self.assertEqual(data['data']['price'], [unit['price'] for unit in rows['results']])
+        self.assertEqual(data['data']['project'], [str(self.project.id)] * 10)
+
+    def test_columnar_applies_filters_and_page_size(self):
+        """Prueba que el formato columnar respete filtros y page_size"""
+        response = self.client.get(
+            reverse('units-list'), {'status': 'Sold', 'format': 'columnar', 'page_size': 100}, **self.auth_headers
+        )
+        data = response.json()
+        self.assertEqual(data['count'], 8)
+        self.assertEqual(len(data['data']['id']), 8)
+        self.assertEqual(set(data['data']['unit_status']), {'Sold'})
+
+    def test_large_page_size_is_only_for_columnar(self):
+        """Prueba que el límite alto de page_size aplique solo al formato columnar"""
+        url = reverse('units-list')
+        with mock.patch.object(StandardPagination, 'max_page_size', 5):
+            rows = self.client.get(url, {'page_size': 100}, **self.auth_headers).data
+            columnar = self.client.get(url, {'page_size': 100, 'format': 'columnar'}, **self.auth_headers).json()
+        self.assertEqual(len(rows['results']), 5)
+        self.assertEqual(len(columnar['data']['id']), 15)
+
+    def test_columnar_without_rows(self):
+        """Prueba que un listado vacío entregue todas las columnas sin valores"""
+        response = self.client.get(reverse('customers-list'), {'format': 'columnar'}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['count'], 0)
+        self.assertIn('rut', data['columns'])
+        self.assertEqual(data['data']['rut'], [])
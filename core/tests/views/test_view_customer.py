@@ -17,7 +17,7 @@ class CustomerViewSetTest(APITestCase):
 
         # Crear clientes de prueba
         self.customer = Customer.objects.create(
-            rut="123456789",
+            rut="123456785",
             name="Juan",
             lastname="Pérez",
             email="juan.perez@example.com",
@@ -32,7 +32,7 @@ class CustomerViewSetTest(APITestCase):
         response = self.client.get(self.list_url, **self.auth_headers)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)  # Solo un cliente debería estar presente
-        self.assertEqual(response.data['results'][0]['rut'], "123456789")
+        self.assertEqual(response.data['results'][0]['rut'], "123456785")
 
     def test_retrieve_customer(self):
         """Prueba que se puedan obtener los detalles de un cliente"""
@@ -44,7 +44,7 @@ class CustomerViewSetTest(APITestCase):
     def test_create_customer(self):
         """Prueba que se pueda crear un cliente"""
         data = {
-            "rut": "987654321",
+            "rut": "98.765.432-5",
             "name": "Pedro",
             "lastname": "Gómez",
             "email": "pedro.gomez@example.com",
@@ -60,12 +60,12 @@ class CustomerViewSetTest(APITestCase):
         # Verifica la respuesta y el contenido creado
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Customer.objects.count(), 2)
-        self.assertEqual(Customer.objects.order_by('-created_at').first().rut, "987654321")
+        self.assertEqual(Customer.objects.order_by('-created_at').first().rut, "987654325")
 
     def test_update_customer(self):
         """Prueba que se pueda actualizar completamente un cliente"""
         data = {
-            "rut": "123456789",
+            "rut": "12.345.678-5",
             "name": "Juan Actualizado",
             "lastname": "Pérez Actualizado",
             "email": "juan.actualizado@example.com",
@@ -107,12 +107,12 @@ class CustomerViewSetTest(APITestCase):
         """Prueba que se puedan filtrar clientes por RUT"""
         response = self.client.get(
             self.list_url,
-            {'rut': '123456789'},
+            {'rut': '12.345.678-5'},
             **self.auth_headers
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['rut'], "123456789")
+        self.assertEqual(response.data['results'][0]['rut'], "123456785")
 
     def test_filter_customers_by_name(self):
         """Prueba que se puedan filtrar clientes por nombre"""
@@ -124,3 +124,33 @@ class CustomerViewSetTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], "Juan")
+
+    def test_create_customer_rejects_invalid_or_duplicated_rut(self):
+        """Prueba que se rechace un RUT con dígito verificador inválido o ya registrado con otro formato"""
+        data = {
+            "name": "Pedro",
+            "lastname": "Gómez",
+            "email": "pedro.gomez@example.com",
+            "phone": "+56987654321"
+        }
+        for rut in ("12.345.678-9", "12345678-5"):
+            response = self.client.post(self.list_url, data={**data, "rut": rut}, format='json', **self.auth_headers)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('rut', response.data)
+        self.assertEqual(Customer.objects.count(), 1)
+
+    def test_resolve_ruts_in_one_query(self):
+        """Prueba que se resuelvan RUT en lote, en el orden recibido, con una sola consulta de clientes"""
+        url = reverse('customers-resolve-ruts')
+        ruts = ["98765432-5", "12.345.678-5", "12345678-9", "123456785"]
+        # Una consulta para autenticar al usuario y otra para los clientes
+        with self.assertNumQueries(2):
+            response = self.client.post(url, {"ruts": ruts}, format='json', **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['found'], 2)
+        results = response.data['results']
+        self.assertEqual([result['rut'] for result in results], ruts)
+        self.assertIsNone(results[0]['customer'])
+        self.assertEqual(results[1]['customer']['id'], str(self.customer.id))
+        self.assertFalse(results[2]['valid'])
+        self.assertEqual(results[3]['normalized'], "123456785")
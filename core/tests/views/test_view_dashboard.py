@@ -0,0 +1,60 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.urls import reverse
+from core.models.models import Project, Unit, Customer
+
+
+class ProjectDashboardTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Under Construction"
+        )
+        self.customer = Customer.objects.create(rut="123456785", name="Juan", lastname="Pérez", email="juan@example.com")
+        for index in range(12):
+            unit_status = ("Available", "Reserved", "Sold")[index % 3]
+            Unit.objects.create(
+                project=self.project,
+                customer=self.customer if unit_status != "Available" else None,
+                unit_number=str(100 + index),
+                unit_type="Apartment",
+                square_meters=50,
+                price=100000000,
+                reservation_deposit=5000000 if unit_status != "Available" else 0,
+                unit_status=unit_status
+            )
+        self.url = reverse('projects-dashboard', args=[self.project.id])
+
+    def test_dashboard_in_fixed_queries(self):
+        """Prueba que el dashboard retorne proyecto, agregados y primera página de unidades con un número fijo de consultas"""
+        # Autenticación, proyecto, unidades con cliente y agregados
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, {'page_size': 5}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['project']['name'], "Proyecto Prueba")
+
+        inventory = response.data['inventory']
+        self.assertEqual(inventory['units'], 12)
+        self.assertEqual(inventory['total_price'], 1200000000)
+        self.assertEqual(inventory['total_deposits'], 40000000)
+        self.assertEqual(inventory['by_status']['Sold'], {'units': 4, 'total_price': 400000000})
+
+        units = response.data['units']
+        self.assertEqual(units['count'], 12)
+        self.assertEqual(len(units['results']), 5)
+        self.assertIn('page=2', units['next'])
+        embedded = [unit['customer'] for unit in units['results'] if unit['customer']]
+        self.assertTrue(embedded)
+        self.assertEqual(embedded[0]['rut'], "123456785")
+
+    def test_dashboard_not_found(self):
+        """Prueba que el dashboard de un proyecto inexistente retorne 404"""
+        for pk in ('00000000-0000-0000-0000-000000000000', 'no-es-un-uuid'):
+            response = self.client.get(reverse('projects-dashboard', args=[pk]), **self.auth_headers)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
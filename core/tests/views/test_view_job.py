@@ -0,0 +1,110 @@
+from io import StringIO
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from core.models.models import Job, Project, Unit
+from core.services.job_service import JobService
+import json
+
+
+class JobViewSetTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+
+    def _run_workers(self):
+        call_command('run_workers', processes=1, burst=True, stdout=StringIO())
+
+    def test_async_bulk_create_units(self):
+        """Prueba que la creación masiva con async=true se encole y el worker la procese"""
+        data = [
+            {"unit_number": str(i), "unit_type": "Apartment", "square_meters": 50, "price": 1000, "project": str(self.project.id)}
+            for i in range(3)
+        ]
+        response = self.client.post(
+            reverse('units-list') + '?async=true',
+            data=json.dumps(data),
+            content_type='application/json',
+            **self.auth_headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'Queued')
+        self.assertEqual(Unit.objects.count(), 0)
+
+        self._run_workers()
+
+        job_response = self.client.get(response['Location'], **self.auth_headers)
+        self.assertEqual(job_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(job_response.data['status'], 'Succeeded')
+        self.assertEqual(job_response.data['progress'], 100)
+        self.assertEqual(job_response.data['result']['created'], 3)
+        self.assertEqual(Unit.objects.count(), 3)
+
+    def test_async_bulk_create_reports_validation_errors(self):
+        """Prueba que los errores de validación queden en el resultado del job"""
+        data = [{"unit_number": "1", "unit_type": "Castle", "square_meters": 50, "project": str(self.project.id)}]
+        response = self.client.post(
+            reverse('units-list') + '?async=true',
+            data=json.dumps(data),
+            content_type='application/json',
+            **self.auth_headers
+        )
+        self._run_workers()
+        job = Job.objects.get(id=response.data['id'])
+        self.assertEqual(job.status, 'Failed')
+        self.assertIn('unit_type', job.result['errors'][0])
+
+    def test_async_delete_project(self):
+        """Prueba que el borrado de un proyecto con async=true se procese en segundo plano"""
+        response = self.client.delete(
+            reverse('projects-detail', args=[self.project.id]) + '?async=true', **self.auth_headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(Project.objects.filter(id=self.project.id).exists())
+        self._run_workers()
+        self.assertFalse(Project.objects.filter(id=self.project.id).exists())
+
+    @override_settings(JOBS_CHUNK_SIZE=2)
+    def test_bulk_jobs_report_progress_per_chunk(self):
+        """Prueba que los jobs masivos informen su avance al confirmar cada tramo"""
+        data = [
+            {"unit_number": str(i), "unit_type": "Apartment", "square_meters": 50, "price": 1000, "project": str(self.project.id)}
+            for i in range(5)
+        ]
+        JobService.submit('units.create_multiple', {'units': data})
+        with mock.patch.object(JobService, 'set_progress', wraps=JobService.set_progress) as set_progress:
+            self._run_workers()
+            self.assertEqual([call.args[1] for call in set_progress.call_args_list], [40, 80, 100])
+            self.assertEqual(Unit.objects.count(), 5)
+
+            set_progress.reset_mock()
+            JobService.submit('projects.delete', {'project_id': str(self.project.id)})
+            self._run_workers()
+            self.assertEqual([call.args[1] for call in set_progress.call_args_list], [40, 80, 100])
+        self.assertFalse(Unit.objects.exists())
+        self.assertFalse(Project.objects.exists())
+
+    def test_job_is_private_to_its_creator(self):
+        """Prueba que un usuario no pueda ver los jobs de otro"""
+        other = User.objects.create_user(username='other', password='testpassword')
+        job = JobService.submit('projects.delete', {'project_id': str(self.project.id)}, other)
+        response = self.client.get(reverse('jobs-detail', args=[job.id]), **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_claim_next_does_not_return_claimed_job_twice(self):
+        """Prueba que un job reclamado por un worker no pueda reclamarlo otro"""
+        JobService.submit('projects.delete', {'project_id': str(self.project.id)})
+        self.assertIsNotNone(JobService.claim_next('worker-a'))
+        self.assertIsNone(JobService.claim_next('worker-b'))
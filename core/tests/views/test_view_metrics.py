@@ -0,0 +1,69 @@
+import threading
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.db import connection
+from django.urls import reverse
+from core.models.models import Project
+
+
+class MetricsViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+
+    def test_metrics_exposes_latency_by_viewset_and_action(self):
+        """Prueba que /metrics exponga la latencia etiquetada por viewset y acción"""
+        self.client.get(reverse('units-list'), **self.auth_headers)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn('http_request_duration_seconds_bucket{action="list",le="0.005",method="GET",view="UnitViewSet"}', body)
+        self.assertIn('db_queries_per_request_count{action="list",view="UnitViewSet"}', body)
+        self.assertIn('http_response_size_bytes_count{action="list",view="UnitViewSet"}', body)
+
+    def test_metrics_counts_errors_by_status(self):
+        """Prueba que las respuestas de error se cuenten por código de estado"""
+        self.client.get(reverse('projects-detail', args=['00000000-0000-0000-0000-000000000000']), **self.auth_headers)
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('http_requests_total{action="retrieve",method="GET",status="404",view="ProjectViewSet"}', body)
+
+    def test_metrics_exposes_time_to_first_request(self):
+        """Prueba que se exponga el tiempo desde el inicio del proceso hasta la primera respuesta"""
+        body = self.client.get(reverse('metrics')).content.decode()
+        value = next(line for line in body.splitlines() if line.startswith('process_first_request_seconds '))
+        self.assertGreater(float(value.split()[1]), 0)
+
+    def _sample(self, body, name):
+        return float(next(line for line in body.splitlines() if line.startswith(name + ' ')).split()[1])
+
+    def test_metrics_count_connections_of_every_thread(self):
+        """Prueba que las conexiones abiertas se cuenten en todos los hilos y las en uso solo durante la solicitud"""
+        opened, release = threading.Event(), threading.Event()
+
+        def worker():
+            # Un hilo del worker gthread que atendió una solicitud y dejó su conexión abierta
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            opened.set()
+            release.wait(5)
+            connection.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        opened.wait(5)
+
+        self.client.get(reverse('units-list'), **self.auth_headers)
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertGreaterEqual(self._sample(body, 'db_connections_open{alias="default"}'), 2)
+        self.assertEqual(self._sample(body, 'db_connections_in_use{alias="default"}'), 0)
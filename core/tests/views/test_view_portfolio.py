@@ -0,0 +1,74 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.urls import reverse
+from core.models.models import Project, Unit, Customer
+from core.utils.rut import compute_check_digit
+
+
+class CustomerPortfolioTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.projects = [
+            Project.objects.create(name=f"Proyecto {index}", address="Av. Ejemplo 123", started_at="2025-01-01", status="Off Plan")
+            for index in range(2)
+        ]
+        self.customer = self._customer(12345678)
+        self._unit(self.projects[0], "101", "Reserved", self.customer, 100000000, 5000000)
+        self._unit(self.projects[1], "201", "Sold", self.customer, 200000000, 10000000)
+        self._unit(self.projects[1], "202", "Available", None, 300000000, 0)
+
+    def _customer(self, body):
+        return Customer.objects.create(
+            rut=f"{body}{compute_check_digit(body)}",
+            name="Juan",
+            lastname="Pérez",
+            email=f"juan{body}@example.com"
+        )
+
+    def _unit(self, project, number, unit_status, customer, price, deposit):
+        return Unit.objects.create(
+            project=project,
+            customer=customer,
+            unit_number=number,
+            unit_type="Apartment",
+            square_meters=50,
+            price=price,
+            reservation_deposit=deposit,
+            unit_status=unit_status
+        )
+
+    def test_customer_portfolio(self):
+        """Prueba que la cartera retorne las unidades comprometidas del cliente con su proyecto y los totales"""
+        response = self.client.get(reverse('customers-portfolio', args=[self.customer.id]), **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['reserved_units'], 1)
+        self.assertEqual(response.data['sold_units'], 1)
+        self.assertEqual(response.data['committed_price'], 300000000)
+        self.assertEqual(response.data['total_deposits'], 15000000)
+        self.assertEqual({unit['project']['name'] for unit in response.data['units']}, {"Proyecto 0", "Proyecto 1"})
+
+    def test_portfolios_page_in_constant_queries(self):
+        """Prueba que una página de carteras use las mismas consultas sin importar la cantidad de clientes"""
+        for index in range(10):
+            customer = self._customer(20000000 + index)
+            self._unit(self.projects[index % 2], str(300 + index), "Sold", customer, 100000000, 0)
+        # Autenticación, conteo, clientes con totales y unidades con proyecto
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('customers-portfolios'), {'page_size': 50}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 11)
+        portfolios = {portfolio['rut']: portfolio for portfolio in response.data['results']}
+        self.assertEqual(portfolios[self.customer.rut]['committed_price'], 300000000)
+
+    def test_portfolio_not_found(self):
+        """Prueba que la cartera de un cliente inexistente retorne 404"""
+        response = self.client.get(reverse('customers-portfolio', args=['00000000-0000-0000-0000-000000000000']), **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filter_units_by_customer(self):
+        """Prueba que se puedan filtrar las unidades por cliente"""
+        response = self.client.get(reverse('units-list'), {'customer': str(self.customer.id)}, **self.auth_headers)
+        self.assertEqual(response.data['count'], 2)
@@ -0,0 +1,121 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.urls import reverse
+from core.models.models import Project, Unit
+from core.realtime.broadcaster import CLOSED, InProcessBroadcaster, PostgresBroadcaster, get_broadcaster, project_channel
+from core.services.unit_service import UnitService
+from unittest import mock
+import asyncio
+import json
+
+
+class UnitStatusStreamTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.token = token_response.data['access']
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.unit = Unit.objects.create(
+            unit_number="101",
+            unit_type="Apartment",
+            square_meters=50.5,
+            price=150000000,
+            unit_status="Available",
+            project=self.project
+        )
+        self.url = reverse('project-units-stream', args=[self.project.id])
+
+    def test_stream_is_not_served_over_wsgi(self):
+        """Prueba que bajo WSGI el stream responda 501 en vez de tomar un hilo del worker"""
+        response = self.client.get(self.url, {'token': self.token})
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    async def test_stream_requires_token(self):
+        """Prueba que el stream rechace conexiones sin token"""
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_stream_unknown_project(self):
+        """Prueba que el stream de un proyecto inexistente retorne 404"""
+        url = reverse('project-units-stream', args=['00000000-0000-0000-0000-000000000000'])
+        response = await self.async_client.get(url, {'token': self.token})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_stream_pushes_status_changes(self):
+        """Prueba que el stream entregue los cambios de estado publicados para el proyecto"""
+        response = await self.async_client.get(self.url, {'token': self.token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+        stream = response.streaming_content
+        first = await anext(stream)
+        self.assertIn(b'event: ready', first)
+
+        channel = project_channel(self.project.id)
+        self.assertEqual(get_broadcaster().subscriber_count(channel), 1)
+        get_broadcaster().publish(channel, {'unit': str(self.unit.id), 'unit_number': '101', 'status': 'Reserved', 'event': 'unit.status'})
+        event = (await asyncio.wait_for(anext(stream), timeout=5)).decode()
+        self.assertTrue(event.startswith('event: unit.status\n'))
+        self.assertEqual(json.loads(event.split('data: ', 1)[1])['status'], 'Reserved')
+
+    def test_update_unit_publishes_only_status_changes(self):
+        """Prueba que actualizar una unidad publique solo cuando cambia su estado, al confirmar la transacción"""
+        with mock.patch.object(get_broadcaster(), 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                UnitService.update_unit(self.unit, {'price': 160000000})
+            publish.assert_not_called()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                UnitService.update_unit(self.unit, {'unit_status': 'Reserved'})
+                publish.assert_not_called()
+            publish.assert_called_once()
+        channel, message = publish.call_args.args
+        self.assertEqual(channel, project_channel(self.project.id))
+        self.assertEqual(message['status'], 'Reserved')
+
+
+class InProcessBroadcasterTest(APITestCase):
+    async def test_publish_reaches_only_channel_subscribers(self):
+        """Prueba que un mensaje llegue solo a los suscriptores de su canal"""
+        broadcaster = InProcessBroadcaster()
+        first = broadcaster.subscribe('project:a')
+        second = broadcaster.subscribe('project:a')
+        other = broadcaster.subscribe('project:b')
+
+        self.assertEqual(broadcaster.publish('project:a', {'event': 'unit.status'}), 2)
+        self.assertEqual(await first.get(timeout=1), {'event': 'unit.status'})
+        self.assertEqual(await second.get(timeout=1), {'event': 'unit.status'})
+        with self.assertRaises(asyncio.TimeoutError):
+            await other.get(timeout=0.05)
+
+        broadcaster.unsubscribe(first)
+        self.assertEqual(broadcaster.subscriber_count('project:a'), 1)
+
+    async def test_slow_subscriber_is_closed(self):
+        """Prueba que un suscriptor con la cola llena se cierre en vez de acumular mensajes"""
+        broadcaster = InProcessBroadcaster(queue_size=2)
+        subscription = broadcaster.subscribe('project:a')
+        for index in range(5):
+            broadcaster.publish('project:a', {'seq': index})
+        await asyncio.sleep(0)
+        self.assertTrue(subscription.closed)
+        self.assertIs(await subscription.get(timeout=1), CLOSED)
+
+
+class PostgresBroadcasterTest(APITestCase):
+    async def test_notification_reaches_local_subscribers(self):
+        """Prueba que una notificación de otro proceso se reparta a los suscriptores del canal"""
+        broadcaster = PostgresBroadcaster()
+        with mock.patch.object(broadcaster, '_listen'):
+            subscription = broadcaster.subscribe('project:a')
+        payload = json.dumps({'channel': 'project:a', 'message': {'event': 'unit.status'}})
+        self.assertEqual(broadcaster.dispatch(payload), 1)
+        self.assertEqual(await subscription.get(timeout=1), {'event': 'unit.status'})
+        broadcaster.unsubscribe(subscription)
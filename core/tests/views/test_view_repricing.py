@@ -0,0 +1,125 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.urls import reverse
+from core.models.models import Change, Project, Repricing, Unit
+from core.services.change_service import ChangeService
+
+
+class UnitRepricingTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.other_project = Project.objects.create(
+            name="Otro Proyecto",
+            address="Av. Ejemplo 456",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.apartment = self._unit(self.project, "101", "Apartment", 50, 100000000, "Available")
+        self.sold_apartment = self._unit(self.project, "102", "Apartment", 60, 120000000, "Sold")
+        self.office = self._unit(self.project, "103", "Office", 80, 200000000, "Available")
+        self.other_apartment = self._unit(self.other_project, "101", "Apartment", 50, 100000000, "Available")
+        self.url = reverse('units-reprice')
+
+    def _unit(self, project, number, unit_type, square_meters, price, unit_status):
+        return Unit.objects.create(
+            project=project,
+            unit_number=number,
+            unit_type=unit_type,
+            square_meters=square_meters,
+            price=price,
+            unit_status=unit_status
+        )
+
+    def _prices(self):
+        return {unit.id: unit.price for unit in Unit.objects.all()}
+
+    def test_dry_run_returns_totals_without_changes(self):
+        """Prueba que el dry run retorne los totales antes y después sin modificar precios"""
+        before = self._prices()
+        response = self.client.post(self.url, {
+            "project": str(self.project.id), "type": "Apartment", "mode": "percent", "percent": 3, "dry_run": True
+        }, format='json', **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['units'], 2)
+        self.assertEqual(response.data['total_before'], 220000000)
+        self.assertEqual(response.data['total_after'], 226600000)
+        self.assertEqual(response.data['difference'], 6600000)
+        self.assertIsNone(response.data['repricing'])
+        self.assertEqual(self._prices(), before)
+        self.assertFalse(Repricing.objects.exists())
+
+    def test_percent_updates_only_filtered_units(self):
+        """Prueba que el ajuste porcentual afecte solo a las unidades filtradas y quede auditado"""
+        response = self.client.post(self.url, {
+            "project": str(self.project.id), "status": "Available", "type": "Apartment", "mode": "percent", "percent": 3
+        }, format='json', **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['units'], 1)
+
+        prices = self._prices()
+        self.assertEqual(prices[self.apartment.id], 103000000)
+        self.assertEqual(prices[self.sold_apartment.id], 120000000)
+        self.assertEqual(prices[self.office.id], 200000000)
+        self.assertEqual(prices[self.other_apartment.id], 100000000)
+        # El UPDATE masivo también invalida los ETag de las unidades modificadas
+        versions = dict(Unit.objects.values_list('id', 'version'))
+        self.assertEqual(versions[self.apartment.id], 2)
+        self.assertEqual(versions[self.office.id], 1)
+
+        repricing = Repricing.objects.get(id=response.data['repricing'])
+        self.assertEqual(repricing.created_by, self.user)
+        self.assertEqual(repricing.units_affected, 1)
+        self.assertEqual(repricing.total_after - repricing.total_before, 3000000)
+
+    def test_per_m2_sets_price_by_unit_type(self):
+        """Prueba que el modo per_m2 fije precio = m² × tarifa solo para los tipos indicados"""
+        response = self.client.post(self.url, {
+            "project": str(self.project.id), "mode": "per_m2", "rates": {"Office": 3000000}
+        }, format='json', **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['units'], 1)
+        prices = self._prices()
+        self.assertEqual(prices[self.office.id], 240000000)
+        self.assertEqual(prices[self.apartment.id], 100000000)
+
+    def test_repricing_is_published_in_change_feed(self):
+        """Prueba que las unidades repreciadas aparezcan en el feed de cambios con su precio nuevo"""
+        cursor = ChangeService.get_latest_position()
+        self.client.post(self.url, {
+            "project": str(self.project.id), "mode": "percent", "percent": -10
+        }, format='json', **self.auth_headers)
+        changes, _, _ = ChangeService.get_changes(cursor, 100)
+        self.assertEqual(len(changes), 3)
+        payloads = {change.entity_id: change.payload for change in changes}
+        self.assertEqual(payloads[self.apartment.id]['price'], 90000000)
+        self.assertEqual(Change.objects.filter(position__gt=cursor, payload__isnull=True).count(), 3)
+
+    def test_invalid_rule(self):
+        """Prueba que se rechacen reglas incompletas, tipos inválidos y precios fuera de rango"""
+        for data in (
+            {"mode": "percent"},
+            {"mode": "per_m2", "rates": {"Castle": 1000}},
+            {"mode": "percent", "percent": -150},
+            {"mode": "percent", "percent": 5000},
+        ):
+            response = self.client.post(self.url, data, format='json', **self.auth_headers)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, data)
+        self.assertEqual(self._prices()[self.office.id], 200000000)
+
+    def test_repricing_updates_price_per_m2(self):
+        """Prueba que el repricing recalcule el precio por m² en el mismo UPDATE"""
+        self.client.post(self.url, {
+            "project": str(self.project.id), "type": "Office", "mode": "percent", "percent": 10
+        }, format='json', **self.auth_headers)
+        self.office.refresh_from_db()
+        self.assertEqual(self.office.price, 220000000)
+        self.assertEqual(self.office.price_per_m2, Unit.compute_price_per_m2(220000000, 80))
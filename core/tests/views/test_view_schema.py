@@ -0,0 +1,57 @@
+import gzip
+import warnings
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework.test import APITestCase
+from core.views.schema import CachedSpectacularAPIView
+
+
+class CachedSchemaTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        CachedSpectacularAPIView.clear()
+        self.url = reverse('schema')
+        patcher = mock.patch.object(SchemaGenerator, 'get_schema', autospec=True, side_effect=SchemaGenerator.get_schema)
+        self.get_schema = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(CachedSpectacularAPIView.clear)
+
+    def test_schema_is_generated_once(self):
+        """Prueba que el esquema se genere una sola vez y luego se sirva desde memoria"""
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertIn(b'/api/units/', first.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(first['Cache-Control'], 'no-cache')
+        self.assertEqual(self.get_schema.call_count, 1)
+
+    def test_formats_are_cached_separately(self):
+        """Prueba que YAML y JSON tengan su propia entrada y su propio ETag"""
+        yaml_response = self.client.get(self.url)
+        json_response = self.client.get(self.url, HTTP_ACCEPT='application/vnd.oai.openapi+json')
+        self.assertTrue(json_response['Content-Type'].startswith('application/vnd.oai.openapi+json'))
+        self.assertEqual(json_response.content[:1], b'{')
+        self.assertNotEqual(yaml_response['ETag'], json_response['ETag'])
+        self.assertEqual(self.get_schema.call_count, 2)
+
+    def test_if_none_match_returns_not_modified(self):
+        """Prueba que el ETag, fuerte o débil tras comprimir, permita responder 304 sin cuerpo"""
+        # El Content-Type lleva '; charset': la llave de la caché de compresión debe servir con memcached
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'openapi', gzip.decompress(response.content))
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+        for etag in (response['ETag'], response['ETag'].removeprefix('W/')):
+            revalidated = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(revalidated.status_code, 304)
+            self.assertEqual(revalidated.content, b'')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"otro"').status_code, 200)
@@ -0,0 +1,136 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.views import throttling
+from core.views.throttling import MICROSECONDS, TokenBucketThrottle, UserTokenBucketThrottle, reset_local_buckets
+
+
+class ThrottlingTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reset_local_buckets()
+        self.addCleanup(reset_local_buckets)
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.now = 1_000_000.0
+        timer = mock.patch.object(TokenBucketThrottle, 'timer', side_effect=lambda: self.now)
+        timer.start()
+        self.addCleanup(timer.stop)
+
+    def _rates(self, **rates):
+        return mock.patch.object(TokenBucketThrottle, 'THROTTLE_RATES', {'user': '5/min', **rates})
+
+    def test_bucket_allows_burst_then_throttles(self):
+        """Prueba que se permita una ráfaga del tamaño del bucket y luego se responda 429"""
+        with self._rates():
+            remaining = []
+            for _ in range(5):
+                response = self.client.get(reverse('projects-list'), **self.auth_headers)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                remaining.append(response['RateLimit-Remaining'])
+            response = self.client.get(reverse('projects-list'), **self.auth_headers)
+        self.assertEqual(remaining, ['4', '3', '2', '1', '0'])
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['RateLimit-Limit'], '5')
+        self.assertEqual(response['RateLimit-Remaining'], '0')
+        # Un token cada 12 segundos
+        self.assertEqual(response['Retry-After'], '12')
+        self.assertEqual(response['RateLimit-Reset'], '60')
+
+    def test_bucket_refills_over_time(self):
+        """Prueba que el bucket recupere un token por intervalo y nunca más que su capacidad"""
+        with self._rates():
+            for _ in range(5):
+                self.client.get(reverse('projects-list'), **self.auth_headers)
+            self.now += 12
+            self.assertEqual(self.client.get(reverse('projects-list'), **self.auth_headers).status_code, 200)
+            self.assertEqual(self.client.get(reverse('projects-list'), **self.auth_headers).status_code, 429)
+            self.now += 3600
+            response = self.client.get(reverse('projects-list'), **self.auth_headers)
+        self.assertEqual(response['RateLimit-Remaining'], '4')
+
+    def test_blocked_client_is_rejected_without_cache_round_trips(self):
+        """Prueba que con el bucket vacío el proceso rechace sin consultar la caché hasta el próximo token"""
+        with self._rates():
+            for _ in range(5):
+                self.client.get(reverse('projects-list'), **self.auth_headers)
+            self.client.get(reverse('projects-list'), **self.auth_headers)
+            with mock.patch.object(TokenBucketThrottle.cache, 'incr', wraps=cache.incr) as incr:
+                self.now += 6
+                response = self.client.get(reverse('projects-list'), **self.auth_headers)
+                self.assertEqual(response.status_code, 429)
+                self.assertEqual(response['Retry-After'], '6')
+                self.assertEqual(incr.call_count, 0)
+
+    @override_settings(THROTTLE_LEASE_SIZE=10)
+    def test_tokens_are_leased_in_batches(self):
+        """Prueba que el proceso reserve tokens de a varios y no vaya a la caché en cada request"""
+        with self._rates(user='1000/min'):
+            self.client.get(reverse('projects-list'), **self.auth_headers)
+            with mock.patch.object(TokenBucketThrottle.cache, 'incr', wraps=cache.incr) as incr:
+                for _ in range(9):
+                    response = self.client.get(reverse('projects-list'), **self.auth_headers)
+                self.assertEqual(incr.call_count, 0)
+                self.assertEqual(response['RateLimit-Remaining'], '990')
+                response = self.client.get(reverse('projects-list'), **self.auth_headers)
+                self.assertEqual(incr.call_count, 1)
+        self.assertEqual(response['RateLimit-Remaining'], '989')
+
+    def test_endpoint_bucket_is_separate(self):
+        """Prueba que un endpoint con tasa propia se limite sin afectar al resto de la API"""
+        with self._rates(user='100/min', **{'units.list': '2/min'}):
+            statuses = [self.client.get(reverse('units-list'), **self.auth_headers).status_code for _ in range(3)]
+            projects = self.client.get(reverse('projects-list'), **self.auth_headers)
+        self.assertEqual(statuses, [200, 200, 429])
+        self.assertEqual(projects.status_code, status.HTTP_200_OK)
+        self.assertEqual(projects['RateLimit-Limit'], '100')
+
+    def test_anonymous_clients_are_limited_by_ip(self):
+        """Prueba que los requests sin autenticar, como los intentos de login, compartan el bucket de su IP"""
+        credentials = {'username': 'testuser', 'password': 'incorrecta'}
+        with self._rates(user='2/min'):
+            statuses = [
+                self.client.post(reverse('token_obtain_pair'), credentials, REMOTE_ADDR='10.0.0.1').status_code
+                for _ in range(3)
+            ]
+            other = self.client.post(reverse('token_obtain_pair'), credentials, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(statuses, [401, 401, 429])
+        self.assertEqual(other.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_concurrent_acquires_on_full_bucket_clamp_once(self):
+        """Prueba que dos procesos que ven el mismo bucket vencido no corran dos veces el instante guardado"""
+        with self._rates():
+            first, second = UserTokenBucketThrottle(), UserTokenBucketThrottle()
+        for throttle in (first, second):
+            throttle.key, throttle.now = f'throttle:user:{self.user.pk}', self.now
+        now = int(self.now * MICROSECONDS)
+        cache.set(first.key, now - 3600 * MICROSECONDS)
+
+        clamp, buckets = first._clamp, []
+
+        def interleave(*args):
+            # El segundo proceso reserva y corrige entre la reserva del primero y su corrección
+            buckets.append(second._acquire())
+            return clamp(*args)
+
+        with mock.patch.object(first, '_clamp', side_effect=interleave):
+            buckets.append(first._acquire())
+        self.assertEqual([bucket.tokens for bucket in buckets], [1, 1])
+        # Dos tokens de 12 s como máximo: el bucket sigue con tokens disponibles
+        self.assertLessEqual(cache.get(first.key), now + 2 * 12 * MICROSECONDS)
+        with self._rates():
+            response = self.client.get(reverse('projects-list'), **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_local_buckets_evict_oldest(self):
+        """Prueba que al llegar al límite de buckets locales se descarten los más antiguos y no todos"""
+        with self._rates(), mock.patch.object(throttling, 'MAX_LOCAL_BUCKETS', 2):
+            for address in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+                self.client.post(reverse('token_obtain_pair'), {}, REMOTE_ADDR=address)
+        self.assertEqual(list(throttling._buckets), ['throttle:user:10.0.0.2', 'throttle:user:10.0.0.3'])
@@ -167,3 +167,29 @@ class UnitViewSetTest(APITestCase):
         response = self.client.get(self.list_url, {'ordering': '-price'}, **self.auth_headers)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['results'][0]['price'], 300000000)
+
+    def test_filter_and_order_units_by_price_per_m2(self):
+        """Prueba que se puedan filtrar por rango y ordenar las unidades por precio por m²"""
+        # 150000000 / 50.5 ≈ 2970297 por m²; 200000000 / 50 = 4000000 por m²
+        Unit.objects.create(
+            unit_number="2",
+            unit_type="Apartment",
+            square_meters=50,
+            price=200000000,
+            unit_status="Available",
+            project=self.project
+        )
+        response = self.client.get(
+            self.list_url,
+            {'project': str(self.project.id), 'price_per_m2_max': 3000000},
+            **self.auth_headers
+        )
+        self.assertEqual([unit['unit_number'] for unit in response.data['results']], ["1"])
+
+        response = self.client.get(
+            self.list_url,
+            {'square_meters_min': 50, 'price_min': 100000000, 'ordering': '-price_per_m2'},
+            **self.auth_headers
+        )
+        self.assertEqual([unit['unit_number'] for unit in response.data['results']], ["2", "1"])
+        self.assertEqual(response.data['results'][0]['price_per_m2'], "4000000.00")
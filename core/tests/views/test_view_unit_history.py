@@ -0,0 +1,134 @@
+import json
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.models.models import Customer, Project, Unit, UnitHistory
+from core.services.unit_history_service import UnitHistoryService
+from core.services.unit_service import UnitService
+
+
+def moment(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class UnitHistoryTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.customer = Customer.objects.create(
+            rut="123456785",
+            name="Juan",
+            lastname="Pérez",
+            email="juan.perez@example.com"
+        )
+
+    def _create_unit(self, number):
+        response = self.client.post(reverse('units-list'), {
+            "project": str(self.project.id),
+            "unit_number": number,
+            "unit_type": "Apartment",
+            "square_meters": "50.00",
+            "price": 100000000,
+            "unit_status": "Available"
+        }, format='json', **self.auth_headers)
+        return Unit.objects.get(id=response.data['id'])
+
+    def _history(self, unit, event, changed_at, unit_status="Available", number="101"):
+        return UnitHistory.objects.create(
+            unit=unit, project=self.project.id, unit_number=number, event=event, unit_status=unit_status,
+            price=100000000, reservation_deposit=0, changed_at=changed_at
+        )
+
+    def test_unit_changes_are_recorded(self):
+        """Prueba que crear, reservar y cambiar el precio de una unidad quede en su historia"""
+        unit = self._create_unit("101")
+        detail = reverse('units-detail', args=[unit.id])
+        self.client.patch(detail, data=json.dumps({"unit_status": "Reserved", "customer": str(self.customer.id)}),
+                          content_type='application/json', **self.auth_headers)
+        self.client.patch(detail, data=json.dumps({"unit_number": "101A"}),
+                          content_type='application/json', **self.auth_headers)
+        self.client.patch(detail, data=json.dumps({"price": 120000000}),
+                          content_type='application/json', **self.auth_headers)
+
+        response = self.client.get(reverse('units-history', args=[unit.id]), **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # El cambio de número no es un cambio registrado
+        self.assertEqual([row['event'] for row in response.data], ['created', 'changed', 'changed'])
+        self.assertEqual(response.data[1]['unit_status'], 'Reserved')
+        self.assertEqual(str(response.data[1]['customer']), str(self.customer.id))
+        self.assertEqual(response.data[2]['price'], 120000000)
+
+    def test_history_survives_deletion(self):
+        """Prueba que la historia siga disponible después de eliminar la unidad"""
+        unit = self._create_unit("101")
+        self.client.delete(reverse('units-detail', args=[unit.id]), **self.auth_headers)
+        response = self.client.get(reverse('units-history', args=[unit.id]), **self.auth_headers)
+        self.assertEqual([row['event'] for row in response.data], ['created', 'deleted'])
+
+    def test_bulk_status_change_records_new_state(self):
+        """Prueba que un cambio masivo registre la foto nueva de cada unidad en un solo INSERT"""
+        units = [self._create_unit(str(100 + index)) for index in range(5)]
+        Unit.objects.update(customer=self.customer)
+        with self.assertNumQueries(8):
+            UnitService.set_status(Unit.objects.all(), 'Sold')
+        changed = UnitHistory.objects.filter(event='changed')
+        self.assertEqual(changed.count(), 5)
+        self.assertEqual(set(changed.values_list('unit_status', flat=True)), {'Sold'})
+        self.assertEqual(set(changed.values_list('unit', flat=True)), {unit.id for unit in units})
+
+    def test_inventory_as_of(self):
+        """Prueba que el inventario a una fecha use la última foto de cada unidad hasta ese momento"""
+        first, second, third = Unit(), Unit(), Unit()
+        self._history(first.id, 'created', moment(2025, 1, 1), number="101")
+        self._history(first.id, 'changed', moment(2025, 2, 1), unit_status="Reserved", number="101")
+        self._history(second.id, 'created', moment(2025, 1, 10), number="102")
+        self._history(second.id, 'deleted', moment(2025, 1, 20), number="102")
+        self._history(third.id, 'created', moment(2025, 3, 1), number="103")
+        url = reverse('projects-inventory', args=[self.project.id])
+
+        response = self.client.get(url, {'as_of': '2025-01-15'}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([unit['unit_number'] for unit in response.data['units']], ["101", "102"])
+        self.assertEqual(response.data['counts']['Available'], 2)
+
+        response = self.client.get(url, {'as_of': '2025-02-15T12:00:00'}, **self.auth_headers)
+        self.assertEqual([(unit['unit_number'], unit['unit_status']) for unit in response.data['units']], [("101", "Reserved")])
+
+    def test_inventory_of_moved_unit(self):
+        """Prueba que una unidad cambiada de proyecto salga del inventario del anterior y entre al nuevo"""
+        other = Project.objects.create(
+            name="Proyecto Destino",
+            address="Av. Ejemplo 456",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        unit = self._create_unit("101")
+        before = timezone.now()
+        self.client.patch(reverse('units-detail', args=[unit.id]), data=json.dumps({"project": str(other.id)}),
+                          content_type='application/json', **self.auth_headers)
+
+        response = self.client.get(reverse('projects-inventory', args=[self.project.id]), **self.auth_headers)
+        self.assertEqual(response.data['units'], [])
+        response = self.client.get(reverse('projects-inventory', args=[other.id]), **self.auth_headers)
+        self.assertEqual([unit['unit_number'] for unit in response.data['units']], ["101"])
+        # Antes del cambio seguía en el proyecto original
+        self.assertEqual(len(UnitHistoryService.get_inventory_as_of(self.project.id, before)), 1)
+        self.assertEqual(UnitHistoryService.get_inventory_as_of(other.id, before), [])
+
+    def test_inventory_invalid_date_and_missing_project(self):
+        """Prueba que una fecha inválida retorne 400 y un proyecto inexistente 404"""
+        response = self.client.get(reverse('projects-inventory', args=[self.project.id]), {'as_of': 'ayer'}, **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('projects-inventory', args=['00000000-0000-0000-0000-000000000000']), **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
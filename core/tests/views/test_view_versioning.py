@@ -0,0 +1,92 @@
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.models.models import Customer, Project, Unit
+from core.services.unit_service import UnitService
+from core.services.version_service import PreconditionFailed
+
+
+class OptimisticConcurrencyTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        token_response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        self.auth_headers = {'HTTP_AUTHORIZATION': f"Bearer {token_response.data['access']}"}
+        self.project = Project.objects.create(
+            name="Proyecto Prueba",
+            address="Av. Ejemplo 123",
+            started_at="2025-01-01",
+            status="Off Plan"
+        )
+        self.unit = Unit.objects.create(
+            project=self.project,
+            unit_number="101",
+            unit_type="Apartment",
+            square_meters=50,
+            price=100000000
+        )
+        self.customer = Customer.objects.create(
+            rut="123456785",
+            name="Juan",
+            lastname="Pérez",
+            email="juan.perez@example.com"
+        )
+
+    def test_retrieve_returns_version_as_etag(self):
+        """Prueba que el detalle entregue la versión en el cuerpo y como ETag"""
+        response = self.client.get(reverse('projects-detail', args=[self.project.id]), **self.auth_headers)
+        self.assertEqual(response.data['version'], 1)
+        self.assertEqual(response['ETag'], '"1"')
+
+    def test_update_with_current_etag_bumps_version(self):
+        """Prueba que un PATCH con If-Match vigente se aplique e incremente la versión"""
+        response = self.client.patch(
+            reverse('projects-detail', args=[self.project.id]), {"name": "Nuevo nombre"},
+            HTTP_IF_MATCH='"1"', **self.auth_headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.name, self.project.version), ("Nuevo nombre", 2))
+
+    def test_stale_etag_returns_412(self):
+        """Prueba que un If-Match desactualizado responda 412 sin escribir en unidades, proyectos y clientes"""
+        cases = [
+            (reverse('units-detail', args=[self.unit.id]), {"price": 1}, Unit, self.unit.id),
+            (reverse('projects-detail', args=[self.project.id]), {"name": "Otro"}, Project, self.project.id),
+            (reverse('customers-detail', args=[self.customer.id]), {"name": "Otro"}, Customer, self.customer.id),
+        ]
+        for url, data, model, pk in cases:
+            model.objects.filter(pk=pk).update(version=F('version') + 1)
+            response = self.client.patch(url, data, HTTP_IF_MATCH='"1"', **self.auth_headers)
+            self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+            self.assertEqual(model.objects.get(pk=pk).version, 2)
+
+    def test_customer_update_with_etag(self):
+        """Prueba que un PUT de cliente con If-Match vigente se aplique"""
+        response = self.client.put(reverse('customers-detail', args=[self.customer.id]), {
+            "rut": "12.345.678-5", "name": "Juan", "lastname": "Soto", "email": "juan.perez@example.com"
+        }, HTTP_IF_MATCH='"1"', **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['version'], 2)
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.lastname, "Soto")
+
+    def test_concurrent_write_without_if_match_is_rejected(self):
+        """Prueba que una escritura concurrente entre la lectura y el UPDATE no se sobrescriba"""
+        unit = Unit.objects.get(id=self.unit.id)
+        Unit.objects.filter(id=self.unit.id).update(price=200000000, version=F('version') + 1)
+        with self.assertRaises(PreconditionFailed):
+            UnitService.update_unit(unit, {"price": 150000000})
+        self.assertEqual(Unit.objects.get(id=self.unit.id).price, 200000000)
+
+    def test_update_recomputes_price_per_m2(self):
+        """Prueba que la escritura condicional mantenga price_per_m2 sincronizado"""
+        response = self.client.patch(
+            reverse('units-detail', args=[self.unit.id]), {"price": 150000000}, **self.auth_headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.unit.refresh_from_db()
+        self.assertEqual(self.unit.price_per_m2, 3000000)
+        self.assertEqual(self.unit.version, 2)
@@ -1,11 +1,18 @@
+from django.urls import path
 from rest_framework import routers
-from .views.views import ProjectViewSet, UnitViewSet, CustomerViewSet
+from .views.realtime import unit_status_stream
+from .views.views import ProjectViewSet, UnitViewSet, CustomerViewSet, JobViewSet, ChangeViewSet, AnalyticsViewSet
 
 router = routers.DefaultRouter()
 
 router.register('api/projects', ProjectViewSet, 'projects')
 router.register('api/units', UnitViewSet, 'units')
 router.register('api/customers', CustomerViewSet, 'customers')
+router.register('api/jobs', JobViewSet, 'jobs')
+router.register('api/changes', ChangeViewSet, 'changes')
+router.register('api/analytics', AnalyticsViewSet, 'analytics')
 
 
-urlpatterns = router.urls
\ No newline at end of file
+urlpatterns = [
+    path('api/projects/<uuid:project_id>/units/stream/', unit_status_stream, name='project-units-stream'),
+] + router.urls
\ No newline at end of file
@@ -0,0 +1,26 @@
+def compute_check_digit(body):
+    # Algoritmo módulo 11 del Servicio de Impuestos Internos
+    total = 0
+    factor = 2
+    for digit in reversed(str(body)):
+        total += int(digit) * factor
+        factor = 2 if factor == 7 else factor + 1
+    remainder = 11 - (total % 11)
+    if remainder == 11:
+        return '0'
+    if remainder == 10:
+        return 'K'
+    return str(remainder)
+
+
+def normalize_rut(value):
+    # Forma canónica: cuerpo + dígito verificador, sin puntos ni guion ("12.345.678-k" -> "12345678K")
+    return ''.join(str(value).split()).replace('.', '').replace('-', '').upper()
+
+
+def is_valid_rut(value):
+    rut = normalize_rut(value)
+    body, check_digit = rut[:-1], rut[-1:]
+    if not body.isdigit() or not 7 <= len(body) <= 8:
+        return False
+    return compute_check_digit(body) == check_digit
@@ -0,0 +1,21 @@
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+
+
+def delete_rows(queryset):
+    # DELETE set-based sin el Collector de Django: no carga las filas, no envía señales
+    # ni sigue cascadas. Quien lo usa limpia antes las tablas relacionadas.
+    model = queryset.model
+    qn = connections[queryset.db].ops.quote_name
+    try:
+        select_sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    sql = 'DELETE FROM {table} WHERE {pk} IN ({select})'.format(
+        table=qn(model._meta.db_table),
+        pk=qn(model._meta.pk.column),
+        select=select_sql,
+    )
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
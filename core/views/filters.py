@@ -1,5 +1,6 @@
 import django_filters
-from ..models.models import Project, Unit
+from ..models.models import Customer, Project, Unit
+from ..utils.rut import normalize_rut
 
 class ProjectFilter(django_filters.FilterSet):
     address = django_filters.CharFilter(field_name='address', lookup_expr='icontains')
@@ -15,8 +16,29 @@ class UnitFilter(django_filters.FilterSet):
     status = django_filters.CharFilter(field_name='unit_status', lookup_expr='iexact')
     type = django_filters.CharFilter(field_name='unit_type', lookup_expr='iexact')
     project = django_filters.UUIDFilter(field_name='project', lookup_expr='exact')
-    ordering = django_filters.OrderingFilter(fields=(('created_at', 'created_at'), ('price', 'price')))
+    customer = django_filters.UUIDFilter(field_name='customer', lookup_expr='exact')
+    price = django_filters.RangeFilter(field_name='price')
+    square_meters = django_filters.RangeFilter(field_name='square_meters')
+    price_per_m2 = django_filters.RangeFilter(field_name='price_per_m2')
+    ordering = django_filters.OrderingFilter(fields=(
+        ('created_at', 'created_at'),
+        ('price', 'price'),
+        ('square_meters', 'square_meters'),
+        ('price_per_m2', 'price_per_m2'),
+    ))
 
     class Meta:
         model = Unit
-        fields = ['unit_status', 'unit_type', 'project']
\ No newline at end of file
+        fields = ['unit_status', 'unit_type', 'project', 'customer']
+
+
+class CustomerFilter(django_filters.FilterSet):
+    rut = django_filters.CharFilter(method='filter_rut')
+
+    class Meta:
+        model = Customer
+        fields = ['rut', 'name', 'lastname', 'email', 'phone']
+
+    def filter_rut(self, queryset, name, value):
+        # Los RUT se guardan canónicos: se normaliza el valor buscado en vez de comparar sin formato
+        return queryset.filter(rut=normalize_rut(value))
@@ -0,0 +1,17 @@
+import os
+
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+
+from core import metrics
+
+
+def metrics_view(request):
+    metrics.observe_db_connections()
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # Modo multiproceso: se agregan los archivos de todos los workers
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
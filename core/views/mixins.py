@@ -0,0 +1,156 @@
+from django_filters import utils
+from drf_spectacular.utils import extend_schema
+from rest_framework import filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+
+from ..serializers.serializers import IdBatchSerializer, JobSerializer
+from ..services.archive_service import ArchiveService
+from .pagination import ColumnarPagination
+from .renderers import ColumnarJSONRenderer
+
+
+def query_flag(request, name):
+    return request.query_params.get(name, '').lower() in ('true', '1')
+
+
+class ArchiveListMixin:
+    # Permite leer también las tablas de archivo con `?include_archived=true`
+
+    def include_archived(self):
+        return query_flag(self.request, 'include_archived')
+
+    def list_with_archive(self, queryset, archived_queryset, serializer_class, archived_serializer_class):
+        queryset = self._filter_with_filterset(queryset)
+        archived_queryset = self._filter_with_filterset(archived_queryset)
+        combined = ArchiveService.union_with_archive(queryset, archived_queryset, ['id', *self.ordering_fields])
+        combined = filters.OrderingFilter().filter_queryset(self.request, combined, self)
+
+        page = self.paginate_queryset(combined)
+        rows = page if page is not None else list(combined)
+        objects = ArchiveService.load_page(rows, queryset.model, archived_queryset.model)
+        data = []
+        for obj in objects:
+            archived = isinstance(obj, archived_queryset.model)
+            item = (archived_serializer_class if archived else serializer_class)(obj).data
+            item['archived'] = archived
+            data.append(item)
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def _filter_with_filterset(self, queryset):
+        # El FilterSet se instancia directamente porque DjangoFilterBackend exige
+        # que el modelo del queryset coincida con el del FilterSet.
+        if self.filterset_class is None:
+            return queryset
+        filterset = self.filterset_class(self.request.query_params, queryset=queryset, request=self.request)
+        if not filterset.is_valid():
+            raise utils.translate_validation(filterset.errors)
+        return filterset.qs
+
+
+class AsyncJobMixin:
+    # Con `?async=true` la operación se encola como Job y se responde 202
+
+    def run_async(self):
+        return query_flag(self.request, 'async')
+
+    def job_accepted_response(self, job):
+        location = reverse('jobs-detail', args=[job.id], request=self.request)
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+
+
+class ColumnarListMixin:
+    # `?format=columnar` en list: los valores salen de values_list, sin instanciar
+    # modelos ni serializers. Los decimales se entregan como números.
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+    columnar_fields = None
+    columnar_pagination_class = ColumnarPagination
+
+    def wants_columnar(self):
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        return renderer is not None and renderer.format == ColumnarJSONRenderer.format
+
+    def get_columnar_fields(self, queryset):
+        if self.columnar_fields is not None:
+            return list(self.columnar_fields)
+        return [field.name for field in queryset.model._meta.concrete_fields]
+
+    def columnar_response(self, queryset):
+        columns = self.get_columnar_fields(queryset)
+        rows = queryset.values_list(*columns)
+        paginator = self.columnar_pagination_class()
+        page = paginator.paginate_queryset(rows, self.request, view=self)
+        rows = page if page is not None else list(rows)
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        data = {'columns': columns, 'data': {column: list(value) for column, value in zip(columns, values)}}
+        if page is None:
+            return Response(data)
+        return Response({
+            'count': paginator.page.paginator.count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            **data,
+        })
+
+
+class BatchGetMixin:
+    # POST {ids: [...]} -> los objetos en el orden pedido, en una sola consulta.
+    # Cada ViewSet define batch_serializer_class; get_objects_by_ids(ids) -> {id: objeto}
+    # se reemplaza solo si hace falta algo más que el SELECT ... WHERE id IN (...).
+    batch_serializer_class = None
+
+    def get_objects_by_ids(self, ids):
+        return self.batch_serializer_class.Meta.model._default_manager.in_bulk(ids)
+
+    @extend_schema(
+        summary="Obtener varios por ID",
+        description=(
+            "Retorna los elementos de la lista `ids` (hasta 1000 por defecto) con una sola consulta, en el orden "
+            "de la solicitud y sin repetidos. Los IDs que no existen se informan en `missing`."
+        ),
+        request=IdBatchSerializer,
+    )
+    @action(detail=False, methods=['post'])
+    def batch_get(self, request):
+        serializer = IdBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        objects = self.get_objects_by_ids(ids)
+        found = [objects[pk] for pk in ids if pk in objects]
+        return Response({
+            'results': self.batch_serializer_class(found, many=True).data,
+            'missing': [pk for pk in ids if pk not in objects],
+        })
+
+
+class VersionedMixin:
+    # La versión de la fila viaja como ETag. update/partial_update aceptan If-Match
+    # y responden 412 si el recurso cambió desde que el cliente lo leyó.
+    etag_actions = ('retrieve', 'create', 'update', 'partial_update')
+
+    def get_if_match(self):
+        header = self.request.headers.get('If-Match')
+        if header is None or header.strip() == '*':
+            return None
+        versions = set()
+        for tag in header.split(','):
+            # Se acepta W/ porque CompressionMiddleware debilita el ETag al comprimir
+            tag = tag.strip().removeprefix('W/').strip('"')
+            if tag.isdigit():
+                versions.add(int(tag))
+        return versions
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        data = getattr(response, 'data', None)
+        if (
+            self.action in self.etag_actions and status.is_success(response.status_code)
+            and isinstance(data, dict) and 'version' in data and not data.get('archived')
+        ):
+            response['ETag'] = f'"{data["version"]}"'
+        return response
@@ -0,0 +1,11 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class ColumnarPagination(StandardPagination):
+    # Páginas grandes (`?page_size=`) solo para el formato columnar de los clientes de analítica
+    max_page_size = 5000
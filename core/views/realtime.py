@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from ..models.models import Project
+from ..realtime.broadcaster import CLOSED, get_broadcaster, project_channel
+
+
+def _authenticate(request):
+    # EventSource no permite enviar headers, por eso se acepta también ?token=
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else request.GET.get('token')
+    if not raw_token:
+        return None
+    try:
+        user = authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return user if user.is_active else None
+
+
+async def unit_status_stream(request, project_id):
+    # Bajo WSGI Django consume el generador completo antes de responder: un stream que
+    # no termina dejaría el hilo del worker tomado para siempre
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "El stream requiere el servidor ASGI (uvicorn backendPlanOk.asgi:application)."},
+            status=501
+        )
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({"detail": "Credenciales no válidas."}, status=401)
+    if not await Project.objects.filter(id=project_id).aexists():
+        return JsonResponse({"detail": "Proyecto no encontrado."}, status=404)
+
+    response = StreamingHttpResponse(_event_stream(project_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def _event_stream(project_id):
+    # La suscripción se crea al empezar a iterar, en el loop que atiende la conexión
+    broadcaster = get_broadcaster()
+    subscription = broadcaster.subscribe(project_channel(project_id))
+    try:
+        yield 'retry: 3000\nevent: ready\ndata: {}\n\n'
+        while True:
+            try:
+                message = await subscription.get(timeout=settings.REALTIME_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            if message is CLOSED:
+                yield 'event: overflow\ndata: {}\n\n'
+                return
+            yield f"event: {message['event']}\ndata: {json.dumps(message)}\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
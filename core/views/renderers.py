@@ -0,0 +1,8 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    # Se elige con `?format=columnar`. Los listados que lo soportan entregan
+    # {columns, data: {columna: [valores]}} en vez de una lista de objetos
+    # (ver ColumnarListMixin); el resto de las respuestas se rinden como JSON normal.
+    format = 'columnar'
@@ -0,0 +1,65 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+from core import metrics
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    # El esquema solo cambia con el código: se genera en el primer request de cada
+    # proceso y se guarda ya rendido por formato, versión e idioma. Un deploy levanta
+    # procesos nuevos, así que no hay que invalidarlo a mano.
+    _rendered = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._rendered.clear()
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        key = self._cache_key(request)
+        entry = self._rendered.get(key)
+        metrics.record_cache_lookup('schema', entry is not None)
+        if entry is None:
+            with self._lock:
+                # Un solo hilo introspecciona los viewsets; el resto espera el resultado
+                entry = self._rendered.get(key)
+                if entry is None:
+                    entry = self._rendered[key] = self._render(request, *args, **kwargs)
+        content, headers = entry
+
+        # El middleware de compresión marca el ETag como débil; ambos valen para revalidar
+        etags = [etag.removeprefix('W/') for etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))]
+        if headers['ETag'] in etags or '*' in etags:
+            response = HttpResponseNotModified()
+            response.headers['ETag'] = headers['ETag']
+            return response
+        response = HttpResponse(content, headers=headers)
+        response.compression_cache_key = 'schema:' + headers['ETag'].strip('"')
+        return response
+
+    def _cache_key(self, request):
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        lang = request.GET.get('lang') if settings.USE_I18N else None
+        return request.accepted_media_type, version, lang
+
+    def _render(self, request, *args, **kwargs):
+        response = self.finalize_response(request, super().get(request, *args, **kwargs), *args, **kwargs)
+        response.render()
+        content = response.content
+        headers = {
+            'Content-Type': response['Content-Type'],
+            'Content-Disposition': response['Content-Disposition'],
+            'Vary': response.get('Vary', 'Accept'),
+            'ETag': f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+            # El cliente guarda el esquema y revalida con If-None-Match en cada visita
+            'Cache-Control': 'no-cache',
+        }
+        return content, headers
@@ -0,0 +1,171 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+MICROSECONDS = 1_000_000
+# Las llaves vencidas equivalen a un bucket lleno; un día acota la memoria por cliente
+BUCKET_TIMEOUT = 24 * 60 * 60
+MAX_LOCAL_BUCKETS = 10_000
+# Vida máxima del candado con el que un proceso lleva a `now` un bucket lleno
+CLAMP_LOCK_TIMEOUT = 1
+
+
+@dataclass
+class _LocalBucket:
+    tokens: int = 0  # reservados en la caché y aún sin usar por este proceso
+    expires_at: float = 0.0
+    blocked_until: float = 0.0
+    shared_remaining: int = 0
+    full_at: float = 0.0
+
+
+# Ordenado por última reserva: al llegar al límite se descartan los más antiguos
+_buckets = OrderedDict()
+_buckets_lock = threading.Lock()
+
+
+def reset_local_buckets():
+    with _buckets_lock:
+        _buckets.clear()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    # La tasa de DRF ('600/min') se lee como un bucket de 600 tokens que se recarga a
+    # 600 por minuto. El estado compartido es un entero en la caché (GCRA): el instante,
+    # en µs, en que el bucket vuelve a estar lleno, y solo se modifica con cache.incr,
+    # que es atómico en Redis y en locmem.
+    #
+    # Cada proceso reserva tokens de a varios (THROTTLE_LEASE_SIZE) y los gasta sin ir a
+    # la caché; con el bucket vacío rechaza localmente hasta que haya un token disponible.
+    # Una reserva que vence sin usarse se pierde: ante la duda el límite es más estricto.
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+
+        with _buckets_lock:
+            bucket = _buckets.get(self.key)
+            if bucket is not None:
+                if bucket.tokens and self.now < bucket.expires_at:
+                    bucket.tokens -= 1
+                    return self._allow(request, bucket)
+                if self.now < bucket.blocked_until:
+                    return self._deny(request, bucket)
+
+        bucket = self._acquire()
+        with _buckets_lock:
+            _buckets[self.key] = bucket
+            _buckets.move_to_end(self.key)
+            while len(_buckets) > MAX_LOCAL_BUCKETS:
+                _buckets.popitem(last=False)
+        if not bucket.tokens:
+            return self._deny(request, bucket)
+        bucket.tokens -= 1
+        return self._allow(request, bucket)
+
+    def _acquire(self):
+        interval = self.duration * MICROSECONDS // self.num_requests
+        capacity = interval * self.num_requests
+        now = int(self.now * MICROSECONDS)
+        lease = min(settings.THROTTLE_LEASE_SIZE, max(1, self.num_requests // 50))
+
+        full_at = self._incr(lease * interval, now)
+        previous = full_at - lease * interval
+        if previous < now:
+            full_at = self._clamp(now, lease * interval)
+            previous = now
+        available = (now + capacity - previous) // interval
+        granted = max(0, min(lease, available))
+        if granted < lease:
+            full_at = self.cache.incr(self.key, -(lease - granted) * interval)
+
+        bucket = _LocalBucket(
+            tokens=granted,
+            expires_at=self.now + settings.THROTTLE_LEASE_SECONDS,
+            shared_remaining=max(0, available - granted),
+            full_at=full_at / MICROSECONDS,
+        )
+        if not granted:
+            # Segundos hasta que se libere el próximo token
+            bucket.blocked_until = (previous + interval - capacity) / MICROSECONDS
+        return bucket
+
+    def _clamp(self, now, reserved):
+        # Bucket lleno: el instante guardado quedó en el pasado y se lleva a `now` + la
+        # reserva. Varios procesos pueden ver el mismo valor vencido; solo el que obtiene
+        # el candado corrige, sobre el valor que relee, así la corrección no se aplica dos
+        # veces. Los demás no esperan: su reserva ya está sumada y queda dentro de esta.
+        lock_key = f'{self.key}:clamp'
+        if not self.cache.add(lock_key, 1, CLAMP_LOCK_TIMEOUT):
+            return now + reserved
+        try:
+            current = self.cache.get(self.key)
+            if current is None or current >= now + reserved:
+                return now + reserved if current is None else current
+            return self.cache.incr(self.key, now + reserved - current)
+        finally:
+            self.cache.delete(lock_key)
+
+    def _incr(self, delta, now):
+        try:
+            return self.cache.incr(self.key, delta)
+        except ValueError:
+            self.cache.add(self.key, now, BUCKET_TIMEOUT)
+            return self.cache.incr(self.key, delta)
+
+    def _allow(self, request, bucket):
+        self._publish(request, bucket.shared_remaining + bucket.tokens, bucket)
+        return True
+
+    def _deny(self, request, bucket):
+        self.wait_seconds = max(0.0, bucket.blocked_until - self.now)
+        self._publish(request, 0, bucket)
+        return False
+
+    def _publish(self, request, remaining, bucket):
+        # RateLimitHeadersMiddleware agrega los headers del límite más cercano a agotarse
+        if not hasattr(request._request, 'rate_limits'):
+            request._request.rate_limits = []
+        request._request.rate_limits.append((self.num_requests, remaining, max(0.0, bucket.full_at - self.now)))
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    # Un bucket por usuario (o por IP si no está autenticado) para toda la API
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class EndpointTokenBucketThrottle(UserTokenBucketThrottle):
+    # Buckets por usuario para los endpoints con tasa propia en DEFAULT_THROTTLE_RATES,
+    # p. ej. 'units.list' para UnitViewSet.list; el resto no se limita aquí.
+
+    def __init__(self):
+        # La tasa depende de la vista: se resuelve en allow_request
+        pass
+
+    def allow_request(self, request, view):
+        basename = getattr(view, 'basename', None)
+        action = getattr(view, 'action', None)
+        self.scope = getattr(view, 'throttle_scope', None) or (basename and action and f'{basename}.{action}')
+        if not self.scope or self.scope not in self.THROTTLE_RATES:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -1,22 +1,80 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, serializers
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.reverse import reverse
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.utils import timezone
+from django.utils.http import urlencode
 
 from ..services.project_service import ProjectService
 from ..services.unit_service import UnitService
 from ..services.customer_service import CustomerService
+from ..services.archive_service import ArchiveService
+from ..services.job_service import JobService
+from ..services.change_service import ChangeService
+from ..services.repricing_service import RepricingService
+from ..services.availability_service import AvailabilityService
+from ..services.sales_rollup_service import SalesRollupService
+from ..services.unit_history_service import UnitHistoryService
 from ..models.models import Unit, Customer
 from ..serializers.serializers import (
     ProjectSerializer,
     UnitSerializer,
-    CustomerSerializer
+    CustomerSerializer,
+    ArchivedProjectSerializer,
+    ArchivedUnitSerializer,
+    JobSerializer,
+    UnitWithCustomerSerializer,
+    CustomerPortfolioSerializer,
+    ChangePageSerializer,
+    RepricingSerializer,
+    RutBatchSerializer,
+    SalesQuerySerializer,
+    SalesPeriodSerializer,
+    UnitHistorySerializer,
+    InventoryQuerySerializer
 )
 from drf_spectacular.utils import extend_schema, extend_schema_view
-from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter, OpenApiExample
+from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter, OpenApiExample, inline_serializer
 from drf_spectacular.types import OpenApiTypes
-from .filters import ProjectFilter, UnitFilter
+from .filters import CustomerFilter, ProjectFilter, UnitFilter
+from .mixins import ArchiveListMixin, AsyncJobMixin, BatchGetMixin, ColumnarListMixin, VersionedMixin
+
+INCLUDE_ARCHIVED_PARAMETER = OpenApiParameter(
+    name='include_archived',
+    type=OpenApiTypes.BOOL,
+    location=OpenApiParameter.QUERY,
+    description='Incluye proyectos y unidades archivados (Sold/Finished). Cada elemento trae `archived`.'
+)
+FORMAT_PARAMETER = OpenApiParameter(
+    name='format',
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    enum=['json', 'columnar'],
+    description=(
+        'Con `columnar` la página se entrega como `{columns, data: {columna: [valores]}}` en vez de una lista de '
+        'objetos, sin repetir las llaves. Pensado para clientes de analítica junto con `page_size` (máx. 5000).'
+    )
+)
+IF_MATCH_PARAMETER = OpenApiParameter(
+    name='If-Match',
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    description=(
+        'ETag obtenido al consultar el recurso (su `version`, p. ej. `"3"`). Si el recurso cambió desde entonces '
+        'se responde 412 y no se escribe nada. Sin el header la escritura igual falla con 412 si otra solicitud '
+        'modificó el recurso mientras se procesaba.'
+    )
+)
+ASYNC_PARAMETER = OpenApiParameter(
+    name='async',
+    type=OpenApiTypes.BOOL,
+    location=OpenApiParameter.QUERY,
+    description='Encola la operación como job y responde 202 con su estado. Consultar el avance en `/api/jobs/{id}/`.'
+)
 
 @extend_schema_view(
     list=extend_schema(
@@ -58,7 +116,9 @@ from .filters import ProjectFilter, UnitFilter
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
                 description='Ordenar por `created_at`, `started_at`, `finished_at` (asc o desc). Ejemplo: `?ordering=-created_at`.'
-            )
+            ),
+            INCLUDE_ARCHIVED_PARAMETER,
+            FORMAT_PARAMETER
         ],
         examples=[
             OpenApiExample(
@@ -82,6 +142,7 @@ from .filters import ProjectFilter, UnitFilter
     retrieve=extend_schema(
         summary="Obtener un proyecto",
         description="Retorna los detalles de un proyecto específico basado en su ID.",
+        parameters=[INCLUDE_ARCHIVED_PARAMETER],
         examples=[
             OpenApiExample(
                 'Ejemplo de respuesta',
@@ -132,6 +193,7 @@ from .filters import ProjectFilter, UnitFilter
     ),
     update=extend_schema(
         summary="Actualizar un proyecto",
+        parameters=[IF_MATCH_PARAMETER],
         description="Actualiza todos los campos de un proyecto específico basado en su ID.",
         examples=[
             OpenApiExample(
@@ -163,6 +225,7 @@ from .filters import ProjectFilter, UnitFilter
     ),
     partial_update=extend_schema(
         summary="Actualizar parcialmente un proyecto",
+        parameters=[IF_MATCH_PARAMETER],
         description="Permite actualizar parcialmente un proyecto usando `PATCH`.",
         examples=[
             OpenApiExample(
@@ -191,19 +254,165 @@ from .filters import ProjectFilter, UnitFilter
     ),
     destroy=extend_schema(
         summary="Eliminar un proyecto",
-        description="Elimina un proyecto específico basado en su ID."
+        description="Elimina un proyecto específico basado en su ID.",
+        parameters=[ASYNC_PARAMETER]
+    ),
+    inventory=extend_schema(
+        summary="Inventario a una fecha",
+        description=(
+            "Reconstruye desde la historia de unidades el estado, precio y cliente de cada unidad del proyecto en "
+            "el momento `as_of` (por defecto, ahora). Las unidades creadas después o borradas antes no aparecen. "
+            "Solo lee la historia del proyecto anterior a esa fecha."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='as_of',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Fecha (`2025-01-31`, se toma el final del día) o fecha y hora ISO 8601.'
+            )
+        ],
+        examples=[
+            OpenApiExample(
+                'Ejemplo de respuesta',
+                value={
+                    "project": "f2f5a566-5619-43f9-8d3f-cf106e90e194",
+                    "as_of": "2025-01-31T23:59:59.999999-03:00",
+                    "counts": {"Available": 1, "Sold": 0, "Reserved": 1},
+                    "units": [
+                        {
+                            "unit": "a1b2c3d4-5678-9101-1121-314151617181",
+                            "project": "f2f5a566-5619-43f9-8d3f-cf106e90e194",
+                            "unit_number": "101",
+                            "event": "changed",
+                            "unit_status": "Reserved",
+                            "price": 150000000,
+                            "reservation_deposit": 7500000,
+                            "customer": "550e8400-e29b-41d4-a716-446655440000",
+                            "changed_at": "2025-01-15T10:30:00-03:00"
+                        }
+                    ]
+                },
+                response_only=True
+            )
+        ]
+    ),
+    dashboard=extend_schema(
+        summary="Dashboard de un proyecto",
+        description=(
+            "Retorna en una sola respuesta el proyecto, los agregados de su inventario y la primera página de "
+            "unidades (más recientes primero) con su cliente embebido. `units.next` apunta a la página siguiente "
+            "en `/api/units/`. Usa un número fijo de consultas."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='page_size',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Cantidad de unidades en la primera página.'
+            )
+        ],
+        examples=[
+            OpenApiExample(
+                'Ejemplo de respuesta',
+                value={
+                    "project": {
+                        "id": "f2f5a566-5619-43f9-8d3f-cf106e90e194",
+                        "name": "Nuevo Proyecto",
+                        "address": "Av. Ejemplo 123",
+                        "description": None,
+                        "status": "Under Construction",
+                        "started_at": "2025-01-01",
+                        "finished_at": None,
+                        "created_at": "2023-10-01T12:00:00Z"
+                    },
+                    "inventory": {
+                        "units": 120,
+                        "total_price": 18000000000,
+                        "total_deposits": 150000000,
+                        "avg_price_per_m2": 2950000.5,
+                        "by_status": {
+                            "Available": {"units": 80, "total_price": 12000000000},
+                            "Sold": {"units": 30, "total_price": 4500000000},
+                            "Reserved": {"units": 10, "total_price": 1500000000}
+                        }
+                    },
+                    "units": {
+                        "count": 120,
+                        "next": "http://localhost:8000/api/units/?project=f2f5a566-5619-43f9-8d3f-cf106e90e194&page=2&page_size=10",
+                        "results": [
+                            {
+                                "id": "a1b2c3d4-5678-9101-1121-314151617181",
+                                "customer": {
+                                    "id": "550e8400-e29b-41d4-a716-446655440000",
+                                    "rut": "123456785",
+                                    "name": "Juan",
+                                    "lastname": "Pérez",
+                                    "email": "juan.perez@example.com",
+                                    "phone": "+56912345678",
+                                    "created_at": "2023-10-01T12:00:00Z"
+                                },
+                                "unit_number": "101",
+                                "unit_type": "Apartment",
+                                "square_meters": "50.50",
+                                "price": 150000000,
+                                "reservation_deposit": 7500000,
+                                "unit_status": "Reserved",
+                                "price_per_m2": "2970297.03",
+                                "created_at": "2025-01-27T12:00:00Z",
+                                "project": "f2f5a566-5619-43f9-8d3f-cf106e90e194"
+                            }
+                        ]
+                    }
+                },
+                response_only=True
+            )
+        ]
+    ),
+    availability=extend_schema(
+        summary="Disponibilidad de las unidades de un proyecto",
+        description=(
+            "Retorna el estado de todas las unidades del proyecto en una sola respuesta compacta: "
+            "`unit_numbers` y `statuses` son paralelos, con un carácter por unidad según `legend`. "
+            "La respuesta se mantiene en caché hasta que cambia una unidad del proyecto; `version` cambia junto con ella."
+        ),
+        examples=[
+            OpenApiExample(
+                'Ejemplo de respuesta',
+                value={
+                    "project": "f2f5a566-5619-43f9-8d3f-cf106e90e194",
+                    "version": "5f1c0a9e8b7d4c2e9a3b6d8f0e1c2b4a",
+                    "units": 4,
+                    "counts": {"Available": 2, "Reserved": 1, "Sold": 1},
+                    "legend": {"A": "Available", "R": "Reserved", "S": "Sold"},
+                    "unit_numbers": ["101", "102", "201", "202"],
+                    "statuses": "ARSA"
+                },
+                response_only=True
+            )
+        ]
     )
 )
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(VersionedMixin, ArchiveListMixin, AsyncJobMixin, BatchGetMixin, ColumnarListMixin, viewsets.ModelViewSet):
 
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = ProjectFilter
     ordering_fields = ['created_at', 'started_at', 'finished_at']
     ordering = ['-created_at']
+    batch_serializer_class = ProjectSerializer
 
     def list(self, request):
+        if self.include_archived():
+            return self.list_with_archive(
+                ProjectService.get_projects(),
+                ArchiveService.get_archived_projects(),
+                ProjectSerializer,
+                ArchivedProjectSerializer
+            )
         queryset = ProjectService.get_projects()
         queryset = self.filter_queryset(queryset)
+        if self.wants_columnar():
+            return self.columnar_response(queryset)
         page = self.paginate_queryset(queryset)
 
         if page is not None:
@@ -215,6 +424,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
     def retrieve(self, request, pk=None):
         project = ProjectService.get_project_by_id(pk)
+        if not project and self.include_archived():
+            archived_project = ArchiveService.get_archived_project_by_id(pk)
+            if archived_project:
+                return Response({**ArchivedProjectSerializer(archived_project).data, 'archived': True})
         if not project:
             return Response({"detail": "Proyecto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
         serializer = ProjectSerializer(project)
@@ -226,25 +439,80 @@ class ProjectViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def update(self, request, pk=None):
-        project = ProjectService.update_project(pk, request.data)
+        project = ProjectService.update_project(pk, request.data, if_match=self.get_if_match())
         if not project:
             return Response({"detail": "Proyecto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
         serializer = ProjectSerializer(project)
         return Response(serializer.data)
 
     def partial_update(self, request, pk=None):
-        project = ProjectService.partial_update_project(pk, request.data)
+        project = ProjectService.partial_update_project(pk, request.data, if_match=self.get_if_match())
         if not project:
             return Response({"detail": "Proyecto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
         serializer = ProjectSerializer(project)
         return Response(serializer.data)
 
     def destroy(self, request, pk=None):
+        if self.run_async():
+            job = ProjectService.submit_delete_project(pk, request.user)
+            if not job:
+                return Response({"detail": "Proyecto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+            return self.job_accepted_response(job)
         deleted = ProjectService.delete_project(pk)
         if not deleted:
             return Response({"detail": "Proyecto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=True, methods=['get'])
+    def dashboard(self, request, pk=None):
+        page_size = self.paginator.get_page_size(request)
+        dashboard = ProjectService.get_dashboard(pk, page_size)
+        if dashboard is None:
+            return Response({"detail": "Proyecto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        project, inventory, units = dashboard
+        next_url = None
+        if inventory['units'] > page_size:
+            query = urlencode({'project': project.id, 'page': 2, 'page_size': page_size})
+            next_url = f"{reverse('units-list', request=request)}?{query}"
+        return Response({
+            "project": ProjectSerializer(project).data,
+            "inventory": inventory,
+            "units": {
+                "count": inventory['units'],
+                "next": next_url,
+                "results": UnitWithCustomerSerializer(units, many=True).data,
+            },
+        })
+
+    @action(detail=True, methods=['get'])
+    def inventory(self, request, pk=None):
+        serializer = InventoryQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        as_of = serializer.validated_data.get('as_of') or timezone.now()
+        units = UnitHistoryService.get_inventory_as_of(pk, as_of)
+        if units is None or not (ProjectService.get_project_by_id(pk) or ArchiveService.get_archived_project_by_id(pk)):
+            return Response({"detail": "Proyecto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        counts = {unit_status: 0 for unit_status, _ in Unit.UNIT_STATUS}
+        for unit in units:
+            counts[unit.unit_status] += 1
+        return Response({
+            "project": pk,
+            "as_of": as_of,
+            "counts": counts,
+            "units": UnitHistorySerializer(units, many=True).data,
+        })
+
+    @action(detail=True, methods=['get'])
+    def availability(self, request, pk=None):
+        availability = AvailabilityService.get_availability(pk)
+        if availability is None:
+            return Response({"detail": "Proyecto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        response = Response(availability)
+        if request.accepted_renderer.format == 'json':
+            # El cuerpo depende solo de la versión: se comprime una vez por versión
+            response.compression_cache_key = f"availability:{availability['project']}:{availability['version']}"
+        return response
+
     def filter_queryset(self, queryset):
         for backend in list(self.filter_backends):
             queryset = backend().filter_queryset(self.request, queryset, self)
@@ -273,12 +541,56 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 location=OpenApiParameter.QUERY,
                 description='Filtrar por el ID del proyecto al que pertenece la unidad.'
             ),
+            OpenApiParameter(
+                name='customer',
+                type=OpenApiTypes.UUID,
+                location=OpenApiParameter.QUERY,
+                description='Filtrar por el ID del cliente asociado a la unidad.'
+            ),
             OpenApiParameter(
                 name='ordering',
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description='Ordenar por `created_at` (asc o desc) o `price` (asc o desc). Ejemplo: `?ordering=-price`.'
-            )
+                description='Ordenar por `created_at`, `price`, `square_meters` o `price_per_m2` (asc o desc). Ejemplo: `?ordering=-price`.'
+            ),
+            OpenApiParameter(
+                name='price_min',
+                type=OpenApiTypes.NUMBER,
+                location=OpenApiParameter.QUERY,
+                description='Filtrar por precio mínimo (inclusive).'
+            ),
+            OpenApiParameter(
+                name='price_max',
+                type=OpenApiTypes.NUMBER,
+                location=OpenApiParameter.QUERY,
+                description='Filtrar por precio máximo (inclusive).'
+            ),
+            OpenApiParameter(
+                name='square_meters_min',
+                type=OpenApiTypes.NUMBER,
+                location=OpenApiParameter.QUERY,
+                description='Filtrar por superficie mínima en m² (inclusive).'
+            ),
+            OpenApiParameter(
+                name='square_meters_max',
+                type=OpenApiTypes.NUMBER,
+                location=OpenApiParameter.QUERY,
+                description='Filtrar por superficie máxima en m² (inclusive).'
+            ),
+            OpenApiParameter(
+                name='price_per_m2_min',
+                type=OpenApiTypes.NUMBER,
+                location=OpenApiParameter.QUERY,
+                description='Filtrar por precio por m² (CLP) mínimo (inclusive).'
+            ),
+            OpenApiParameter(
+                name='price_per_m2_max',
+                type=OpenApiTypes.NUMBER,
+                location=OpenApiParameter.QUERY,
+                description='Filtrar por precio por m² (CLP) máximo (inclusive).'
+            ),
+            INCLUDE_ARCHIVED_PARAMETER,
+            FORMAT_PARAMETER
         ],
         examples=[
             OpenApiExample(
@@ -301,6 +613,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
     ),
     partial_update=extend_schema(
         summary="Actualizar parcialmente una unidad",
+        parameters=[IF_MATCH_PARAMETER],
         description="Permite actualizar parcialmente una unidad usando `PATCH`.",
         examples=[
             OpenApiExample(
@@ -328,6 +641,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
     ),
     update=extend_schema(
         summary="Actualizar una unidad",
+        parameters=[IF_MATCH_PARAMETER],
         description="Actualiza todos los campos de una unidad específico basado en su ID.",
         examples=[
             OpenApiExample(
@@ -348,7 +662,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
     ),
     create=extend_schema(
         summary="Crear una o varias unidades",
-        description="Crea una nueva unidad o varias unidades en una sola petición.",
+        description="Crea una nueva unidad o varias unidades en una sola petición. Con `?async=true` una lista se procesa como job.",
+        parameters=[ASYNC_PARAMETER],
         examples=[
             OpenApiExample(
                 'Ejemplo de solicitud (una unidad)',
@@ -430,9 +745,63 @@ class ProjectViewSet(viewsets.ModelViewSet):
         summary="Eliminar una unidad",
         description="Elimina una unidad específico basado en su ID."
     ),
+    history=extend_schema(
+        summary="Historia de una unidad",
+        description=(
+            "Lista en orden cronológico cada cambio de estado, precio, pie o cliente de la unidad, con la foto "
+            "posterior al cambio. Sigue disponible después de que la unidad se archiva o se elimina."
+        ),
+        responses=UnitHistorySerializer(many=True)
+    ),
+    reprice=extend_schema(
+        summary="Repreciar unidades",
+        description=(
+            "Aplica una regla de precios a las unidades que cumplen los filtros (`project`, `status`, `type`) "
+            "en un único UPDATE. `mode=percent` ajusta el precio en `percent` % (puede ser negativo); "
+            "`mode=per_m2` fija precio = m² × tarifa según `rates` por tipo de unidad. Con `dry_run=true` "
+            "solo retorna los totales antes y después sin modificar nada. Cada repricing aplicado queda auditado."
+        ),
+        request=RepricingSerializer,
+        examples=[
+            OpenApiExample(
+                'Ejemplo de solicitud (+3% a departamentos disponibles)',
+                value={
+                    "project": "f2f5a566-5619-43f9-8d3f-cf106e90e194",
+                    "status": "Available",
+                    "type": "Apartment",
+                    "mode": "percent",
+                    "percent": 3,
+                    "dry_run": True
+                },
+                request_only=True
+            ),
+            OpenApiExample(
+                'Ejemplo de solicitud (precio por m²)',
+                value={
+                    "project": "f2f5a566-5619-43f9-8d3f-cf106e90e194",
+                    "mode": "per_m2",
+                    "rates": {"Apartment": 3200000, "Commercial": 4100000}
+                },
+                request_only=True
+            ),
+            OpenApiExample(
+                'Ejemplo de respuesta',
+                value={
+                    "units": 120,
+                    "total_before": 18000000000,
+                    "total_after": 18540000000,
+                    "difference": 540000000,
+                    "dry_run": False,
+                    "repricing": "9b2d8a51-3f0e-4c55-9a4e-1d7c6b3e2f10"
+                },
+                response_only=True
+            )
+        ]
+    ),
     retrieve=extend_schema(
         summary="Obtener una unidad",
         description="Retorna los detalles de una unidad específico basado en su ID.",
+        parameters=[INCLUDE_ARCHIVED_PARAMETER],
         examples=[
             OpenApiExample(
                 'Ejemplo de respuesta',
@@ -451,15 +820,25 @@ class ProjectViewSet(viewsets.ModelViewSet):
         ]
     ),
 )
-class UnitViewSet(viewsets.ModelViewSet):
+class UnitViewSet(VersionedMixin, ArchiveListMixin, AsyncJobMixin, BatchGetMixin, ColumnarListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = UnitFilter
-    ordering_fields = ['created_at', 'price']
+    ordering_fields = ['created_at', 'price', 'square_meters', 'price_per_m2']
     ordering = ['-created_at']
+    batch_serializer_class = UnitSerializer
 
     def list(self, request, *args, **kwargs):
+        if self.include_archived():
+            return self.list_with_archive(
+                UnitService.get_all_units(),
+                ArchiveService.get_archived_units(),
+                UnitSerializer,
+                ArchivedUnitSerializer
+            )
         queryset = self.filter_queryset(UnitService.get_all_units())
+        if self.wants_columnar():
+            return self.columnar_response(queryset)
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = UnitSerializer(page, many=True)
@@ -474,10 +853,16 @@ class UnitViewSet(viewsets.ModelViewSet):
             serializer = UnitSerializer(unit)
             return Response(serializer.data)
         except Unit.DoesNotExist:
+            archived_unit = ArchiveService.get_archived_unit_by_id(pk) if self.include_archived() else None
+            if archived_unit:
+                return Response({**ArchivedUnitSerializer(archived_unit).data, 'archived': True})
             return Response({'error': 'Unit not found'}, status=status.HTTP_404_NOT_FOUND)
 
     def create(self, request, *args, **kwargs):
         data = request.data
+        if isinstance(data, list) and self.run_async():
+            job = UnitService.submit_create_multiple_units(data, request.user)
+            return self.job_accepted_response(job)
         if isinstance(data, list):
             created_units = UnitService.create_multiple_units(data)
             serializer = UnitSerializer(created_units, many=True)
@@ -492,7 +877,7 @@ class UnitViewSet(viewsets.ModelViewSet):
             unit = UnitService.get_unit_by_id(pk)
             serializer = UnitSerializer(unit, data=request.data)
             serializer.is_valid(raise_exception=True)
-            updated_unit = UnitService.update_unit(unit, serializer.validated_data)
+            updated_unit = UnitService.update_unit(unit, serializer.validated_data, self.get_if_match())
             serializer = UnitSerializer(updated_unit)
             return Response(serializer.data)
         except Unit.DoesNotExist:
@@ -503,7 +888,7 @@ class UnitViewSet(viewsets.ModelViewSet):
             unit = UnitService.get_unit_by_id(pk)
             serializer = UnitSerializer(unit, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
-            updated_unit = UnitService.update_unit(unit, serializer.validated_data)
+            updated_unit = UnitService.update_unit(unit, serializer.validated_data, self.get_if_match())
             serializer = UnitSerializer(updated_unit)
             return Response(serializer.data)
         except Unit.DoesNotExist:
@@ -516,7 +901,26 @@ class UnitViewSet(viewsets.ModelViewSet):
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Unit.DoesNotExist:
             return Response({'error': 'Unit not found'}, status=status.HTTP_404_NOT_FOUND)
-        
+
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        history = UnitHistorySerializer(UnitHistoryService.get_unit_history(pk), many=True).data
+        if not history:
+            return Response({'error': 'Unit not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(history)
+
+    @action(detail=False, methods=['post'])
+    def reprice(self, request):
+        serializer = RepricingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = RepricingService.reprice(
+            serializer.get_filters(),
+            serializer.get_rule(),
+            dry_run=serializer.validated_data['dry_run'],
+            user=request.user
+        )
+        return Response(result)
+
     def filter_queryset(self, queryset):
         for backend in list(self.filter_backends):
             queryset = backend().filter_queryset(self.request, queryset, self)
@@ -531,7 +935,7 @@ class UnitViewSet(viewsets.ModelViewSet):
                 name='rut',
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description='Filtrar por RUT del cliente'
+                description='Filtrar por RUT del cliente, con o sin formato.'
             ),
             OpenApiParameter(
                 name='email',
@@ -545,6 +949,7 @@ class UnitViewSet(viewsets.ModelViewSet):
                 location=OpenApiParameter.QUERY,
                 description='Filtrar por teléfono del cliente'
             ),
+            FORMAT_PARAMETER,
         ],
         examples=[
             OpenApiExample(
@@ -552,7 +957,7 @@ class UnitViewSet(viewsets.ModelViewSet):
                 value=[
                     {
                         "id": "550e8400-e29b-41d4-a716-446655440000",
-                        "rut": "12345678-9",
+                        "rut": "123456785",
                         "name": "Juan",
                         "lastname": "Pérez",
                         "email": "juan.perez@example.com",
@@ -572,7 +977,7 @@ class UnitViewSet(viewsets.ModelViewSet):
                 'Ejemplo de respuesta',
                 value={
                     "id": "550e8400-e29b-41d4-a716-446655440000",
-                    "rut": "12345678-9",
+                    "rut": "123456785",
                     "name": "Juan",
                     "lastname": "Pérez",
                     "email": "juan.perez@example.com",
@@ -590,7 +995,7 @@ class UnitViewSet(viewsets.ModelViewSet):
             OpenApiExample(
                 'Ejemplo de solicitud',
                 value={
-                    "rut": "12345678-9",
+                    "rut": "123456785",
                     "name": "Juan",
                     "lastname": "Pérez",
                     "email": "juan.perez@example.com",
@@ -602,12 +1007,13 @@ class UnitViewSet(viewsets.ModelViewSet):
     ),
     update=extend_schema(
         summary="Actualizar un cliente",
+        parameters=[IF_MATCH_PARAMETER],
         description="Actualiza todos los campos de un cliente específico basado en su ID.",
         examples=[
             OpenApiExample(
                 'Ejemplo de solicitud',
                 value={
-                    "rut": "12345678-9",
+                    "rut": "123456785",
                     "name": "Juan",
                     "lastname": "Pérez",
                     "email": "juan.perez@example.com",
@@ -619,6 +1025,7 @@ class UnitViewSet(viewsets.ModelViewSet):
     ),
     partial_update=extend_schema(
         summary="Actualizar parcialmente un cliente",
+        parameters=[IF_MATCH_PARAMETER],
         description="Permite actualizar parcialmente un cliente (PATCH). Solo se necesitan enviar los campos que se desean modificar.",
         examples=[
             OpenApiExample(
@@ -633,18 +1040,123 @@ class UnitViewSet(viewsets.ModelViewSet):
     destroy=extend_schema(
         summary="Eliminar un cliente",
         description="Elimina un cliente específico basado en su ID."
+    ),
+    portfolio=extend_schema(
+        summary="Cartera de un cliente",
+        description=(
+            "Retorna el cliente con sus unidades reservadas y vendidas en todos los proyectos (con el proyecto "
+            "embebido), la cantidad por estado, el precio total comprometido y el total de pies (`total_deposits`)."
+        ),
+        examples=[
+            OpenApiExample(
+                'Ejemplo de respuesta',
+                value={
+                    "id": "550e8400-e29b-41d4-a716-446655440000",
+                    "rut": "123456785",
+                    "name": "Juan",
+                    "lastname": "Pérez",
+                    "email": "juan.perez@example.com",
+                    "phone": "+56912345678",
+                    "created_at": "2023-10-01T12:00:00Z",
+                    "reserved_units": 1,
+                    "sold_units": 1,
+                    "committed_price": 450000000,
+                    "total_deposits": 22500000,
+                    "units": [
+                        {
+                            "id": "a1b2c3d4-5678-9101-1121-314151617181",
+                            "project": {
+                                "id": "f2f5a566-5619-43f9-8d3f-cf106e90e194",
+                                "name": "Nuevo Proyecto",
+                                "address": "Av. Ejemplo 123",
+                                "description": None,
+                                "status": "Under Construction",
+                                "started_at": "2025-01-01",
+                                "finished_at": None,
+                                "created_at": "2023-10-01T12:00:00Z"
+                            },
+                            "customer": "550e8400-e29b-41d4-a716-446655440000",
+                            "unit_number": "101",
+                            "unit_type": "Apartment",
+                            "square_meters": "50.50",
+                            "price": 150000000,
+                            "reservation_deposit": 7500000,
+                            "unit_status": "Reserved",
+                            "price_per_m2": "2970297.03",
+                            "created_at": "2025-01-27T12:00:00Z"
+                        }
+                    ]
+                },
+                response_only=True
+            )
+        ]
+    ),
+    portfolios=extend_schema(
+        summary="Listar carteras de clientes",
+        description=(
+            "Versión paginada de la cartera de clientes, con los mismos filtros y orden que el listado de clientes. "
+            "Cada página usa un número fijo de consultas."
+        ),
+        responses=CustomerPortfolioSerializer(many=True)
+    ),
+    resolve_ruts=extend_schema(
+        summary="Resolver RUT en lote",
+        description=(
+            "Resuelve hasta 5000 RUT por defecto (con o sin formato) a clientes con una sola consulta. Los resultados "
+            "vienen en el mismo orden de la solicitud; `customer` es null si no existe y `valid` es false si "
+            "el dígito verificador no corresponde."
+        ),
+        request=RutBatchSerializer,
+        examples=[
+            OpenApiExample(
+                'Ejemplo de solicitud',
+                value={"ruts": ["12.345.678-5", "98765432-5", "11111111-2"]},
+                request_only=True
+            ),
+            OpenApiExample(
+                'Ejemplo de respuesta',
+                value={
+                    "results": [
+                        {
+                            "rut": "12.345.678-5",
+                            "normalized": "123456785",
+                            "valid": True,
+                            "customer": {
+                                "id": "550e8400-e29b-41d4-a716-446655440000",
+                                "rut": "123456785",
+                                "name": "Juan",
+                                "lastname": "Pérez",
+                                "email": "juan.perez@example.com",
+                                "phone": "+56912345678",
+                                "created_at": "2023-10-01T12:00:00Z"
+                            }
+                        },
+                        {"rut": "98765432-5", "normalized": "987654325", "valid": True, "customer": None},
+                        {"rut": "11111111-2", "normalized": None, "valid": False, "customer": None}
+                    ],
+                    "found": 1
+                },
+                response_only=True
+            )
+        ]
     )
 )
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(VersionedMixin, BatchGetMixin, ColumnarListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['rut', 'name', 'lastname', 'email', 'phone']
+    filterset_class = CustomerFilter
     ordering_fields = ['created_at']
     ordering = ['-created_at']
 
     # Si quieres seguir usando el QuerySet para list/retrieve automáticos, mantenlo
     queryset = Customer.objects.all().order_by('-created_at')
     serializer_class = CustomerSerializer
+    batch_serializer_class = CustomerSerializer
+
+    def list(self, request, *args, **kwargs):
+        if self.wants_columnar():
+            return self.columnar_response(self.filter_queryset(self.get_queryset()))
+        return super().list(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
         customer = CustomerService.create_customer(request.data)
@@ -657,7 +1169,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
         except Customer.DoesNotExist:
             return Response({"detail": "Cliente no encontrado."}, status=status.HTTP_404_NOT_FOUND)
 
-        updated_customer = CustomerService.update_customer(customer, request.data, partial=False)
+        updated_customer = CustomerService.update_customer(customer, request.data, partial=False, if_match=self.get_if_match())
         serializer = CustomerSerializer(updated_customer)
         return Response(serializer.data)
 
@@ -667,7 +1179,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
         except Customer.DoesNotExist:
             return Response({"detail": "Cliente no encontrado."}, status=status.HTTP_404_NOT_FOUND)
 
-        updated_customer = CustomerService.update_customer(customer, request.data, partial=True)
+        updated_customer = CustomerService.update_customer(customer, request.data, partial=True, if_match=self.get_if_match())
         serializer = CustomerSerializer(updated_customer)
         return Response(serializer.data)
 
@@ -679,3 +1191,240 @@ class CustomerViewSet(viewsets.ModelViewSet):
 
         CustomerService.delete_customer(customer)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=['get'])
+    def portfolio(self, request, pk=None):
+        customer = CustomerService.get_portfolio(pk)
+        if not customer:
+            return Response({"detail": "Cliente no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(CustomerPortfolioSerializer(customer).data)
+
+    @action(detail=False, methods=['get'])
+    def portfolios(self, request):
+        queryset = self.filter_queryset(CustomerService.get_portfolios())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(CustomerPortfolioSerializer(page, many=True).data)
+        return Response(CustomerPortfolioSerializer(queryset, many=True).data)
+
+    @action(detail=False, methods=['post'])
+    def resolve_ruts(self, request):
+        serializer = RutBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        resolved = CustomerService.resolve_ruts(serializer.validated_data['ruts'])
+        customers = [customer for _, _, customer in resolved if customer is not None]
+        data = {customer['id']: customer for customer in CustomerSerializer(customers, many=True).data}
+        results = [
+            {
+                "rut": rut,
+                "normalized": normalized,
+                "valid": normalized is not None,
+                "customer": data[str(customer.id)] if customer is not None else None,
+            }
+            for rut, normalized, customer in resolved
+        ]
+        return Response({"results": results, "found": sum(1 for _, _, customer in resolved if customer is not None)})
+
+@extend_schema_view(
+    retrieve=extend_schema(
+        summary="Obtener el estado de un job",
+        description="Retorna el estado, avance (0-100) y resultado de un job en segundo plano creado por el usuario.",
+        examples=[
+            OpenApiExample(
+                'Ejemplo de respuesta',
+                value={
+                    "id": "7c9e6679-7425-40de-944b-e07fc1f90ae7",
+                    "kind": "units.create_multiple",
+                    "status": "Succeeded",
+                    "progress": 100,
+                    "result": {"created": 2, "ids": ["a1b2c3d4-5678-9101-1121-314151617181", "b2c3d4e5-6789-1011-2131-415161718192"]},
+                    "error": None,
+                    "created_at": "2025-01-27T12:00:00Z",
+                    "started_at": "2025-01-27T12:00:01Z",
+                    "finished_at": "2025-01-27T12:00:03Z"
+                },
+                response_only=True
+            )
+        ]
+    )
+)
+class JobViewSet(viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+    serializer_class = JobSerializer
+
+    def retrieve(self, request, pk=None):
+        job = JobService.get_job_by_id(pk, request.user)
+        if not job:
+            return Response({"detail": "Job no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(JobSerializer(job).data)
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Feed de cambios",
+        description=(
+            "Retorna los cambios de proyectos, unidades y clientes posteriores al cursor `since`, "
+            "compactados (solo el último cambio por entidad dentro del lote). Los borrados llegan como "
+            "`op: delete` sin `data`. Sin `since` retorna solo el cursor actual para iniciar la sincronización. "
+            "Si `full_resync_required` es true, el cursor es anterior a los cambios conservados y se debe "
+            "descargar todo nuevamente."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='since',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Último `next_since` recibido.'
+            ),
+            OpenApiParameter(
+                name='limit',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Máximo de cambios a leer por lote (por defecto 500).'
+            ),
+        ],
+        responses=ChangePageSerializer,
+        examples=[
+            OpenApiExample(
+                'Ejemplo de respuesta',
+                value={
+                    "changes": [
+                        {
+                            "seq": 41,
+                            "entity": "unit",
+                            "id": "a1b2c3d4-5678-9101-1121-314151617181",
+                            "op": "upsert",
+                            "data": {"id": "a1b2c3d4-5678-9101-1121-314151617181", "unit_status": "Reserved"}
+                        },
+                        {"seq": 42, "entity": "project", "id": "f2f5a566-5619-43f9-8d3f-cf106e90e194", "op": "delete"}
+                    ],
+                    "next_since": 42,
+                    "has_more": False,
+                    "full_resync_required": False
+                },
+                response_only=True
+            )
+        ]
+    )
+)
+class ChangeViewSet(viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        since = request.query_params.get('since')
+        limit = request.query_params.get('limit', settings.CHANGES_DEFAULT_BATCH)
+        try:
+            limit = min(int(limit), settings.CHANGES_MAX_BATCH)
+            since = int(since) if since is not None else None
+        except ValueError:
+            return Response({"detail": "since y limit deben ser enteros."}, status=status.HTTP_400_BAD_REQUEST)
+        if limit <= 0 or (since is not None and since < 0):
+            return Response({"detail": "since y limit deben ser positivos."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if since is None:
+            return Response({"changes": [], "next_since": ChangeService.get_latest_position(), "has_more": False, "full_resync_required": False})
+
+        changes, next_since, has_more = ChangeService.get_changes(since, limit)
+        data = []
+        for change in changes:
+            item = {"seq": change.position, "entity": change.entity, "id": change.entity_id, "op": change.operation}
+            if change.operation == 'upsert':
+                item["data"] = change.payload
+            data.append(item)
+        return Response({
+            "changes": data,
+            "next_since": next_since,
+            "has_more": has_more,
+            "full_resync_required": ChangeService.requires_full_resync(since),
+        })
+
+
+@extend_schema_view(
+    sales=extend_schema(
+        summary="Serie de reservas y ventas",
+        description=(
+            "Reservas, ventas, liberaciones (vuelta a Available), ingresos por ventas y pies recibidos por período, "
+            "leídos solo de los totales diarios precalculados. Sin `project` se suman todos los proyectos, incluidos "
+            "los archivados. Los períodos sin movimientos no aparecen. Por defecto, los últimos 30 días por día."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='project',
+                type=OpenApiTypes.UUID,
+                location=OpenApiParameter.QUERY,
+                description='Filtrar por proyecto.'
+            ),
+            OpenApiParameter(
+                name='from',
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description='Primer día incluido (por defecto, 29 días antes de `to`).'
+            ),
+            OpenApiParameter(
+                name='to',
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description='Último día incluido (por defecto, hoy).'
+            ),
+            OpenApiParameter(
+                name='granularity',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                enum=['day', 'week', 'month'],
+                description='Tamaño del período. Las semanas empiezan el lunes.'
+            ),
+        ],
+        # `from` es palabra reservada: el cuerpo no puede declararse como clase
+        responses=inline_serializer('SalesReport', fields={
+            'project': serializers.UUIDField(allow_null=True),
+            'from': serializers.DateField(),
+            'to': serializers.DateField(),
+            'granularity': serializers.ChoiceField(choices=SalesQuerySerializer.GRANULARITIES),
+            'results': SalesPeriodSerializer(many=True),
+        }),
+        examples=[
+            OpenApiExample(
+                'Ejemplo de respuesta',
+                value={
+                    "project": "f2f5a566-5619-43f9-8d3f-cf106e90e194",
+                    "from": "2025-01-01",
+                    "to": "2025-03-31",
+                    "granularity": "month",
+                    "results": [
+                        {
+                            "period": "2025-01-01",
+                            "reservations": 12,
+                            "sales": 5,
+                            "releases": 1,
+                            "revenue": 750000000,
+                            "deposits": 90000000
+                        }
+                    ]
+                },
+                response_only=True
+            )
+        ]
+    )
+)
+class AnalyticsViewSet(viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+
+    @action(detail=False, methods=['get'])
+    def sales(self, request):
+        params = request.query_params
+        serializer = SalesQuerySerializer(data={
+            key: params[param]
+            for key, param in (('project', 'project'), ('date_from', 'from'), ('date_to', 'to'), ('granularity', 'granularity'))
+            if param in params
+        })
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        results = SalesRollupService.get_sales(
+            query['date_from'], query['date_to'], query['granularity'], query.get('project')
+        )
+        return Response({
+            "project": query.get('project'),
+            "from": query['date_from'],
+            "to": query['date_to'],
+            "granularity": query['granularity'],
+            "results": results,
+        })
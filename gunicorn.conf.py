@@ -0,0 +1,32 @@
+# Configuración de gunicorn para los workers de la API (WSGI): `gunicorn` la toma
+# desde el directorio de trabajo. El stream SSE de disponibilidad necesita ASGI: lo
+# atiende uvicorn con backendPlanOk.asgi en el servicio `realtime` de docker-compose.yml.
+import multiprocessing
+import os
+
+# Perfil liviano por defecto (ver backendPlanOk/settings_api.py)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backendPlanOk.settings_api')
+
+wsgi_app = 'backendPlanOk.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+# Django se configura una sola vez en el maestro y los workers nacen con las apps,
+# modelos y URLs ya cargados (copy-on-write), en vez de repetir django.setup() cada uno.
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Conexiones abiertas en el maestro durante la carga no deben compartirse entre procesos
+    from django.db import connections
+    connections.close_all()
+
+
+def child_exit(server, worker):
+    # Con PROMETHEUS_MULTIPROC_DIR los gauges de un worker muerto dejan de sumarse
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)